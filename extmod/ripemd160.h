@@ -0,0 +1,120 @@
+/*
+ * MMGen Wallet, a terminal-based cryptocurrency wallet
+ * Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+ * Licensed under the GNU General Public License, Version 3:
+ *   https://www.gnu.org/licenses
+ * Public project repositories:
+ *   https://github.com/mmgen/mmgen-wallet
+ *   https://gitlab.com/mmgen/mmgen-wallet
+ */
+
+/*
+ * ripemd160.h: RIPEMD-160 hash function
+ *
+ * See https://homes.esat.kuleuven.be/~bosselae/ripemd160.html
+ */
+
+#include <stdint.h>
+#include <string.h>
+
+/* message word selection, left and right lines */
+static const uint8_t ripemd160_ml[80] = {
+	0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+	7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+	3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+	1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+	4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13
+};
+
+static const uint8_t ripemd160_mr[80] = {
+	5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+	6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+	15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+	8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+	12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11
+};
+
+/* rotation amounts, left and right lines */
+static const uint8_t ripemd160_rl[80] = {
+	11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+	7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+	11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+	11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+	9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6
+};
+
+static const uint8_t ripemd160_rr[80] = {
+	8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+	9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+	9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+	15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+	8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11
+};
+
+static const uint32_t ripemd160_kl[5] = {0x00000000, 0x5a827999, 0x6ed9eba1, 0x8f1bbcdc, 0xa953fd4e};
+static const uint32_t ripemd160_kr[5] = {0x50a28be6, 0x5c4dd124, 0x6d703ef3, 0x7a6d76e9, 0x00000000};
+
+#define RIPEMD160_ROL(x, n) (((x) << (n)) | ((x) >> (32 - (n))))
+
+static uint32_t ripemd160_f(int j, uint32_t x, uint32_t y, uint32_t z) {
+	switch (j) {
+		case 0:  return x ^ y ^ z;
+		case 1:  return (x & y) | (~x & z);
+		case 2:  return (x | ~y) ^ z;
+		case 3:  return (x & z) | (y & ~z);
+		default: return x ^ (y | ~z);
+	}
+}
+
+/* update state ‘h’ with the 64-byte block ‘blk’ */
+static void ripemd160_compress(uint32_t h[5], const unsigned char blk[64]) {
+	uint32_t x[16];
+	for (int i = 0; i < 16; i++) {
+		x[i] = (uint32_t)blk[i*4] | (uint32_t)blk[i*4+1] << 8 | (uint32_t)blk[i*4+2] << 16 | (uint32_t)blk[i*4+3] << 24;
+	}
+	uint32_t al = h[0], bl = h[1], cl = h[2], dl = h[3], el = h[4];
+	uint32_t ar = h[0], br = h[1], cr = h[2], dr = h[3], er = h[4];
+	for (int j = 0; j < 80; j++) {
+		int rnd = j >> 4;
+		uint32_t t = RIPEMD160_ROL(al + ripemd160_f(rnd, bl, cl, dl) + x[ripemd160_ml[j]] + ripemd160_kl[rnd],
+			ripemd160_rl[j]) + el;
+		al = el; el = dl; dl = RIPEMD160_ROL(cl, 10); cl = bl; bl = t;
+		t = RIPEMD160_ROL(ar + ripemd160_f(4 - rnd, br, cr, dr) + x[ripemd160_mr[j]] + ripemd160_kr[rnd],
+			ripemd160_rr[j]) + er;
+		ar = er; er = dr; dr = RIPEMD160_ROL(cr, 10); cr = br; br = t;
+	}
+	uint32_t t = h[1] + cl + dr;
+	h[1] = h[2] + dl + er;
+	h[2] = h[3] + el + ar;
+	h[3] = h[4] + al + br;
+	h[4] = h[0] + bl + cr;
+	h[0] = t;
+}
+
+/* write the 20-byte RIPEMD-160 digest of the ‘len’-byte message ‘msg’ to ‘out’ */
+static void ripemd160_digest(const unsigned char * msg, size_t len, unsigned char out[20]) {
+	uint32_t h[5] = {0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476, 0xc3d2e1f0};
+	unsigned char blk[128] = {0};
+	size_t pos = 0;
+	for (; pos + 64 <= len; pos += 64) {
+		ripemd160_compress(h, msg + pos);
+	}
+	/* final block(s): remaining bytes, 0x80, zeros, 64-bit little-endian message length in bits */
+	const size_t rem = len - pos;
+	const size_t fin_len = rem < 56 ? 64 : 128;
+	memcpy(blk, msg + pos, rem);
+	blk[rem] = 0x80;
+	const uint64_t nbits = (uint64_t)len * 8;
+	for (int i = 0; i < 8; i++) {
+		blk[fin_len - 8 + i] = (unsigned char)(nbits >> (8 * i));
+	}
+	for (size_t i = 0; i < fin_len; i += 64) {
+		ripemd160_compress(h, blk + i);
+	}
+	for (int i = 0; i < 5; i++) {
+		out[i*4]   = (unsigned char)h[i];
+		out[i*4+1] = (unsigned char)(h[i] >> 8);
+		out[i*4+2] = (unsigned char)(h[i] >> 16);
+		out[i*4+3] = (unsigned char)(h[i] >> 24);
+	}
+}
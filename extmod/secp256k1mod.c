@@ -27,6 +27,8 @@
 #include <secp256k1.h>
 #include <secp256k1_recovery.h>
 #include "random.h"
+#include "sha256.h"
+#include "ripemd160.h"
 
 static secp256k1_context * create_context(
 		const unsigned char randomize
@@ -136,6 +138,80 @@ static PyObject * pubkey_gen(PyObject *Py_UNUSED(self), PyObject *args) {
 	return Py_BuildValue("y#", pubkey_bytes, pubkey_bytes_len);
 }
 
+/*
+ * input: contiguous buffer of N 32-byte private keys
+ * returns: contiguous buffer of N serialized pubkeys (33 or 65 bytes each)
+ * the GIL is released for the duration of the batch
+ */
+static PyObject * pubkey_gen_batch(PyObject *Py_UNUSED(self), PyObject *args) {
+	Py_buffer privkeys;
+	int compressed;
+	if (!PyArg_ParseTuple(args, "y*i", &privkeys, &compressed)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (privkeys.len % 32 != 0) {
+		PyBuffer_Release(&privkeys);
+		PyErr_SetString(PyExc_ValueError, "Private key buffer length not a multiple of 32 bytes");
+		return NULL;
+	}
+	const Py_ssize_t nkeys = privkeys.len / 32;
+	const size_t pubkey_len = compressed == 1 ? 33 : 65;
+	const unsigned int flags = compressed == 1 ? SECP256K1_EC_COMPRESSED : SECP256K1_EC_UNCOMPRESSED;
+
+	PyObject *ret = PyBytes_FromStringAndSize(NULL, nkeys * pubkey_len);
+	if (ret == NULL) {
+		PyBuffer_Release(&privkeys);
+		return NULL;
+	}
+	secp256k1_context *ctx = create_context(1);
+	if (ctx == NULL) {
+		Py_DECREF(ret);
+		PyBuffer_Release(&privkeys);
+		return NULL;
+	}
+
+	const unsigned char * in = privkeys.buf;
+	unsigned char * out = (unsigned char *) PyBytes_AS_STRING(ret);
+	Py_ssize_t err_idx = -1;
+	int err_type = 0;
+
+	Py_BEGIN_ALLOW_THREADS
+	for (Py_ssize_t i = 0; i < nkeys; i++) {
+		secp256k1_pubkey pubkey;
+		size_t len = pubkey_len;
+		if (secp256k1_ec_seckey_verify(ctx, in + i * 32) != 1) {
+			err_idx = i; err_type = 1; break;
+		}
+		if (secp256k1_ec_pubkey_create(ctx, &pubkey, in + i * 32) != 1) {
+			err_idx = i; err_type = 2; break;
+		}
+		if (secp256k1_ec_pubkey_serialize(ctx, out + i * pubkey_len, &len, &pubkey, flags) != 1) {
+			err_idx = i; err_type = 3; break;
+		}
+	}
+	Py_END_ALLOW_THREADS
+
+	secp256k1_context_destroy(ctx);
+	PyBuffer_Release(&privkeys);
+
+	if (err_idx != -1) {
+		Py_DECREF(ret);
+		switch (err_type) {
+			case 1:
+				PyErr_Format(PyExc_ValueError, "Private key #%zd not in allowable range", err_idx);
+				break;
+			case 2:
+				PyErr_Format(PyExc_RuntimeError, "Public key creation failed for key #%zd", err_idx);
+				break;
+			default:
+				PyErr_Format(PyExc_RuntimeError, "Public key serialization failed for key #%zd", err_idx);
+		}
+		return NULL;
+	}
+	return ret;
+}
+
 static PyObject * pubkey_tweak_add(PyObject *Py_UNUSED(self), PyObject *args) {
 	const unsigned char * pubkey_bytes;
 	const unsigned char * tweak_bytes;
@@ -385,6 +461,165 @@ struct module_state {
 
 #define GETSTATE(m) ((struct module_state*)PyModule_GetState(m))
 
+/*
+ * input: buffer, message length (1-55 bytes), digest prefix (1-32 bytes)
+ * returns: list of offsets of all messages in the buffer whose SHA-256 digest
+ * begins with the prefix, i.e. a sliding-window search
+ * the GIL is released for the duration of the search
+ */
+static PyObject * sha256_prefix_scan(PyObject *Py_UNUSED(self), PyObject *args) {
+	Py_buffer data;
+	Py_ssize_t msg_len;
+	const unsigned char * prefix;
+	Py_ssize_t prefix_len;
+	if (!PyArg_ParseTuple(args, "y*ny#", &data, &msg_len, &prefix, &prefix_len)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (msg_len < 1 || msg_len > 55 || prefix_len < 1 || prefix_len > 32) {
+		PyBuffer_Release(&data);
+		PyErr_SetString(PyExc_ValueError, "Message or prefix length out of range");
+		return NULL;
+	}
+	PyObject *ret = PyList_New(0);
+	if (ret == NULL) {
+		PyBuffer_Release(&data);
+		return NULL;
+	}
+
+	/* single padded block: message, 0x80, zeros, 64-bit big-endian message length in bits */
+	unsigned char blk[64] = {0};
+	blk[msg_len] = 0x80;
+	blk[62] = (unsigned char)(msg_len * 8 >> 8);
+	blk[63] = (unsigned char)(msg_len * 8);
+
+	const unsigned char * in = data.buf;
+	const Py_ssize_t count = data.len >= msg_len ? data.len - msg_len + 1 : 0;
+	const int nwords = (int)(prefix_len + 3) / 4;
+	const sha256_compress_fn sha256_compress = sha256_get_compress_fn();
+	Py_ssize_t pos = 0;
+
+	while (pos < count) {
+		Py_ssize_t found = -1;
+		Py_BEGIN_ALLOW_THREADS
+		for (; pos < count; pos++) {
+			uint32_t h[8];
+			unsigned char digest[32];
+			memcpy(h, sha256_iv, sizeof(h));
+			memcpy(blk, in + pos, msg_len);
+			sha256_compress(h, blk);
+			for (int i = 0; i < nwords; i++) {
+				digest[i*4]   = (unsigned char)(h[i] >> 24);
+				digest[i*4+1] = (unsigned char)(h[i] >> 16);
+				digest[i*4+2] = (unsigned char)(h[i] >> 8);
+				digest[i*4+3] = (unsigned char)h[i];
+			}
+			if (memcmp(digest, prefix, prefix_len) == 0) {
+				found = pos++;
+				break;
+			}
+		}
+		Py_END_ALLOW_THREADS
+		if (found != -1) {
+			PyObject *n = PyLong_FromSsize_t(found);
+			if (n == NULL || PyList_Append(ret, n) != 0) {
+				Py_XDECREF(n);
+				Py_DECREF(ret);
+				PyBuffer_Release(&data);
+				return NULL;
+			}
+			Py_DECREF(n);
+		}
+	}
+	PyBuffer_Release(&data);
+	return ret;
+}
+
+/*
+ * input: message of one or more 64-byte blocks, with no padding
+ * returns: 32-byte SHA-256 state after compressing the blocks into the initial state,
+ * i.e. the raw compression function used by Zcash for its PRF
+ */
+static PyObject * sha256_compress(PyObject *Py_UNUSED(self), PyObject *args) {
+	const unsigned char * in;
+	Py_ssize_t in_len;
+	if (!PyArg_ParseTuple(args, "y#", &in, &in_len)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (in_len == 0 || in_len % 64) {
+		PyErr_SetString(PyExc_ValueError, "Message length not a non-zero multiple of 64 bytes");
+		return NULL;
+	}
+	const sha256_compress_fn compress = sha256_get_compress_fn();
+	uint32_t h[8];
+	unsigned char out[32];
+	memcpy(h, sha256_iv, sizeof(h));
+	for (Py_ssize_t pos = 0; pos < in_len; pos += 64) {
+		compress(h, in + pos);
+	}
+	for (int i = 0; i < 8; i++) {
+		out[i*4]   = (unsigned char)(h[i] >> 24);
+		out[i*4+1] = (unsigned char)(h[i] >> 16);
+		out[i*4+2] = (unsigned char)(h[i] >> 8);
+		out[i*4+3] = (unsigned char)h[i];
+	}
+	return Py_BuildValue("y#", out, (Py_ssize_t)32);
+}
+
+/*
+ * input: message
+ * returns: 20-byte RIPEMD-160 digest of the message
+ */
+static PyObject * ripemd160(PyObject *Py_UNUSED(self), PyObject *args) {
+	const unsigned char * in;
+	Py_ssize_t in_len;
+	if (!PyArg_ParseTuple(args, "y#", &in, &in_len)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	unsigned char out[20];
+	ripemd160_digest(in, (size_t)in_len, out);
+	return Py_BuildValue("y#", out, (Py_ssize_t)20);
+}
+
+/*
+ * input: buffer of concatenated messages (e.g. serialized pubkeys), message length
+ * returns: concatenated 20-byte RIPEMD-160(SHA-256(message)) digests of the messages
+ * the GIL is released for the duration of the computation
+ */
+static PyObject * hash160_batch(PyObject *Py_UNUSED(self), PyObject *args) {
+	Py_buffer data;
+	Py_ssize_t msg_len;
+	if (!PyArg_ParseTuple(args, "y*n", &data, &msg_len)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (msg_len < 1 || data.len % msg_len) {
+		PyBuffer_Release(&data);
+		PyErr_SetString(PyExc_ValueError, "Buffer length not a multiple of message length");
+		return NULL;
+	}
+	const Py_ssize_t count = data.len / msg_len;
+	PyObject *ret = PyBytes_FromStringAndSize(NULL, count * 20);
+	if (ret == NULL) {
+		PyBuffer_Release(&data);
+		return NULL;
+	}
+	const unsigned char * in = data.buf;
+	unsigned char * out = (unsigned char *)PyBytes_AS_STRING(ret);
+	const sha256_compress_fn compress = sha256_get_compress_fn();
+	Py_BEGIN_ALLOW_THREADS
+	for (Py_ssize_t i = 0; i < count; i++) {
+		unsigned char digest[32];
+		sha256_digest(compress, in + i * msg_len, (size_t)msg_len, digest);
+		ripemd160_digest(digest, 32, out + i * 20);
+	}
+	Py_END_ALLOW_THREADS
+	PyBuffer_Release(&data);
+	return ret;
+}
+
 static PyMethodDef secp256k1_methods[] = {
 	{
 		"pubkey_gen",
@@ -392,6 +627,12 @@ static PyMethodDef secp256k1_methods[] = {
 		METH_VARARGS,
 		"Generate a serialized pubkey from privkey bytes"
 	},
+	{
+		"pubkey_gen_batch",
+		pubkey_gen_batch,
+		METH_VARARGS,
+		"Generate concatenated serialized pubkeys from a buffer of concatenated 32-byte privkeys"
+	},
 	{
 		"pubkey_tweak_add",
 		pubkey_tweak_add,
@@ -428,6 +669,30 @@ static PyMethodDef secp256k1_methods[] = {
 		METH_VARARGS,
 		"Convert a compressed or uncompressed serialized pubkey into an uncompressed serialized pubkey"
 	},
+	{
+		"sha256_prefix_scan",
+		sha256_prefix_scan,
+		METH_VARARGS,
+		"Find the offsets of all fixed-length messages in a buffer whose SHA-256 digest begins with a given prefix"
+	},
+	{
+		"sha256_compress",
+		sha256_compress,
+		METH_VARARGS,
+		"Compress a message of 64-byte blocks into the SHA-256 initial state, with no padding"
+	},
+	{
+		"ripemd160",
+		ripemd160,
+		METH_VARARGS,
+		"Compute the RIPEMD-160 digest of a message"
+	},
+	{
+		"hash160_batch",
+		hash160_batch,
+		METH_VARARGS,
+		"Compute concatenated RIPEMD-160(SHA-256()) digests of a buffer of concatenated fixed-length messages"
+	},
 	{NULL, NULL, 0, NULL}
 };
 
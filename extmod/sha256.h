@@ -0,0 +1,159 @@
+/*
+ * MMGen Wallet, a terminal-based cryptocurrency wallet
+ * Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+ * Licensed under the GNU General Public License, Version 3:
+ *   https://www.gnu.org/licenses
+ * Public project repositories:
+ *   https://github.com/mmgen/mmgen-wallet
+ *   https://gitlab.com/mmgen/mmgen-wallet
+ */
+
+/*
+ * sha256.h: SHA-256 compression function (FIPS 180-4)
+ *
+ * sha256_get_compress_fn() selects the x86 SHA extensions if the CPU supports them.
+ */
+
+#include <stdint.h>
+#include <string.h>
+
+static const uint32_t sha256_k[64] = {
+	0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+	0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+	0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+	0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+	0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+	0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+	0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+	0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+static const uint32_t sha256_iv[8] = {
+	0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+};
+
+#define SHA256_ROR(x, n) (((x) >> (n)) | ((x) << (32 - (n))))
+
+/* update state ‘h’ with the 64-byte block ‘blk’ */
+static void sha256_compress_generic(uint32_t h[8], const unsigned char blk[64]) {
+	uint32_t w[64];
+	for (int i = 0; i < 16; i++) {
+		w[i] = (uint32_t)blk[i*4] << 24 | (uint32_t)blk[i*4+1] << 16 | (uint32_t)blk[i*4+2] << 8 | blk[i*4+3];
+	}
+	for (int i = 16; i < 64; i++) {
+		uint32_t s0 = SHA256_ROR(w[i-15], 7) ^ SHA256_ROR(w[i-15], 18) ^ (w[i-15] >> 3);
+		uint32_t s1 = SHA256_ROR(w[i-2], 17) ^ SHA256_ROR(w[i-2], 19) ^ (w[i-2] >> 10);
+		w[i] = w[i-16] + s0 + w[i-7] + s1;
+	}
+	uint32_t a = h[0], b = h[1], c = h[2], d = h[3], e = h[4], f = h[5], g = h[6], hh = h[7];
+	for (int i = 0; i < 64; i++) {
+		uint32_t t1 = hh + (SHA256_ROR(e, 6) ^ SHA256_ROR(e, 11) ^ SHA256_ROR(e, 25))
+			+ ((e & f) ^ (~e & g)) + sha256_k[i] + w[i];
+		uint32_t t2 = (SHA256_ROR(a, 2) ^ SHA256_ROR(a, 13) ^ SHA256_ROR(a, 22))
+			+ ((a & b) ^ (a & c) ^ (b & c));
+		hh = g; g = f; f = e; e = d + t1;
+		d = c; c = b; b = a; a = t1 + t2;
+	}
+	h[0] += a; h[1] += b; h[2] += c; h[3] += d;
+	h[4] += e; h[5] += f; h[6] += g; h[7] += hh;
+}
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+
+#include <cpuid.h>
+#include <immintrin.h>
+
+__attribute__((target("sha,ssse3,sse4.1")))
+static void sha256_compress_shani(uint32_t h[8], const unsigned char blk[64]) {
+	const __m128i mask = _mm_set_epi64x(0x0c0d0e0f08090a0bULL, 0x0405060700010203ULL);
+	__m128i msgs[4], msg, tmp;
+
+	tmp = _mm_shuffle_epi32(_mm_loadu_si128((const __m128i *) &h[0]), 0xB1);         /* CDAB */
+	__m128i state1 = _mm_shuffle_epi32(_mm_loadu_si128((const __m128i *) &h[4]), 0x1B); /* EFGH */
+	__m128i state0 = _mm_alignr_epi8(tmp, state1, 8);                                 /* ABEF */
+	state1 = _mm_blend_epi16(state1, tmp, 0xF0);                                      /* CDGH */
+	const __m128i abef_save = state0, cdgh_save = state1;
+
+	/* 16 groups of four rounds, with the message schedule computed four words at a time */
+	for (int g = 0; g < 16; g++) {
+		if (g < 4) {
+			msgs[g] = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *) (blk + g * 16)), mask);
+		}
+		msg = _mm_add_epi32(msgs[g % 4], _mm_loadu_si128((const __m128i *) &sha256_k[g * 4]));
+		state1 = _mm_sha256rnds2_epu32(state1, state0, msg);
+		if (g >= 3 && g <= 14) {
+			tmp = _mm_alignr_epi8(msgs[g % 4], msgs[(g + 3) % 4], 4);
+			msgs[(g + 1) % 4] = _mm_sha256msg2_epu32(_mm_add_epi32(msgs[(g + 1) % 4], tmp), msgs[g % 4]);
+		}
+		state0 = _mm_sha256rnds2_epu32(state0, state1, _mm_shuffle_epi32(msg, 0x0E));
+		if (g >= 1 && g <= 12) {
+			msgs[(g + 3) % 4] = _mm_sha256msg1_epu32(msgs[(g + 3) % 4], msgs[g % 4]);
+		}
+	}
+
+	state0 = _mm_add_epi32(state0, abef_save);
+	state1 = _mm_add_epi32(state1, cdgh_save);
+
+	tmp = _mm_shuffle_epi32(state0, 0x1B);        /* FEBA */
+	state1 = _mm_shuffle_epi32(state1, 0xB1);     /* DCHG */
+	state0 = _mm_blend_epi16(tmp, state1, 0xF0);  /* DCBA */
+	state1 = _mm_alignr_epi8(state1, tmp, 8);     /* ABEF */
+	_mm_storeu_si128((__m128i *) &h[0], state0);
+	_mm_storeu_si128((__m128i *) &h[4], state1);
+}
+
+static int sha256_have_shani(void) {
+	unsigned int eax, ebx, ecx, edx;
+	if (!__get_cpuid(1, &eax, &ebx, &ecx, &edx) || !(ecx & (1 << 9)) || !(ecx & (1 << 19))) {
+		return 0; /* no SSSE3 or SSE4.1 */
+	}
+	return __get_cpuid_count(7, 0, &eax, &ebx, &ecx, &edx) && (ebx & (1 << 29));
+}
+
+#else
+
+static int sha256_have_shani(void) {
+	return 0;
+}
+
+static void sha256_compress_shani(uint32_t h[8], const unsigned char blk[64]) {
+	sha256_compress_generic(h, blk);
+}
+
+#endif
+
+typedef void (*sha256_compress_fn)(uint32_t h[8], const unsigned char blk[64]);
+
+/* returns the fastest compression function supported by the CPU */
+static sha256_compress_fn sha256_get_compress_fn(void) {
+	return sha256_have_shani() ? sha256_compress_shani : sha256_compress_generic;
+}
+
+/* write the 32-byte SHA-256 digest of the ‘len’-byte message ‘msg’ to ‘out’ */
+static void sha256_digest(sha256_compress_fn compress, const unsigned char * msg, size_t len, unsigned char out[32]) {
+	uint32_t h[8];
+	unsigned char blk[128] = {0};
+	size_t pos = 0;
+	memcpy(h, sha256_iv, sizeof(h));
+	for (; pos + 64 <= len; pos += 64) {
+		compress(h, msg + pos);
+	}
+	/* final block(s): remaining bytes, 0x80, zeros, 64-bit big-endian message length in bits */
+	const size_t rem = len - pos;
+	const size_t fin_len = rem < 56 ? 64 : 128;
+	memcpy(blk, msg + pos, rem);
+	blk[rem] = 0x80;
+	const uint64_t nbits = (uint64_t)len * 8;
+	for (int i = 0; i < 8; i++) {
+		blk[fin_len - 1 - i] = (unsigned char)(nbits >> (8 * i));
+	}
+	for (size_t i = 0; i < fin_len; i += 64) {
+		compress(h, blk + i);
+	}
+	for (int i = 0; i < 8; i++) {
+		out[i*4]   = (unsigned char)(h[i] >> 24);
+		out[i*4+1] = (unsigned char)(h[i] >> 16);
+		out[i*4+2] = (unsigned char)(h[i] >> 8);
+		out[i*4+3] = (unsigned char)h[i];
+	}
+}
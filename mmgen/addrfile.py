@@ -20,14 +20,18 @@
 addrfile: Address and password file classes for the MMGen suite
 """
 
+import re
+from array import array
+
 from .cfg import gc
-from .util import msg, die, capfirst
+from .util import msg, die, capfirst, get_extension
 from .protocol import init_proto
 from .obj import MMGenObject, TwComment, WalletPassword, MMGenPWIDString
 from .seed import SeedID, is_seed_id
 from .key import PrivKey
 from .addr import ViewKey, AddrListID, MMGenAddrType, MMGenPasswordType, is_addr_idx
-from .addrlist import AddrListData
+from .addrlist import AddrListIDStr
+from .addrlistdata import CompactAddrListData
 
 class AddrFile(MMGenObject):
 	desc        = 'addresses'
@@ -92,7 +96,7 @@ class AddrFile(MMGenObject):
 			+ ([proto.network.upper()] if proto.testnet else []))
 		return self.parent.al_id.sid + (' ' if lbl_p2 else '') + lbl_p2
 
-	def format(self, *, add_comments=False):
+	def format_header(self):
 		p = self.parent
 		if p.gen_passwds and p.pw_fmt in ('bip39', 'xmrseed'):
 			desc_pfx = f'{p.pw_fmt.upper()} '
@@ -115,48 +119,130 @@ class AddrFile(MMGenObject):
 		lbl = self.make_label()
 		self.parent.dmsg_sc('lbl', lbl[9:])
 		out.append(f'{lbl} {{')
+		return out
+
+	def format_entry(self, e, fs, add_comments):
+		p = self.parent
+		c = ' ' + e.comment if add_comments and e.comment else ''
+		match type(p).__name__:
+			case 'KeyList':
+				yield fs.format(e.idx, f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c)
+			case 'PasswordList':
+				yield fs.format(e.idx, e.passwd, c)
+			case _: # First line with idx
+				yield fs.format(e.idx, e.addr.views[e.addr.view_pref], c)
+				if p.has_keys:
+					if self.cfg.b16:
+						yield fs.format('', f'orig_hex: {e.sec.orig_bytes.hex()}', c)
+					if type(self) is not ViewKeyAddrFile:
+						yield fs.format('', f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c)
+					for k in ('viewkey', 'wallet_passwd'):
+						v = getattr(e, k)
+						if v:
+							yield fs.format('', f'{k}: {v}', c)
 
+	def format(self, *, add_comments=False):
+		p = self.parent
+		out = self.format_header()
 		fs = '  {:<%s}  {:<34}{}' % len(str(p.data[-1].idx))
 		for e in p.data:
-			c = ' ' + e.comment if add_comments and e.comment else ''
-			match type(p).__name__:
-				case 'KeyList':
-					out.append(fs.format(e.idx, f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c))
-				case 'PasswordList':
-					out.append(fs.format(e.idx, e.passwd, c))
-				case _: # First line with idx
-					out.append(fs.format(e.idx, e.addr.views[e.addr.view_pref], c))
-					if p.has_keys:
-						if self.cfg.b16:
-							out.append(fs.format('', f'orig_hex: {e.sec.orig_bytes.hex()}', c))
-						if type(self) is not ViewKeyAddrFile:
-							out.append(fs.format('', f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c))
-						for k in ('viewkey', 'wallet_passwd'):
-							v = getattr(e, k)
-							if v:
-								out.append(fs.format('', f'{k}: {v}', c))
-
+			out.extend(self.format_entry(e, fs, add_comments))
 		out.append('}')
 		self.fmt_data = '\n'.join([l.rstrip() for l in out]) + '\n'
 		return self.fmt_data
 
+	def write_stream(self, fn=None, *, ask_overwrite=True, outdir=None):
+		"""
+		Generate the entries of a streaming list chunk-wise, writing them to file
+		as they are generated and computing the checksum incrementally.  The
+		checksum in the file header is filled in once all entries are written.
+		"""
+		p = self.parent
+		assert getattr(p, 'stream_src', None), 'write_stream() requires a list initialized with ‘stream’'
+
+		import os
+		from .util import make_full_path
+		outfile = fn or self.filename
+		if (outdir or self.cfg.outdir) and not os.path.isabs(outfile):
+			outfile = make_full_path(str(outdir or self.cfg.outdir), outfile)
+
+		if os.path.lexists(outfile) and ask_overwrite and not self.cfg.quiet:
+			from .ui import confirm_or_raise
+			confirm_or_raise(
+				self.cfg,
+				message = '',
+				action  = f'File {outfile!r} already exists\nOverwrite?')
+			msg(f'Overwriting file {outfile!r}')
+
+		seed, addr_idxs = p.stream_src
+		hasher = p.chksum_hasher()
+		if hasher:
+			p.chksum = hasher.chksum() # placeholder of the same width
+
+		def encode(lines):
+			return ('\n'.join([l.rstrip() for l in lines]) + '\n').encode()
+
+		hdr = encode(self.format_header())
+		fs = '  {:<%s}  {:<34}{}' % len(str(addr_idxs[-1]))
+
+		# write to a temporary file, so that an interrupted run leaves no truncated list:
+		tmp_outfile = outfile + '.tmp'
+		try:
+			with open(tmp_outfile, 'wb') as fp:
+				fp.write(hdr)
+				for chunk in p.gen_entries(seed, addr_idxs):
+					lines = []
+					for e in chunk:
+						if hasher:
+							hasher.update(e)
+						lines.extend(self.format_entry(e, fs, False))
+					fp.write(encode(lines))
+				fp.write(b'}\n')
+				if hasher:
+					fp.seek(hdr.index(f': {p.chksum}\n'.encode()) + 2)
+					p.chksum = hasher.chksum()
+					fp.write(p.chksum.encode())
+			os.replace(tmp_outfile, outfile)
+		except OSError:
+			die(2, f'Failed to write {self.desc} to file {outfile!r}')
+		finally:
+			if os.path.exists(tmp_outfile):
+				os.unlink(tmp_outfile)
+
+		msg(f'{capfirst(self.desc)} written to file {outfile!r}')
+
+		if hasher:
+			p.do_chksum_msg(record=True)
+
+		return outfile
+
 	def get_line(self, lines):
-		ret = lines.pop(0).split(None, 2)
+		ret = next(lines).split(None, 2)
 		self.line_ctr += 1
 		if ret[0] == 'orig_hex:': # hacky
-			ret = lines.pop(0).split(None, 2)
+			ret = next(lines).split(None, 2)
 			self.line_ctr += 1
 		return ret if len(ret) == 3 else ret + ['']
 
-	def parse_file_body(self, lines):
-
+	def get_data_line(self, lines):
+		try:
+			return self.get_line(lines)
+		except StopIteration:
+			raise ValueError('unexpected end of data') from None
+
+	def gen_entries(self, lines):
+		"""
+		Parse file body lines from iterator ‘lines’, yielding entries as they are read
+		"""
 		p = self.parent
-		ret = AddrListData()
 		le = p.entry_type
 		iifs = "{!r}: invalid identifier [expected '{}:']"
 
-		while lines:
-			idx, addr, comment = self.get_line(lines)
+		while True:
+			try:
+				idx, addr, comment = self.get_line(lines)
+			except StopIteration:
+				return
 
 			assert is_addr_idx(idx), f'invalid address index {idx!r}'
 			p.check_format(addr)
@@ -165,87 +251,159 @@ class AddrFile(MMGenObject):
 
 			if p.has_keys: # order: wif, (orig_hex), viewkey, wallet_passwd
 				if type(self) is not ViewKeyAddrFile:
-					d = self.get_line(lines)
+					d = self.get_data_line(lines)
 					assert d[0] == p.al_id.mmtype.wif_label+':', iifs.format(d[0], p.al_id.mmtype.wif_label)
 					a.sec = PrivKey(proto=p.proto, wif=d[1])
 				for k, dtype, add_proto in (
 					('viewkey', ViewKey, True),
 					('wallet_passwd', WalletPassword, False)):
 					if k in p.al_id.mmtype.extra_attrs:
-						d = self.get_line(lines)
+						d = self.get_data_line(lines)
 						assert d[0] == k+':', iifs.format(d[0], k)
 						setattr(a, k, dtype(*((p.proto, d[1]) if add_proto else (d[1],))))
 
-			ret.append(a)
+			yield a
 
+	def need_key_check(self):
+		p = self.parent
 		if type(self) is not ViewKeyAddrFile and p.has_keys and p.ka_validity_chk is not False:
+			if self.cfg.yes or p.ka_validity_chk:
+				return True
+			from .ui import keypress_confirm
+			return keypress_confirm(p.cfg, 'Check key-to-address validity?')
+		return False
+
+	def get_key_checker(self):
+		p = self.parent
+		from .addrgen import KeyGenerator, AddrGenerator
+		kg = KeyGenerator(self.cfg, p.proto, p.al_id.mmtype.pubkey_type)
+		ag = AddrGenerator(self.cfg, p.proto, p.al_id.mmtype)
+		def check_key(e):
+			assert e.addr == ag.to_addr(kg.gen_data(e.sec)), (
+				f'Key doesn’t match address!\n  {e.sec.wif}\n  {e.addr}')
+		return check_key
 
-			def verify_keys():
-				from .addrgen import KeyGenerator, AddrGenerator
-				kg = KeyGenerator(self.cfg, p.proto, p.al_id.mmtype.pubkey_type)
-				ag = AddrGenerator(self.cfg, p.proto, p.al_id.mmtype)
-				llen = len(ret)
-				qmsg_r = p.cfg._util.qmsg_r
-				for n, e in enumerate(ret):
-					qmsg_r(f'\rVerifying keys {n+1}/{llen}')
-					assert e.addr == ag.to_addr(kg.gen_data(e.sec)), (
-						f'Key doesn’t match address!\n  {e.sec.wif}\n  {e.addr}')
-				p.cfg._util.qmsg(' - done')
+	def parse_file_body(self, lines):
 
-			if self.cfg.yes or p.ka_validity_chk:
-				verify_keys()
-			else:
-				from .ui import keypress_confirm
-				if keypress_confirm(p.cfg, 'Check key-to-address validity?'):
-					verify_keys()
+		p = self.parent
+		ret = CompactAddrListData(p.proto, p.entry_type)
+		hasher = p.chksum_hasher()
+
+		for e in self.gen_entries(iter(lines)):
+			if hasher:
+				hasher.update(e)
+			ret.append(e)
+
+		if hasher:
+			p.chksum = hasher.chksum()
+
+		if self.need_key_check():
+			check_key = self.get_key_checker()
+			llen = len(ret)
+			qmsg_r = p.cfg._util.qmsg_r
+			for n, e in enumerate(ret):
+				qmsg_r(f'\rVerifying keys {n+1}/{llen}')
+				check_key(e)
+			p.cfg._util.qmsg(' - done')
 
 		return ret
 
-	def parse_file(self, fn, *, buf=[], exit_on_error=True):
+	def parse_label(self, lbl):
+		"""
+		label examples:
+		- Bitcoin legacy mainnet:           no label
+		- BCH legacy mainnet (no cashaddr): no label
+		- BCH legacy mainnet (cashaddr):    'BCH'
+		- Bitcoin legacy testnet:           'LEGACY:TESTNET'
+		- Bitcoin Segwit:                   'SEGWIT'
+		- Bitcoin Segwit testnet:           'SEGWIT:TESTNET'
+		- Bitcoin Bech32 regtest:           'BECH32:REGTEST'
+		- Litecoin legacy mainnet:          'LTC'
+		- Litecoin Bech32 mainnet:          'LTC:BECH32'
+		- Litecoin legacy testnet:          'LTC:LEGACY:TESTNET'
+		- Ethereum mainnet:                 'ETH'
+		- Ethereum Classic mainnet:         'ETC'
+		- Ethereum regtest:                 'ETH:REGTEST'
+		"""
+		lbl = lbl.lower()
+
+		# remove the network component:
+		if lbl.endswith(':testnet'):
+			network = 'testnet'
+			lbl = lbl[:-8]
+		elif lbl.endswith(':regtest'):
+			network = 'regtest'
+			lbl = lbl[:-8]
+		else:
+			network = 'mainnet'
 
-		def parse_addrfile_label(lbl):
-			"""
-			label examples:
-			- Bitcoin legacy mainnet:           no label
-			- BCH legacy mainnet (no cashaddr): no label
-			- BCH legacy mainnet (cashaddr):    'BCH'
-			- Bitcoin legacy testnet:           'LEGACY:TESTNET'
-			- Bitcoin Segwit:                   'SEGWIT'
-			- Bitcoin Segwit testnet:           'SEGWIT:TESTNET'
-			- Bitcoin Bech32 regtest:           'BECH32:REGTEST'
-			- Litecoin legacy mainnet:          'LTC'
-			- Litecoin Bech32 mainnet:          'LTC:BECH32'
-			- Litecoin legacy testnet:          'LTC:LEGACY:TESTNET'
-			- Ethereum mainnet:                 'ETH'
-			- Ethereum Classic mainnet:         'ETC'
-			- Ethereum regtest:                 'ETH:REGTEST'
-			"""
-			lbl = lbl.lower()
-
-			# remove the network component:
-			if lbl.endswith(':testnet'):
-				network = 'testnet'
-				lbl = lbl[:-8]
-			elif lbl.endswith(':regtest'):
-				network = 'regtest'
-				lbl = lbl[:-8]
-			else:
-				network = 'mainnet'
+		from .proto.btc.params import mainnet
+		if lbl in [MMGenAddrType(mainnet, key).name for key in mainnet.mmtypes]:
+			coin, mmtype_key = ('BTC', lbl)
+		elif ':' in lbl: # first component is coin, second is mmtype_key
+			coin, mmtype_key = lbl.split(':')
+		else:            # only component is coin
+			coin, mmtype_key = (lbl, None)
+
+		proto = init_proto(self.cfg, coin=coin, network=network)
+
+		if mmtype_key is None:
+			mmtype_key = proto.mmtypes[0]
 
-			from .proto.btc.params import mainnet
-			if lbl in [MMGenAddrType(mainnet, key).name for key in mainnet.mmtypes]:
-				coin, mmtype_key = ('BTC', lbl)
-			elif ':' in lbl: # first component is coin, second is mmtype_key
-				coin, mmtype_key = lbl.split(':')
-			else:            # only component is coin
-				coin, mmtype_key = (lbl, None)
+		return (proto, proto.addr_type(mmtype_key))
 
-			proto = init_proto(p.cfg, coin=coin, network=network)
+	def parse_first_line(self, line, fn):
+		"""
+		Parse the first line of the file, setting the parent’s Seed ID, network
+		and address type, or password parameters
+		"""
+		p = self.parent
 
-			if mmtype_key is None:
-				mmtype_key = proto.mmtypes[0]
+		ls = line.split()
+		assert 1 < len(ls) < 5, f'Invalid first line for {p.gen_desc} file: {line!r}'
+		assert ls[-1] == '{', f'{ls!r}: invalid first line'
+		ls.pop()
+		sid = ls.pop(0)
+		assert is_seed_id(sid), f'{sid!r}: invalid Seed ID'
+
+		match len(ls):
+			case 2 if type(p).__name__ == 'PasswordList':
+				match ls.pop().split(':', 1):
+					case [a, b]:
+						p.set_pw_fmt(a)
+						p.set_pw_len(b)
+					case x:
+						die(1, f'{x!r}: invalid password length specifier (must contain colon)')
+				p.pw_id_str = MMGenPWIDString(ls.pop())
+				modname, funcname = p.pw_info[p.pw_fmt].chk_func.split('.')
+				import importlib
+				p.chk_func = getattr(importlib.import_module('mmgen.'+modname), funcname)
+				proto = init_proto(p.cfg, 'btc') # FIXME: dummy protocol
+				mmtype = MMGenPasswordType(proto, 'P')
+			case 1:
+				proto, mmtype = self.parse_label(ls[0])
+			case 0:
+				proto = init_proto(p.cfg, 'btc')
+				mmtype = proto.addr_type('L')
+			case _:
+				raise ValueError(f'{line}: Invalid first line for {p.gen_desc} file {fn!r}')
+
+		if type(p).__name__ != 'PasswordList':
+			if proto.base_coin != p.proto.base_coin or proto.network != p.proto.network:
+				# Having caller supply protocol and checking address file protocol against it here
+				# allows us to catch all mismatches in one place.  This behavior differs from that of
+				# transaction files, which determine the protocol independently, requiring the caller
+				# to check for protocol mismatches (e.g. mmgen.tx.completed.check_correct_chain())
+				raise ValueError(
+					f'{p.desc} file is '
+					+ f'{proto.base_coin} {proto.network} but protocol is '
+					+ f'{p.proto.base_coin} {p.proto.network}')
+
+		p.base_coin = proto.base_coin
+		p.network = proto.network
+		p.al_id = AddrListID(sid=SeedID(sid=sid), mmtype=mmtype)
 
-			return (proto, proto.addr_type(mmtype_key))
+	def parse_file(self, fn, *, buf=[], exit_on_error=True):
 
 		p = self.parent
 
@@ -254,53 +412,10 @@ class AddrFile(MMGenObject):
 
 		try:
 			assert len(lines) >= 3, f'Too few lines in address file ({len(lines)})'
-			ls = lines[0].split()
-			assert 1 < len(ls) < 5, f'Invalid first line for {p.gen_desc} file: {lines[0]!r}'
-			assert ls[-1] == '{', f'{ls!r}: invalid first line'
-			ls.pop()
+			self.parse_first_line(lines[0], fn)
 			assert lines[-1] == '}', f'{lines[-1]!r}: invalid last line'
-			sid = ls.pop(0)
-			assert is_seed_id(sid), f'{sid!r}: invalid Seed ID'
-
-			match len(ls):
-				case 2 if type(p).__name__ == 'PasswordList':
-					match ls.pop().split(':', 1):
-						case [a, b]:
-							p.set_pw_fmt(a)
-							p.set_pw_len(b)
-						case x:
-							die(1, f'{x!r}: invalid password length specifier (must contain colon)')
-					p.pw_id_str = MMGenPWIDString(ls.pop())
-					modname, funcname = p.pw_info[p.pw_fmt].chk_func.split('.')
-					import importlib
-					p.chk_func = getattr(importlib.import_module('mmgen.'+modname), funcname)
-					proto = init_proto(p.cfg, 'btc') # FIXME: dummy protocol
-					mmtype = MMGenPasswordType(proto, 'P')
-				case 1:
-					proto, mmtype = parse_addrfile_label(ls[0])
-				case 0:
-					proto = init_proto(p.cfg, 'btc')
-					mmtype = proto.addr_type('L')
-				case _:
-					raise ValueError(f'{lines[0]}: Invalid first line for {p.gen_desc} file {fn!r}')
-
-			if type(p).__name__ != 'PasswordList':
-				if proto.base_coin != p.proto.base_coin or proto.network != p.proto.network:
-					# Having caller supply protocol and checking address file protocol against it here
-					# allows us to catch all mismatches in one place.  This behavior differs from that of
-					# transaction files, which determine the protocol independently, requiring the caller
-					# to check for protocol mismatches (e.g. mmgen.tx.completed.check_correct_chain())
-					raise ValueError(
-						f'{p.desc} file is '
-						+ f'{proto.base_coin} {proto.network} but protocol is '
-						+ f'{p.proto.base_coin} {p.proto.network}')
-
-			p.base_coin = proto.base_coin
-			p.network = proto.network
-			p.al_id = AddrListID(sid=SeedID(sid=sid), mmtype=mmtype)
-
 			data = self.parse_file_body(lines[1:-1])
-			assert isinstance(data, list), 'Invalid file body data'
+			assert isinstance(data, CompactAddrListData), 'Invalid file body data'
 		except Exception as e:
 			m_add = f', content line {self.line_ctr}' if self.line_ctr else ''
 			m = f'Invalid data in {p.desc} list file ‘{fn}’{m_add} ({e!s})'
@@ -312,6 +427,71 @@ class AddrFile(MMGenObject):
 
 		return data
 
+	def iter_file(self, fn=None):
+		"""
+		Parse an address file lazily, yielding entries as they are read.  The
+		checksum is computed incrementally and, at the end of the stream, set
+		as the parent’s checksum and verified against the value recorded in the
+		file header, if present.
+		"""
+		p = self.parent
+		fn = fn or p.infile
+		recorded_chksum = None
+
+		def gen_lines():
+			chk_pat = re.compile(r'# .* data checksum for \S+: ([0-9A-F]{4}(?: [0-9A-F]{4}){3})$')
+			comment_pat = re.compile('#.*')
+			def process(lines):
+				nonlocal recorded_chksum
+				for line in lines:
+					if m := chk_pat.match(line.rstrip()):
+						recorded_chksum = m[1]
+					if line := comment_pat.sub('', line).rstrip():
+						yield line
+			from .crypto import Crypto
+			if get_extension(fn) == Crypto.mmenc_ext: # encrypted files are read in full
+				from .fileutil import get_lines_from_file
+				yield from process(get_lines_from_file(p.cfg, fn, desc=f'{p.desc} data'))
+			else:
+				p.cfg._util.qmsg(f'Getting {p.desc} data from file ‘{fn}’')
+				with open(fn, encoding='utf8') as fp:
+					yield from process(fp)
+
+		def gen_body(lines):
+			for line in lines:
+				if line == '}':
+					if (extra := next(lines, None)) is not None:
+						raise ValueError(f'{extra!r}: data found after closing brace')
+					return
+				yield line
+			raise ValueError('closing brace missing at end of file')
+
+		try:
+			lines = gen_lines()
+			self.parse_first_line(next(lines, ''), fn)
+			check_key = self.get_key_checker() if self.need_key_check() else None
+			hasher = p.chksum_hasher()
+			idxs = array('I')
+			for e in self.gen_entries(gen_body(lines)):
+				if check_key:
+					check_key(e)
+				if hasher:
+					hasher.update(e)
+				idxs.append(e.idx)
+				yield e
+			assert idxs, 'no entries found in file'
+			if type(p).__name__ != 'PasswordList':
+				p.id_str = AddrListIDStr(p, idxs=list(idxs))
+			p.num_addrs = len(idxs)
+			if hasher:
+				p.chksum = hasher.chksum()
+				if recorded_chksum:
+					assert p.chksum == recorded_chksum, (
+						f'checksum mismatch (computed {p.chksum}, recorded {recorded_chksum})')
+		except Exception as e:
+			m_add = f', content line {self.line_ctr}' if self.line_ctr else ''
+			die(3, f'Invalid data in {p.desc} list file ‘{fn}’{m_add} ({e!s})')
+
 class KeyAddrFile(AddrFile):
 	desc = 'secret keys'
 	ext  = 'akeys'
@@ -342,11 +522,12 @@ class PasswordFile(AddrFile):
 
 	def get_line(self, lines):
 
+		line = next(lines)
 		self.line_ctr += 1
 		p = self.parent
 
 		if p.pw_fmt in ('bip39', 'xmrseed'):
-			ret = lines.pop(0).split(None, p.pw_len + 1)
+			ret = line.split(None, p.pw_len + 1)
 			match len(ret) - 1:
 				case p.pw_len:
 					return (ret[0], ' '.join(ret[1: p.pw_len + 1]), '')
@@ -357,7 +538,7 @@ class PasswordFile(AddrFile):
 				case x if x < p.pw_len:
 					raise ValueError(f'invalid password length {x}')
 		else:
-			ret = lines.pop(0).split(None, 2)
+			ret = line.split(None, 2)
 			return ret if len(ret) == 3 else ret + ['']
 
 	def make_label(self):
@@ -42,6 +42,10 @@ class addr_generator:
 			self.compressed = addr_type.compressed
 			self.desc = f'AddrGenerator {type(self).__name__!r}'
 
+		def to_addr_batch(self, data):
+			"return addresses for a sequence of public key data"
+			return [self.to_addr(d) for d in data]
+
 	class keccak(base):
 
 		def __init__(self, cfg, proto, addr_type):
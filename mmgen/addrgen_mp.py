@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+addrgen_mp: Multi-process address generation for the MMGen suite
+"""
+
+from collections import namedtuple, deque
+
+addrgen_params = namedtuple('addrgen_params', [
+	'coin',
+	'network',
+	'mmtype',
+	'keygen_backend',
+	'use_internal_keccak_module',
+	'test_suite',
+	'data_dir_root',
+	'add_p2pkh',
+	'gen_viewkey',
+	'gen_wallet_passwd',
+	'viewkey_passwd'])
+
+class AddrGenWorker:
+	"""
+	Public key and address generation from raw secret bytes.  One instance is
+	created in each worker process.  Results are returned as plain strings,
+	which are converted to MMGen data objects by the parent.
+	"""
+
+	def __init__(self, params):
+		from .cfg import Config
+		from .protocol import init_proto
+		from .keygen import KeyGenerator
+		from .addrgen import AddrGenerator
+		self.params = params
+		self.cfg = Config({
+				'keygen_backend': params.keygen_backend,
+				'use_internal_keccak_module': params.use_internal_keccak_module,
+				'test_suite': params.test_suite,
+				'data_dir': params.data_dir_root,
+				'quiet': True},
+			need_proto = False)
+		self.proto = init_proto(
+			self.cfg,
+			params.coin,
+			testnet = params.network == 'testnet',
+			regtest = params.network == 'regtest')
+		self.mmtype = self.proto.addr_type(params.mmtype)
+		self.kg = KeyGenerator(self.cfg, self.proto, self.mmtype.pubkey_type, silent=True)
+		self.ag = AddrGenerator(self.cfg, self.proto, self.mmtype)
+		if params.add_p2pkh:
+			self.ag2 = AddrGenerator(self.cfg, self.proto, 'compressed')
+
+	def gen_chunk(self, secrets):
+		from .key import PrivKey
+		from .proto.btc.common import hash256
+		p = self.params
+		privkeys = [PrivKey(
+				self.proto,
+				sec_bytes,
+				compressed  = self.mmtype.compressed,
+				pubkey_type = self.mmtype.pubkey_type)
+			for sec_bytes in secrets]
+
+		def gen():
+			pubdata = self.kg.gen_data_batch(privkeys)
+			addrs = self.ag.to_addr_batch(pubdata)
+			addrs_p2pkh = self.ag2.to_addr_batch(pubdata) if p.add_p2pkh else [None] * len(pubdata)
+			for privkey, data, addr, addr_p2pkh in zip(privkeys, pubdata, addrs, addrs_p2pkh, strict=True):
+				viewkey = self.ag.to_viewkey(data) if p.gen_viewkey else None
+				yield (
+					str(addr),
+					str(addr_p2pkh) if p.add_p2pkh else None,
+					str(viewkey) if p.gen_viewkey else None,
+					hash256(viewkey.encode() if p.viewkey_passwd else privkey)[:16].hex()
+						if p.gen_wallet_passwd else None)
+
+		return list(gen())
+
+_worker = None
+
+def _init_worker(params):
+	global _worker
+	_worker = AddrGenWorker(params)
+
+def _gen_chunk(secrets):
+	return _worker.gen_chunk(secrets)
+
+class AddrGenPool:
+	"""
+	Distribute public key and address generation for batches of address list
+	entries over a pool of worker processes.  Batches are submitted in index
+	order, and their results are applied to the entries in the same order,
+	after which the completed entries are passed to ‘on_done’.
+	"""
+
+	def __init__(self, addrlist, mmtype, *, jobs, gen_viewkey, gen_wallet_passwd, on_done):
+		from concurrent.futures import ProcessPoolExecutor
+		from .addrlist import ViewKeyAddrList
+		cfg = addrlist.cfg
+		self.max_pending = jobs * 2
+		self.on_done = on_done
+		self.pending = deque()
+		self.executor = ProcessPoolExecutor(
+			max_workers = jobs,
+			initializer = _init_worker,
+			initargs    = (addrgen_params(
+				coin                       = addrlist.proto.coin,
+				network                    = addrlist.proto.network,
+				mmtype                     = mmtype.name,
+				keygen_backend             = cfg.keygen_backend,
+				use_internal_keccak_module = cfg.use_internal_keccak_module,
+				test_suite                 = cfg.test_suite,
+				data_dir_root              = cfg.data_dir_root,
+				add_p2pkh                  = addrlist.add_p2pkh,
+				gen_viewkey                = gen_viewkey,
+				gen_wallet_passwd          = gen_wallet_passwd,
+				viewkey_passwd             = type(addrlist) is ViewKeyAddrList),))
+
+	def submit(self, entries):
+		self.pending.append((
+			entries,
+			self.executor.submit(_gen_chunk, [e.sec.orig_bytes for e in entries])))
+		if len(self.pending) > self.max_pending:
+			self.apply_results(*self.pending.popleft())
+
+	def apply_results(self, entries, future):
+		for e, (addr, addr_p2pkh, viewkey, wallet_passwd) in zip(entries, future.result(), strict=True):
+			e.addr = addr
+			if addr_p2pkh:
+				e.addr_p2pkh = addr_p2pkh
+			if viewkey:
+				e.viewkey = viewkey
+			if wallet_passwd:
+				e.wallet_passwd = wallet_passwd
+		self.on_done(entries)
+
+	def finish(self):
+		while self.pending:
+			self.apply_results(*self.pending.popleft())
+
+	def close(self):
+		"""
+		Shut down the pool, discarding the results of unfinished batches
+		"""
+		self.pending.clear()
+		self.executor.shutdown(cancel_futures=True)
@@ -20,11 +20,14 @@
 addrlist: Address list classes for the MMGen suite
 """
 
+from collections import deque
+
 from .util import suf, make_chksum_N, Msg, die
 from .objmethods import MMGenObject, HiliteStr, InitErrors
 from .obj import MMGenListItem, ListItemAttr, MMGenDict, TwComment, WalletPassword
 from .key import PrivKey
 from .addr import MMGenID, MMGenAddrType, CoinAddr, AddrIdx, AddrListID, ViewKey
+from .addrlistdata import CompactAddrListData
 
 class AddrIdxList(tuple, InitErrors, MMGenObject):
 
@@ -92,19 +95,45 @@ class AddrListChksum(HiliteStr):
 	trunc_ok = False
 
 	def __new__(cls, addrlist):
-		ea = addrlist.al_id.mmtype.extra_attrs or () # add viewkey and passwd to the mix, if present
-		lines = [' '.join(
-					addrlist.chksum_rec_f(e) +
-					tuple(getattr(e, a) for a in ea if getattr(e, a))
-				) for e in addrlist.data]
-		return str.__new__(cls, make_chksum_N(' '.join(lines), nchars=16, sep=True))
+		hasher = AddrListChksumHasher(addrlist)
+		for e in addrlist.data:
+			hasher.update(e)
+		return hasher.chksum()
+
+class AddrListChksumHasher:
+	"""
+	Incremental address list checksum computation.  Entries are fed to the
+	hasher one at a time as they are generated or parsed, so the checksum is
+	available without a second pass over the data or joining the records of
+	all entries into a single string.
+	"""
+
+	def __init__(self, addrlist):
+		from hashlib import sha256
+		self.rec_f = addrlist.chksum_rec_f
+		self.extra_attrs = addrlist.al_id.mmtype.extra_attrs or () # add viewkey and passwd to the mix, if present
+		self.hash = sha256()
+		self.sep = b''
+
+	def update(self, e):
+		ea = self.extra_attrs
+		self.hash.update(self.sep + ' '.join(
+			self.rec_f(e) +
+			tuple(getattr(e, a) for a in ea if getattr(e, a))).encode())
+		self.sep = b' '
+
+	def chksum(self):
+		# equivalent to make_chksum_N() applied to the space-joined records:
+		return str.__new__(
+			AddrListChksum,
+			make_chksum_N(self.hash.digest(), nchars=16, sep=True, rounds=1))
 
 class AddrListIDStr(HiliteStr):
 	color = 'green'
 	trunc_ok = False
 
-	def __new__(cls, addrlist, *, fmt_str=None):
-		idxs = [e.idx for e in addrlist.data]
+	def __new__(cls, addrlist, *, fmt_str=None, idxs=None):
+		idxs = idxs or [e.idx for e in addrlist.data]
 		prev = idxs[0]
 		ret = [prev]
 		for i in idxs[1:]:
@@ -135,7 +164,9 @@ class AddrListIDStr(HiliteStr):
 		return str.__new__(cls, ret)
 
 class AddrListData(list, MMGenObject):
-	pass
+
+	def values(self, name):
+		return (getattr(e, name) for e in self)
 
 class AddrList(MMGenObject): # Address info for a single seed ID
 	entry_type   = AddrListEntry
@@ -147,6 +178,8 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 	gen_passwds  = False
 	gen_keys     = False
 	has_keys     = False
+	has_chksum   = True
+	gen_batch_size = 256 # number of keys passed to the keygen backend per call
 	chksum_rec_f = lambda foo, e: (str(e.idx), e.addr.views[e.addr.view_pref])
 
 	def dmsg_sc(self, desc, data): # pylint: disable=method-hidden
@@ -172,12 +205,14 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			key_address_validity_check = None, # None=prompt user, True=check without prompt, False=skip check
 			skip_chksum = False,
 			skip_chksum_msg = False,
-			add_p2pkh = False):
+			add_p2pkh = False,
+			stream    = False): # defer generation or parsing to AddrFile.write_stream() or iter_file()
 
 		self.cfg = cfg
 		self.ka_validity_chk = key_address_validity_check
 		self.add_p2pkh = add_p2pkh
 		self.proto = proto
+		self.chksum = None # computed incrementally by generate() or self.file.parse_file()
 		do_chksum = False
 
 		if not cfg.debug_addrlist:
@@ -186,14 +221,22 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		if seed and addr_idxs:   # data from seed + idxs
 			self.al_id = AddrListID(sid=seed.sid, mmtype=MMGenAddrType(proto, mmtype or proto.dfl_mmtype))
 			src = 'gen'
-			adata = self.generate(
-				seed,
-				addr_idxs if isinstance(addr_idxs, AddrIdxList) else AddrIdxList(fmt_str=addr_idxs))
-			do_chksum = True
+			if not isinstance(addr_idxs, AddrIdxList):
+				addr_idxs = AddrIdxList(fmt_str=addr_idxs)
+			if stream:
+				self.stream_src = (seed, addr_idxs)
+				adata = CompactAddrListData(proto, self.entry_type)
+			else:
+				adata = self.generate(seed, addr_idxs)
+				do_chksum = True
 		elif infile:             # data from MMGen address file
 			self.infile = infile
-			adata = self.file.parse_file(infile) # sets self.al_id
-			do_chksum = True
+			if stream:
+				self.al_id = None # set by self.file.iter_file()
+				adata = CompactAddrListData(proto, self.entry_type)
+			else:
+				adata = self.file.parse_file(infile) # sets self.al_id
+				do_chksum = True
 		elif al_id and adata:    # data from tracking wallet
 			self.al_id = al_id
 		elif addrlist:           # data from flat address list
@@ -215,9 +258,8 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 
 		# al_id, adata now set
 		self.data = adata
-		self.num_addrs = len(adata)
+		self.num_addrs = len(addr_idxs) if stream and seed else len(adata)
 		self.fmt_data = ''
-		self.chksum = None
 
 		if self.al_id is None:
 			return
@@ -225,15 +267,15 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		if type(self) is ViewKeyAddrList and not 'viewkey' in self.al_id.mmtype.extra_attrs:
 			die(1, f'viewkeys not supported for address type {self.al_id.mmtype.desc!r}')
 
-		self.id_str = AddrListIDStr(self)
+		self.id_str = AddrListIDStr(self, idxs=addr_idxs if stream else None)
 
 		if type(self) is KeyList:
 			return
 
-		if do_chksum and not skip_chksum:
-			self.chksum = AddrListChksum(self)
-			if not skip_chksum_msg:
-				self.do_chksum_msg(record=src=='gen')
+		if skip_chksum:
+			self.chksum = None
+		elif do_chksum and not skip_chksum_msg:
+			self.do_chksum_msg(record=src=='gen')
 
 	def do_chksum_msg(self, record):
 		chk = 'Check this value against your records'
@@ -242,8 +284,30 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			f'Checksum for {self.desc} data {self.id_str.hl()}: {self.chksum.hl()}\n' +
 			(chk, rec)[record])
 
+	def chksum_hasher(self):
+		return AddrListChksumHasher(self) if self.has_chksum else None
+
 	def generate(self, seed, addr_idxs):
 
+		out = CompactAddrListData(self.proto, self.entry_type)
+		hasher = self.chksum_hasher()
+
+		for chunk in self.gen_entries(seed, addr_idxs):
+			if hasher:
+				for e in chunk:
+					hasher.update(e)
+			out.extend(chunk)
+
+		if hasher:
+			self.chksum = hasher.chksum()
+
+		return out
+
+	def gen_entries(self, seed, addr_idxs):
+		"""
+		Generate list entries for the indexes in ‘addr_idxs’, yielding them in
+		index order as lists of completed entries
+		"""
 		seed = self.scramble_seed(seed.data)
 		self.dmsg_sc('seed', seed[:8].hex())
 
@@ -260,41 +324,88 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			if self.add_p2pkh:
 				ag2 = AddrGenerator(self.cfg, self.proto, 'compressed')
 
-		from .derive import derive_coin_privkey_bytes
+		from .derive import derive_coin_privkey_bytes, ChainCheckpoints
+		# checkpoints hold secret chain states, so use them only when requested:
+		checkpoints = ChainCheckpoints(self.cfg, seed) if self.cfg.chain_checkpoint_dir else None
 
 		t_addrs = len(addr_idxs)
 		le = self.entry_type
-		out = AddrListData()
+		done = deque()
+		batch = []
 		CR = '\n' if self.cfg.debug_addrlist else '\r'
 
-		for pk_bytes in derive_coin_privkey_bytes(seed, addr_idxs):
+		if self.gen_addrs and self.cfg.jobs > 1 and t_addrs > self.gen_batch_size:
+			from .addrgen_mp import AddrGenPool
+			pool = AddrGenPool(
+				self,
+				mmtype,
+				jobs              = self.cfg.jobs,
+				gen_viewkey       = gen_viewkey,
+				gen_wallet_passwd = gen_wallet_passwd,
+				on_done           = done.append)
+		else:
+			pool = None
 
-			if not self.cfg.debug:
-				self.cfg._util.qmsg_r(
-					f'{CR}Generating {self.gen_desc} #{pk_bytes.idx} ({pk_bytes.pos} of {t_addrs})')
+		def process_batch(entries):
+			if self.gen_addrs:
+				if pool:
+					pool.submit(entries) # completed entries are passed to done.append()
+					return
+				pubdata = kg.gen_data_batch([e.sec for e in entries])
+				addrs = ag.to_addr_batch(pubdata)
+				addrs_p2pkh = ag2.to_addr_batch(pubdata) if self.add_p2pkh else [None] * len(pubdata)
+				for e, data, addr, addr_p2pkh in zip(entries, pubdata, addrs, addrs_p2pkh, strict=True):
+					e.addr = addr
+					if self.add_p2pkh:
+						e.addr_p2pkh = addr_p2pkh
+					if gen_viewkey:
+						e.viewkey = ag.to_viewkey(data)
+					if gen_wallet_passwd:
+						e.wallet_passwd = self.gen_wallet_passwd(
+							e.viewkey.encode() if type(self) is ViewKeyAddrList else e.sec)
+			done.append(entries)
+
+		# worker processes hold key material, so shut them down on interruption and early exit:
+		try:
+			for pk_bytes in derive_coin_privkey_bytes(seed, addr_idxs, checkpoints=checkpoints):
 
-			e = le(proto=self.proto, idx=pk_bytes.idx)
+				if not self.cfg.debug:
+					self.cfg._util.qmsg_r(
+						f'{CR}Generating {self.gen_desc} #{pk_bytes.idx} ({pk_bytes.pos} of {t_addrs})')
 
-			e.sec = PrivKey(
-				self.proto,
-				pk_bytes.data,
-				compressed  = mmtype.compressed,
-				pubkey_type = mmtype.pubkey_type)
+				e = le(proto=self.proto, idx=pk_bytes.idx)
 
-			if self.gen_addrs:
-				data = kg.gen_data(e.sec)
-				e.addr = ag.to_addr(data)
-				if self.add_p2pkh:
-					e.addr_p2pkh = ag2.to_addr(data)
-				if gen_viewkey:
-					e.viewkey = ag.to_viewkey(data)
-				if gen_wallet_passwd:
-					e.wallet_passwd = self.gen_wallet_passwd(
-						e.viewkey.encode() if type(self) is ViewKeyAddrList else e.sec)
-			elif self.gen_passwds:
-				e.passwd = self.gen_passwd(e.sec) # TODO - own type
-
-			out.append(e)
+				e.sec = PrivKey(
+					self.proto,
+					pk_bytes.data,
+					compressed  = mmtype.compressed,
+					pubkey_type = mmtype.pubkey_type)
+
+				if self.gen_passwds:
+					e.passwd = self.gen_passwd(e.sec) # TODO - own type
+
+				batch.append(e)
+				if len(batch) == self.gen_batch_size:
+					process_batch(batch)
+					batch = []
+
+				while done:
+					yield done.popleft()
+
+			if batch:
+				process_batch(batch)
+
+			if pool:
+				pool.finish()
+
+			while done:
+				yield done.popleft()
+		finally:
+			if pool:
+				pool.close()
+
+		if checkpoints:
+			checkpoints.save()
 
 		self.cfg._util.qmsg('{}{}: {} {}{} generated{}'.format(
 			CR,
@@ -304,9 +415,8 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			suf(t_addrs, self.gen_desc_pl),
 			' ' * 15))
 
-		return out
-
-	def gen_wallet_passwd(self, privbytes):
+	@staticmethod
+	def gen_wallet_passwd(privbytes):
 		from .proto.btc.common import hash256
 		return WalletPassword(hash256(privbytes)[:16].hex())
 
@@ -328,6 +438,37 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		self.dmsg_sc('str', scramble_key)
 		return Crypto(self.cfg).scramble_seed(seed, scramble_key.encode())
 
+	@property
+	def data(self):
+		return self._data
+
+	@data.setter
+	def data(self, data):
+		self._data = data
+		self._index_key = None
+
+	def get_index(self, attr):
+		"""
+		Return a dict mapping values of ‘idx’ or ‘addr’ to data positions.  The
+		indexes are built on first use and rebuilt after the data is replaced
+		or changes in length or generation.
+		"""
+		key = (id(self._data), len(self._data), getattr(self._data, 'generation', None))
+		if key != self._index_key:
+			self._indexes = {}
+			self._index_key = key
+		if attr not in self._indexes:
+			d = {}
+			for pos, val in enumerate(self._data.values(attr)):
+				if val is not None:
+					d.setdefault(val, pos)
+			self._indexes[attr] = d
+		return self._indexes[attr]
+
+	def entry_by_addr(self, addr):
+		pos = self.get_index('addr').get(addr)
+		return None if pos is None else self.data[pos]
+
 	def idxs(self):
 		return [e.idx for e in self.data]
 
@@ -344,33 +485,26 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		return [e.comment for e in self.data]
 
 	def entry(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e
+		pos = self.get_index('idx').get(idx)
+		return None if pos is None else self.data[pos]
 
 	def coinaddr(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e.addr
+		if e := self.entry(idx):
+			return e.addr
 
 	def comment(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e.comment
+		if e := self.entry(idx):
+			return e.comment
 
 	def set_comment(self, idx, comment):
-		for e in self.data:
-			if idx == e.idx:
-				e.comment = comment
+		if e := self.entry(idx):
+			e.comment = comment
 
 	def make_reverse_dict_addrlist(self, coinaddrs):
 		d = MMGenDict()
-		b = coinaddrs
-		for e in self.data:
-			try:
-				d[b[b.index(e.addr)]] = (MMGenID(self.proto, f'{self.al_id}:{e.idx}'), e.comment)
-			except ValueError:
-				pass
+		for addr in coinaddrs:
+			if addr not in d and (e := self.entry_by_addr(addr)):
+				d[addr] = (MMGenID(self.proto, f'{self.al_id}:{e.idx}'), e.comment)
 		return d
 
 	def add_wifs(self, key_list):
@@ -397,9 +531,9 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 
 		addrs4keys = dict(gen())
 
-		for d in self.data:
-			if d.addr in addrs4keys:
-				d.sec = addrs4keys[d.addr]
+		for addr, pk in addrs4keys.items():
+			if e := self.entry_by_addr(addr):
+				e.sec = pk
 
 	def list_missing(self, attr):
 		return [d.addr for d in self.data if not getattr(d, attr)]
@@ -428,3 +562,4 @@ class KeyList(KeyAddrList):
 	desc         = 'key'
 	gen_desc     = 'key'
 	gen_addrs    = False
+	has_chksum   = False
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+addrlistdata: Compact columnar storage for large address lists
+"""
+
+from array import array
+
+from .objmethods import MMGenObject
+from .obj import MMGenListItem
+from .key import WifKey
+from .addr import AddrIdx
+
+class PackedColumn:
+	"""
+	Variable-length byte strings packed into a single buffer.  An empty value
+	represents a missing one.  Values updated after initial storage are kept
+	in a sparse dict.
+	"""
+
+	def __init__(self):
+		self.buf = bytearray()
+		self.ends = array('I')
+		self.updated = {}
+
+	def __len__(self):
+		return len(self.ends)
+
+	def set(self, pos, data):
+		if pos == len(self.ends):
+			self.buf += data
+			self.ends.append(len(self.buf))
+		else:
+			self.updated[pos] = data
+
+	def get(self, pos):
+		if pos in self.updated:
+			return self.updated[pos]
+		return bytes(self.buf[self.ends[pos-1] if pos else 0:self.ends[pos]])
+
+class ObjColumn:
+	"""
+	Column of str or bytes subclass instances.  The base value and the
+	attributes listed in ‘packed_attrs’ are stored packed, while the remaining
+	public instance attributes (type, address format, key compression, proto,
+	etc.), which are shared by most or all entries, are stored in a table of
+	shapes.
+	Objects are reconstructed without re-validation, as their data was
+	validated when the original objects were created.
+	"""
+	packed_attrs = ()
+
+	def __init__(self):
+		self.base = PackedColumn()
+		self.packed = {k: PackedColumn() for k in self.packed_attrs}
+		self.shape_idx = array('I')
+		self.shapes = [None] # shape 0 represents a missing value
+		self.shape_ids = {None: 0}
+		self.fallback = {} # objects with unhashable shapes
+
+	def encode(self, name, obj, value):
+		return b'' if value is None else value.encode() if isinstance(value, str) else value
+
+	def decode(self, name, obj, data):
+		return data or None
+
+	def set(self, pos, obj):
+		if obj is None:
+			shape = None
+		else:
+			d = getattr(obj, '__dict__', {})
+			shape = (
+				type(obj),
+				tuple(k for k in self.packed_attrs if k in d),
+				tuple((k, v) for k, v in d.items() if k not in self.packed and k[0] != '_'))
+			try:
+				hash(shape)
+			except TypeError:
+				self.fallback[pos] = obj
+				shape = None
+			else:
+				self.fallback.pop(pos, None)
+		if shape not in self.shape_ids:
+			self.shape_ids[shape] = len(self.shapes)
+			self.shapes.append(shape)
+		if pos == len(self.shape_idx):
+			self.shape_idx.append(self.shape_ids[shape])
+		else:
+			self.shape_idx[pos] = self.shape_ids[shape]
+		if shape is None:
+			self.base.set(pos, b'')
+			for col in self.packed.values():
+				col.set(pos, b'')
+		else:
+			self.base.set(pos, obj.encode() if isinstance(obj, str) else bytes(obj))
+			for k, col in self.packed.items():
+				col.set(pos, self.encode(k, obj, d.get(k)))
+
+	def get(self, pos):
+		if not (shape_id := self.shape_idx[pos]):
+			return self.fallback.get(pos) if self.fallback else None
+		cls, packed_attrs, attrs = self.shapes[shape_id]
+		if issubclass(cls, str):
+			obj = str.__new__(cls, self.base.get(pos).decode())
+		else:
+			obj = bytes.__new__(cls, self.base.get(pos))
+		if attrs or packed_attrs:
+			d = obj.__dict__
+			d.update(attrs)
+			for k in packed_attrs:
+				d[k] = self.decode(k, obj, self.packed[k].get(pos))
+		return obj
+
+class AddrColumn(ObjColumn):
+	packed_attrs = ('views', 'bytes')
+
+	def encode(self, name, obj, value):
+		if value is None:
+			return b''
+		if name == 'views':
+			return b'' if value == [obj] else '\n'.join(value).encode()
+		return value
+
+	def decode(self, name, obj, data):
+		if name == 'views':
+			return data.decode().split('\n') if data else [str(obj)]
+		return data
+
+class PrivKeyColumn(ObjColumn):
+	packed_attrs = ('wif', 'orig_bytes')
+
+	def decode(self, name, obj, data):
+		if name == 'wif':
+			return str.__new__(WifKey, data.decode())
+		return data or None
+
+class CompactAddrListData(MMGenObject):
+	"""
+	Columnar address list data.  Indexes are stored in an array, addresses,
+	keys and other string data in packed buffers, and comments sparsely.
+	AddrListEntry objects are materialized on access as views, with
+	attribute assignments written back to the columns.
+	"""
+	column_types = {
+		'addr':       AddrColumn,
+		'addr_p2pkh': AddrColumn,
+		'viewkey':    AddrColumn,
+		'sec':        PrivKeyColumn}
+	view_types = {}
+
+	def __init__(self, proto, entry_type, data=()):
+		self.proto = proto
+		self.entry_type = entry_type
+		self.view_type = self.get_view_type(entry_type)
+		self.valid_attrs = (
+			{e for e in dir(entry_type) if e[0] != '_'}
+			- MMGenListItem.invalid_attrs
+			- entry_type.invalid_attrs)
+		self.idxs = array('I')
+		self.columns = {
+			k: self.column_types.get(k, ObjColumn)()
+				for k in sorted(self.valid_attrs - {'idx', 'comment'})}
+		self.comments = {}
+		self.generation = 0 # incremented when indexed attributes change
+		self.extend(data)
+
+	@classmethod
+	def get_view_type(cls, entry_type):
+		if entry_type not in cls.view_types:
+			cls.view_types[entry_type] = type(entry_type.__name__, (AddrListEntryView, entry_type), {})
+		return cls.view_types[entry_type]
+
+	def __len__(self):
+		return len(self.idxs)
+
+	def __iter__(self):
+		for pos in range(len(self.idxs)):
+			yield self.get(pos)
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			return [self.get(pos) for pos in range(*key.indices(len(self.idxs)))]
+		pos = key + len(self.idxs) if key < 0 else key
+		if not 0 <= pos < len(self.idxs):
+			raise IndexError(f'{type(self).__name__} index out of range')
+		return self.get(pos)
+
+	def get(self, pos):
+		e = self.view_type.__new__(self.view_type)
+		d = e.__dict__
+		d['proto'] = self.proto
+		d['valid_attrs'] = self.valid_attrs
+		d['_data'] = self
+		d['_pos'] = pos
+		if idx := self.idxs[pos]:
+			d['idx'] = int.__new__(AddrIdx, idx)
+		for k, col in self.columns.items():
+			if (v := col.get(pos)) is not None:
+				d[k] = v
+		if pos in self.comments:
+			d['comment'] = self.comments[pos]
+		return e
+
+	def append(self, e):
+		pos = len(self.idxs)
+		self.idxs.append(e.idx or 0)
+		for k, col in self.columns.items():
+			col.set(pos, getattr(e, k))
+		if e.comment:
+			self.comments[pos] = e.comment
+		self.generation += 1
+
+	def extend(self, entries):
+		for e in entries:
+			self.append(e)
+
+	def values(self, name):
+		"""
+		Iterate over the values of attribute ‘name’ without materializing entries
+		"""
+		if name == 'idx':
+			return (int.__new__(AddrIdx, idx) if idx else None for idx in self.idxs)
+		elif name == 'comment':
+			return (self.comments.get(pos) for pos in range(len(self.idxs)))
+		else:
+			col = self.columns[name]
+			return (col.get(pos) for pos in range(len(self.idxs)))
+
+	def update(self, pos, name, value):
+		if name in ('idx', 'addr'):
+			self.generation += 1
+		if name == 'idx':
+			self.idxs[pos] = value or 0
+		elif name == 'comment':
+			if value:
+				self.comments[pos] = value
+			else:
+				self.comments.pop(pos, None)
+		else:
+			self.columns[name].set(pos, value)
+
+class AddrListEntryView:
+	"""
+	Mixin for address list entries materialized from CompactAddrListData
+	"""
+	def __setattr__(self, name, value):
+		super().__setattr__(name, value)
+		self._data.update(self._pos, name, self.__dict__[name])
+
+	def __delattr__(self, name):
+		super().__delattr__(name)
+		self._data.update(self._pos, name, self.__dict__.get(name))
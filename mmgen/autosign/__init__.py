@@ -240,6 +240,10 @@ class Autosign:
 				msg(gray(f'Unmounting ‘{self.mountpoint}’'))
 			redir = None if verbose else DEVNULL
 			run(self.umount_cmd.split(), stdout=redir, check=True)
+		from ..keycache import KeyAddrCache
+		from ..derive import ChainCheckpoints
+		KeyAddrCache.wipe()
+		ChainCheckpoints.wipe_cache()
 		if not silent:
 			bmsg('It is now safe to extract the removable device')
 
@@ -160,10 +160,12 @@ class Config(Lockable):
 	coin        = 'BTC'
 	token       = '' # nosec B105
 	outdir      = ''
+	chain_checkpoint_dir = ''
 	passwd_file = '' # nosec B105
 	network     = 'mainnet'
 	testnet     = False
 	regtest     = False
+	jobs        = 1
 
 	# verbosity / prompting behavior
 	quiet           = False
@@ -203,6 +205,9 @@ class Config(Lockable):
 	rpc_user              = ''
 	rpc_password          = '' # nosec B105 # empty pw rejected, user must set, see BitcoinRPCClient
 	aiohttp_rpc_queue_len = 16
+	rpc_pool_size         = 8
+	rpc_batch_size        = 100
+	txhist_cache_size     = 50000
 	aiohttp_session       = None
 	cached_balances       = False
 
@@ -295,10 +300,12 @@ class Config(Lockable):
 		('autosign', 'outdir'))
 
 	# proto-specific only: eth_mainnet_chain_names eth_testnet_chain_names
+	#                      eth_mainnet_multicall_addr eth_testnet_multicall_addr eth_devnet_multicall_addr
 	# coin-specific only:  bch_cashaddr (alias of cashaddr)
 	_cfg_file_opts = (
 		'autochg_ignore_labels',
 		'autosign',
+		'chain_checkpoint_dir',
 		'color',
 		'daemon_data_dir',
 		'daemon_id', # also coin-specific
@@ -318,14 +325,17 @@ class Config(Lockable):
 		'no_license',
 		'quiet',
 		'regtest',
+		'rpc_batch_size',
 		'rpc_host',     # also coin-specific
 		'rpc_password', # also coin-specific
+		'rpc_pool_size',
 		'rpc_port',     # also coin-specific
 		'rpc_user',     # also coin-specific
 		'scroll',
 		'subseeds',
 		'testnet',
 		'tw_name',      # also coin-specific
+		'txhist_cache_size',
 		'usr_randchars')
 
 	# Supported environmental vars
@@ -393,9 +403,10 @@ class Config(Lockable):
 	_ov = namedtuple('autoset_opt_info', ['type', 'choices'])
 	_autoset_opts = {
 		'fee_estimate_mode': _ov('nocase_pfx', ['conservative', 'economical']),
-		'rpc_backend':       _ov('nocase_pfx', ['auto', 'httplib', 'curl', 'aiohttp', 'requests']),
+		'rpc_backend':       _ov('nocase_pfx', ['auto', 'httplib', 'curl', 'aiohttp', 'requests', 'pool']),
 		'swap_proto':        _ov('nocase_pfx', ['thorchain']),
-		'tx_proxy':          _ov('nocase_pfx', ['etherscan'])} # , 'blockchair'
+		'tx_proxy':          _ov('nocase_pfx', ['etherscan']), # , 'blockchair'
+		'tw_store':          _ov('nocase_str', ['json', 'journal', 'sqlite'])}
 
 	_dfl_none_autoset_opts = ('tx_proxy',)
 
@@ -560,7 +571,8 @@ class Config(Lockable):
 		check_or_create_dir(self.data_dir_root)
 
 		from .util import wrap_ripemd160
-		wrap_ripemd160() # ripemd160 required by mmgen_cfg_file() in _set_cfg_from_cfg_file()
+		# ripemd160 required by mmgen_cfg_file() in _set_cfg_from_cfg_file():
+		ripemd160_impl = wrap_ripemd160() # set only on first call, when wrapper is installed
 
 		# Step 5: set cfg from cfgfile, skipping already-set opts and auto opts; save set opts and auto
 		#         opts to be set:
@@ -600,6 +612,9 @@ class Config(Lockable):
 		from .util import Util
 		self._util = Util(self)
 
+		if ripemd160_impl:
+			self._util.vmsg(f'hashlib lacks ripemd160, using {ripemd160_impl} implementation')
+
 		del self._cloned
 
 		if hasattr(self, 'bch_cashaddr') and not hasattr(self, 'cashaddr'):
@@ -950,6 +965,9 @@ def check_opts(cfg): # Raises exception if any check fails
 		def columns():
 			opt_compares(val, '>', 10)
 
+		def jobs():
+			opt_compares(val, '>=', 1)
+
 	# TODO: add checks for token, rbf, tx_fee
 	check_funcs_names = tuple(check_funcs.__dict__)
 	for name in tuple(cfg._uopts) + cfg._envopts + cfg._cfgfile_opts.non_auto:
@@ -957,7 +975,7 @@ def check_opts(cfg): # Raises exception if any check fails
 		if name in cfg._infile_opts:
 			from .fileutil import check_infile
 			check_infile(val) # file exists and is readable - dies on error
-		elif name == 'outdir':
+		elif name in ('outdir', 'chain_checkpoint_dir'):
 			from .fileutil import check_outdir
 			check_outdir(val) # dies on error
 		elif name in check_funcs_names:
@@ -111,7 +111,10 @@ def compress(h0, h1, h2, h3, h4, block):
 
 class ripemd160:
 
-	def __init__(self,data=b''):
+	name = 'ripemd160'
+	digest_size = 20
+
+	def __init__(self,data=b'',**kwargs):
 		"""Compute the RIPEMD-160 hash of data."""
 		# Initialize state.
 		state = (0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476, 0xc3d2e1f0)
@@ -20,29 +20,124 @@
 derive: coin private key secret derivation for the MMGen suite
 """
 
+import os
 from collections import namedtuple
 from hashlib import sha512, sha256
 from .addrlist import AddrIdxList
 
 pk_bytes = namedtuple('coin_privkey_bytes', ['idx', 'pos', 'data'])
 
-def derive_coin_privkey_bytes(seed, idxs):
+class ChainCheckpoints:
+	"""
+	Saved sha512 chain states for a single scrambled seed, recorded every
+	‘interval’ indexes.  Address lists use checkpoints only when
+	‘chain_checkpoint_dir’ is configured, in which case they’re saved to disk
+	encrypted and authenticated with keys derived from the scrambled seed, and
+	cached in memory until wipe_cache() is called (on exit or unmount of the
+	autosign device).
+	"""
+	interval = 1000
+	file_ext = 'mmckpt'
+	rec_len = 4 + 64
+	mac_len = 32
+	cache = {} # in-process cache, keyed by checkpoint ID
+	wipe_registered = False
+
+	def __init__(self, cfg, seed):
+		self.cfg = cfg
+		self.id = sha256(b'chain checkpoint ID:' + seed).hexdigest()[:16]
+		self.enc_key = sha256(b'chain checkpoint encryption key:' + seed).digest()
+		self.mac_key = sha256(b'chain checkpoint MAC key:' + seed).digest()
+		if not ChainCheckpoints.wipe_registered:
+			import atexit
+			atexit.register(self.wipe_cache)
+			ChainCheckpoints.wipe_registered = True
+		self.data = self.cache.setdefault(self.id, {})
+		self.modified = False
+		if cfg.chain_checkpoint_dir:
+			self.fn = os.path.join(cfg.chain_checkpoint_dir, f'{self.id}.{self.file_ext}')
+			self.load()
+
+	def load(self):
+		import hmac
+		from .crypto import Crypto
+		from .util import ymsg
+		try:
+			with open(self.fn, 'rb') as fh:
+				data = fh.read()
+		except FileNotFoundError:
+			return
+		iv, enc_data, mac = (
+			data[:Crypto.aesctr_iv_len],
+			data[Crypto.aesctr_iv_len:-self.mac_len],
+			data[-self.mac_len:])
+		if not hmac.compare_digest(mac, hmac.digest(self.mac_key, iv + enc_data, 'sha256')):
+			ymsg(f'Warning: chain checkpoint file ‘{self.fn}’ failed authentication, ignoring')
+			return
+		dec_data = Crypto(self.cfg).encrypt_aes_ctr(self.enc_key, iv, enc_data)
+		for i in range(0, len(dec_data), self.rec_len):
+			self.data[int.from_bytes(dec_data[i:i+4], 'big')] = dec_data[i+4:i+self.rec_len]
+		self.cfg._util.dmsg(f'Loaded {len(dec_data)//self.rec_len} chain checkpoints from ‘{self.fn}’')
+
+	def save(self):
+		if not (self.modified and self.cfg.chain_checkpoint_dir):
+			return
+		import hmac
+		from .crypto import Crypto
+		iv = os.urandom(Crypto.aesctr_iv_len)
+		enc_data = Crypto(self.cfg).encrypt_aes_ctr(
+			self.enc_key,
+			iv,
+			b''.join(idx.to_bytes(4, 'big') + state for idx, state in sorted(self.data.items())))
+		tmp_fn = self.fn + '.tmp'
+		fd = os.open(tmp_fn, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with os.fdopen(fd, 'wb') as fh:
+			fh.write(iv + enc_data + hmac.digest(self.mac_key, iv + enc_data, 'sha256'))
+		os.replace(tmp_fn, self.fn)
+		self.modified = False
+
+	def add(self, idx, state):
+		if idx not in self.data:
+			self.data[idx] = state
+			self.modified = True
+
+	def get(self, start, end):
+		"""
+		return the highest checkpoint in the range start < idx <= end, or None
+		"""
+		for idx in range(end - end % self.interval, start, -self.interval):
+			if idx in self.data:
+				return (idx, self.data[idx])
+
+	@classmethod
+	def wipe_cache(cls):
+		cls.cache.clear()
+
+def derive_coin_privkey_bytes(seed, idxs, *, checkpoints=None):
 
 	assert isinstance(idxs, AddrIdxList), f'{type(idxs)}: idx list not of type AddrIdxList'
 
 	t_keys = len(idxs)
 	pos = 0
+	chain_idx = 0 # number of hash rounds performed on seed
+
+	while pos < t_keys:
 
-	for idx in range(1, AddrIdxList.max_len + 1): # key/addr indexes begin from one
+		idx = idxs[pos] # key/addr indexes begin from one
 
-		seed = sha512(seed).digest()
+		if idx > AddrIdxList.max_len:
+			break
 
-		if idx == idxs[pos]:
+		if checkpoints and (cp := checkpoints.get(chain_idx, idx)):
+			chain_idx, seed = cp
 
-			pos += 1
+		while chain_idx < idx:
+			seed = sha512(seed).digest()
+			chain_idx += 1
+			if checkpoints and not chain_idx % checkpoints.interval:
+				checkpoints.add(chain_idx, seed)
 
-			# secret is double sha256 of seed hash round /idx/
-			yield pk_bytes(idx, pos, sha256(sha256(seed).digest()).digest())
+		pos += 1
 
-			if pos == t_keys:
-				break
+		# secret is double sha256 of seed hash round /idx/
+		yield pk_bytes(idx, pos, sha256(sha256(seed).digest()).digest())
@@ -24,6 +24,10 @@ minutes total, independent of the number of addresses imported.
 
 It’s recommended to use ‘--rpc-backend=aio’ with ‘--rescan’.
 
+Blocks near each other are rescanned together, in a single RPC call.  Use
+‘--rescan-plan’ to display the planned block ranges and the estimated rescan
+time without importing.
+
 Bear in mind that the UTXO scan will not find historical transactions: to add
 them to the tracking wallet, you must perform a full or partial rescan of the
 blockchain with the ‘mmgen-tool rescan_blockchain’ utility.  A full rescan of
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+incogscan: Multi-process search for hidden incognito wallet data
+"""
+
+import os, time
+from collections import deque
+from hashlib import sha256
+
+from .cfg import gc
+from .crypto import Crypto
+
+def get_prefix_scan_func():
+	try:
+		from .proto.secp256k1.secp256k1 import sha256_prefix_scan
+	except ImportError:
+		return None
+	else:
+		return sha256_prefix_scan
+
+def prefix_scan_python(data, msg_len, prefix):
+	plen = len(prefix)
+	return [i for i in range(len(data) - msg_len + 1)
+		if sha256(data[i:i+msg_len]).digest()[:plen] == prefix]
+
+class IncogScanWorker:
+	"""
+	Search ranges of a file for IVs whose SHA-256 digest begins with the
+	Incog ID.  The file is read into a reusable buffer, and windows are hashed
+	in place, with the C sliding-window scanner if available.
+	"""
+	win_size = 1 << 22
+
+	def __init__(self, filename, prefix):
+		flgs = os.O_RDONLY|os.O_BINARY if gc.platform == 'win32' else os.O_RDONLY
+		self.fh = open(os.open(filename, flgs), 'rb', buffering=0)
+		self.prefix = prefix
+		self.ivsize = Crypto.aesctr_iv_len
+		self.buf = bytearray(self.win_size + self.ivsize - 1)
+		self.scan = get_prefix_scan_func() or prefix_scan_python
+
+	def scan_range(self, start, end):
+		"return the offsets in range [start, end) of all IVs matching the Incog ID"
+		ret = []
+		mv = memoryview(self.buf)
+		for pos in range(start, end, self.win_size):
+			nbytes = min(self.win_size, end - pos) + self.ivsize - 1
+			self.fh.seek(pos)
+			if (got := self.fh.readinto(mv[:nbytes])) != nbytes:
+				raise OSError(f'short read at offset {pos} ({got} of {nbytes} bytes)')
+			ret.extend(pos + i for i in self.scan(mv[:nbytes], self.ivsize, self.prefix))
+		return ret
+
+_worker = None
+
+def _init_worker(filename, prefix):
+	global _worker
+	_worker = IncogScanWorker(filename, prefix)
+
+def _scan_range(start, end):
+	return _worker.scan_range(start, end)
+
+class IncogScanner:
+	"""
+	Find hidden incognito wallet data in a file or block device.
+
+	The search range is divided into tasks, which are distributed over a pool of
+	worker processes.  Results are returned in offset order.
+
+	For compatibility with earlier versions, which read the input in 4096-byte
+	blocks, the IVs searched are those at the offsets covered by those blocks.
+	Near the end of the input, IVs are truncated by the end of the data.
+	"""
+	legacy_bsize = 4096
+	task_size = 1 << 25
+
+	def __init__(self, filename, incog_id, *, jobs=0, silent=False):
+		self.filename = filename
+		self.silent = silent
+		self.prefix = bytes.fromhex(incog_id)
+		self.jobs = jobs or os.cpu_count() or 1
+		self.ivsize = Crypto.aesctr_iv_len
+		flgs = os.O_RDONLY|os.O_BINARY if gc.platform == 'win32' else os.O_RDONLY
+		fd = os.open(filename, flgs)
+		try:
+			self.size = os.lseek(fd, 0, os.SEEK_END) # works for block devices too
+		finally:
+			os.close(fd)
+		bsize = self.legacy_bsize
+		# offsets of all IVs searched:
+		self.search_end = max(0, -(-self.size // bsize) * bsize - self.ivsize)
+		# offsets of IVs not truncated by end of data:
+		self.full_end = max(0, min(self.size - self.ivsize + 1, self.search_end))
+
+	def tasks(self):
+		return [(start, min(start + self.task_size, self.full_end))
+			for start in range(0, self.full_end, self.task_size)]
+
+	def scan_tail(self):
+		"search the IVs truncated by end of data"
+		start = self.full_end
+		if start >= self.search_end:
+			return []
+		with open(self.filename, 'rb') as fh:
+			fh.seek(start)
+			data = fh.read()
+		plen = len(self.prefix)
+		return [start + i for i in range(self.search_end - start)
+			if sha256(data[i:i+self.ivsize]).digest()[:plen] == self.prefix]
+
+	def progress(self, done):
+		if self.silent:
+			return
+		elapsed = time.time() - self.start_time
+		rate = done / elapsed if elapsed else 0
+		eta = (self.full_end - done) / rate if rate else 0
+		from .util import msg_r, secs_to_hms
+		msg_r('\rSearched: {} of {} bytes ({:.1f} MB/s, ETA {})'.format(
+			done,
+			self.full_end,
+			rate / 1000000,
+			secs_to_hms(int(eta))))
+
+	def run(self):
+		"""
+		Generator yielding the offsets of incog data matching the Incog ID in
+		ascending order
+		"""
+		self.start_time = time.time()
+		tasks = self.tasks()
+		done = 0
+		if self.jobs == 1 or len(tasks) <= 1:
+			worker = IncogScanWorker(self.filename, self.prefix)
+			for start, end in tasks:
+				yield from worker.scan_range(start, end)
+				done += end - start
+				self.progress(done)
+		else:
+			from concurrent.futures import ProcessPoolExecutor
+			executor = ProcessPoolExecutor(
+				max_workers = self.jobs,
+				initializer = _init_worker,
+				initargs    = (self.filename, self.prefix))
+			pending = deque()
+			tasks = deque(tasks)
+			try:
+				while tasks or pending:
+					while tasks and len(pending) < self.jobs * 2:
+						start, end = tasks.popleft()
+						pending.append((end - start, executor.submit(_scan_range, start, end)))
+					nbytes, future = pending.popleft()
+					yield from future.result()
+					done += nbytes
+					self.progress(done)
+			finally:
+				executor.shutdown(cancel_futures=True)
+		yield from self.scan_tail()
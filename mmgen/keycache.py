@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+keycache: process-local key/address cache for the MMGen suite
+"""
+
+from .util import suf
+from .addr import AddrListID, MMGenAddrType
+from .addrlist import (
+	AddrIdxList,
+	AddrListData,
+	AddrListEntry,
+	AddrListChksum,
+	KeyAddrList,
+	ViewKeyAddrList)
+
+class KeyAddrCache:
+	"""
+	Memory-only cache of key-address list entries generated from a seed, keyed
+	by Seed ID, coin, network and address type.
+
+	Keys are generated only for indexes not already in the cache, so signing
+	several transactions or messages with the same seed in one session (e.g. an
+	autosign run) doesn’t regenerate them.  The cache is wiped when the removable
+	device is unmounted and on exit.
+	"""
+	cache = {}
+	wipe_registered = False
+
+	def __init__(self, cfg, proto, seed, mmtype=None):
+		self.cfg = cfg
+		self.proto = proto
+		self.seed = seed
+		self.mmtype = MMGenAddrType(proto, mmtype or proto.dfl_mmtype)
+		self.data = self.cache.setdefault((seed.sid, proto.coin, proto.network, str(self.mmtype)), {})
+
+	def get(self, addr_idxs, *, add_p2pkh=False, skip_chksum=False, al_cls=KeyAddrList):
+		"""
+		Return a key-address list (or viewkey-address list, if ‘al_cls’ is
+		ViewKeyAddrList) for the indexes in ‘addr_idxs’, generating missing entries
+		"""
+		if not isinstance(addr_idxs, AddrIdxList):
+			addr_idxs = AddrIdxList(fmt_str=addr_idxs)
+
+		if missing := [i for i in addr_idxs if not (
+				i in self.data and (self.data[i].addr_p2pkh or not add_p2pkh))]:
+			self.register_wipe()
+			for e in KeyAddrList(
+					cfg         = self.cfg,
+					proto       = self.proto,
+					seed        = self.seed,
+					addr_idxs   = AddrIdxList(idx_list=missing),
+					mmtype      = self.mmtype,
+					skip_chksum = True,
+					add_p2pkh   = add_p2pkh).data:
+				self.data[e.idx] = e
+
+		if hits := len(addr_idxs) - len(missing):
+			self.cfg._util.vmsg(
+				f'Using {hits} cached key{suf(hits)} for {self.seed.sid}:{self.mmtype} ({self.proto.coin})')
+
+		if al_cls is ViewKeyAddrList:
+			entries = [self.make_viewkey_entry(self.data[i]) for i in addr_idxs]
+		else:
+			entries = [self.copy_entry(self.data[i]) for i in addr_idxs]
+
+		al = al_cls(
+			self.cfg,
+			self.proto,
+			al_id = AddrListID(sid=self.seed.sid, mmtype=self.mmtype),
+			adata = AddrListData(entries))
+
+		if not skip_chksum:
+			al.chksum = AddrListChksum(al)
+
+		return al
+
+	def copy_entry(self, e):
+		# callers may modify entries, so cached entries are never returned:
+		return AddrListEntry(proto=self.proto, **e._asdict())
+
+	def make_viewkey_entry(self, e):
+		return AddrListEntry(
+			proto         = self.proto,
+			idx           = e.idx,
+			addr          = e.addr,
+			viewkey       = e.viewkey,
+			wallet_passwd = ViewKeyAddrList.gen_wallet_passwd(e.viewkey.encode()))
+
+	@classmethod
+	def register_wipe(cls):
+		if not cls.wipe_registered:
+			import atexit
+			atexit.register(cls.wipe)
+			cls.wipe_registered = True
+
+	@classmethod
+	def wipe(cls):
+		for data in cls.cache.values():
+			data.clear()
+		cls.cache.clear()
@@ -47,6 +47,22 @@ class keygen_base:
 			privkey.pubkey_type,
 			privkey.compressed)
 
+	def gen_data_batch(self, privkeys):
+		"""
+		generate public data for a sequence of private keys of uniform type, using the
+		backend’s batch pubkey generation method, if available
+		"""
+		assert all(isinstance(privkey, PrivKey) for privkey in privkeys)
+		return [keygen_public_data(
+					pubkey,
+					self.to_viewkey(privkey),
+					privkey.pubkey_type,
+					privkey.compressed)
+				for privkey, pubkey in zip(privkeys, self.to_pubkey_batch(privkeys), strict=True)]
+
+	def to_pubkey_batch(self, privkeys):
+		return [self.to_pubkey(privkey) for privkey in privkeys]
+
 	def to_viewkey(self, privkey):
 		return None
 
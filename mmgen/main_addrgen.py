@@ -36,7 +36,7 @@ else:
 	gen_what = 'addresses'
 	gen_clsname = 'AddrList'
 	gen_desc = 'addresses'
-	filter_codes = ['-']
+	filter_codes = ['-', 'a']
 	note_addrkey = ''
 
 opts_data = {
@@ -53,9 +53,13 @@ opts_data = {
 			-- --, --longhelp        Print help message for long (global) options
 			-k -A, --no-addresses    Print only secret keys, no addresses
 			-- -c, --print-checksum  Print address list checksum and exit
+			-- -C, --chain-checkpoint-dir=d Save encrypted key derivation checkpoints
+			+                        to directory 'd', and resume derivation from them
 			-- -d, --outdir=      d  Output files to directory 'd' instead of working dir
 			-- -e, --echo-passphrase Echo passphrase or mnemonic to screen upon entry
 			-- -i, --in-fmt=      f  Input is from wallet format 'f' (see FMT CODES below)
+			-- -j, --jobs=        n  Distribute key and address generation over 'n'
+			+                        processes (default: {cfg.jobs})
 			-- -H, --hidden-incog-input-params=f,o  Read hidden incognito data from file
 			+                        'f' at offset 'o' (comma-separated)
 			-- -O, --old-incog-fmt   Specify old-format incognito input
@@ -73,6 +77,8 @@ opts_data = {
 			-- -r, --usr-randchars=n Get 'n' characters of additional randomness from user
 			+                        (min={cfg.min_urandchars}, max={cfg.max_urandchars}, default={cfg.usr_randchars})
 			-- -S, --stdout          Print {what} to stdout
+			-a -s, --stream          Write {what} to file as they are generated, without
+			+                        keeping them in memory
 			-- -t, --type=t          Choose address type. Options: see ADDRESS TYPES below
 			+                        (default: {dmat})
 			-- -U, --subwallet=   U  Generate {what} for subwallet 'U' (see SUBWALLETS
@@ -146,26 +152,34 @@ if cfg.no_addresses:
 elif cfg.viewkeys:
 	gen_clsname = 'ViewKeyAddrList'
 
+if cfg.stream and (cfg.stdout or cfg.print_checksum):
+	from .util import die
+	die(1, '--stream is incompatible with --stdout and --print-checksum')
+
 al = getattr(addrlist, gen_clsname)(
 	cfg       = cfg,
 	proto     = proto,
 	seed      = ss_seed,
 	addr_idxs = idxs,
-	mmtype    = addr_type)
+	mmtype    = addr_type,
+	stream    = bool(cfg.stream))
 
 af = al.file
 
-af.format()
-
-if al.gen_addrs and cfg.print_checksum:
-	from .util import Die
-	Die(0, al.checksum)
-
-from .ui import keypress_confirm
-if al.gen_keys and keypress_confirm(cfg, 'Encrypt key list?'):
-	af.encrypt()
-	af.write(
-		binary = True,
-		desc = f'encrypted {af.desc}')
+if cfg.stream:
+	af.write_stream()
 else:
-	af.write()
+	af.format()
+
+	if al.gen_addrs and cfg.print_checksum:
+		from .util import Die
+		Die(0, al.checksum)
+
+	from .ui import keypress_confirm
+	if al.gen_keys and keypress_confirm(cfg, 'Encrypt key list?'):
+		af.encrypt()
+		af.write(
+			binary = True,
+			desc = f'encrypted {af.desc}')
+	else:
+		af.write()
@@ -46,6 +46,8 @@ opts_data = {
 			+                     blockchain for unspent outputs that include the imported
 			+                     address(es).  Required if any of the imported addresses
 			+                     are already in the blockchain and have a balance.
+			b- -R, --rescan-plan  Print the block ranges a rescan of the addresses would
+			+                     scan and the estimated time, and exit without importing
 			e- -t, --token-addr=ADDR Import addresses for ERC20 token with address ADDR
 """,
 	'notes': '{notes}',
@@ -77,8 +79,8 @@ addrimport_msgs = {
 
 def parse_cmd_args(cmd_args):
 
-	def import_mmgen_list(infile):
-		return (AddrList, KeyAddrList)[bool(cfg.keyaddr_file)](cfg, proto, infile=infile)
+	def import_mmgen_list(infile): # parsed by gen_args_list()
+		return (AddrList, KeyAddrList)[bool(cfg.keyaddr_file)](cfg, proto, infile=infile, stream=True)
 
 	match cmd_args:
 		case [infile]:
@@ -158,19 +160,10 @@ async def main():
 
 	al, infile = parse_cmd_args(cfg._args)
 
-	cfg._util.qmsg(
-		f'OK. {al.num_addrs} addresses'
-		+ (f' from Seed ID {al.al_id.sid.hl()}' if hasattr(al.al_id, 'sid') else ''))
-
-	msg(
-		f'Importing {len(al.data)} address{suf(al.data, "es")} from {infile}'
-		+ (' (batch mode)' if cfg.batch else ''))
-
-	batch, rescan = check_opts(twctl)
-
 	def gen_args_list(al):
 		_d = namedtuple('import_data', ['addr', 'twmmid', 'comment'])
-		for e in al.data:
+		# MMGen address files are parsed as entries are read, without keeping them in memory:
+		for e in (al.file.iter_file() if hasattr(al, 'infile') else al.data):
 			yield _d(
 				addr    = e.addr,
 				twmmid  = f'{al.al_id}:{e.idx}' if e.idx else f'{proto.base_coin.lower()}:{e.addr}',
@@ -178,6 +171,23 @@ async def main():
 
 	args_list = list(gen_args_list(al))
 
+	if hasattr(al, 'infile'):
+		al.do_chksum_msg(record=False)
+
+	cfg._util.qmsg(
+		f'OK. {al.num_addrs} addresses'
+		+ (f' from Seed ID {al.al_id.sid.hl()}' if hasattr(al.al_id, 'sid') else ''))
+
+	if cfg.rescan_plan:
+		await twctl.rescan_addresses({a.addr for a in args_list})
+		return
+
+	msg(
+		f'Importing {len(args_list)} address{suf(args_list, "es")} from {infile}'
+		+ (' (batch mode)' if cfg.batch else ''))
+
+	batch, rescan = check_opts(twctl)
+
 	await twctl.import_address_common(args_list, batch=batch)
 
 	if rescan:
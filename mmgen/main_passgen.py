@@ -43,6 +43,8 @@ opts_data = {
 		'options': """
 -h, --help            Print this help message
 --, --longhelp        Print help message for long (global) options
+-C, --chain-checkpoint-dir=d Save encrypted key derivation checkpoints
+                      to directory 'd', and resume derivation from them
 -d, --outdir=      d  Output files to directory 'd' instead of working dir
 -e, --echo-passphrase Echo passphrase or mnemonic to screen upon entry
 -f, --passwd-fmt=  f  Generate passwords of format 'f'.  Default: {pl.dfl_pw_fmt}.
@@ -44,6 +44,9 @@ opts_data = {
 			+                         for password hashing (default: '{gc.dfl_hash_preset}')
 			-- -P, --passwd-file= f   Get passphrase from file 'f'.
 			-- -q, --quiet            Produce quieter output
+			b- -R, --rescan-plan      Print the block ranges to be scanned by ‘rescan_address’
+			+                         or ‘rescan_blockchain’ and the estimated time, and exit
+			+                         without rescanning
 			-- -r, --usr-randchars=n  Get 'n' characters of additional randomness from
 			+                         user (min={cfg.min_urandchars}, max={cfg.max_urandchars})
 			x- -s, --scroll           Use the curses-like scrolling interface for tracking
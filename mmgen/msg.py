@@ -209,15 +209,11 @@ class coin_msg:
 
 		async def sign(self, wallet_files, *, passwd_file=None):
 
-			from .addrlist import KeyAddrList
+			from .keycache import KeyAddrCache
 
 			async def sign_list(al_in, seed):
-				al = KeyAddrList(
-					cfg         = self.cfg,
-					proto       = self.proto,
-					seed        = seed,
-					addr_idxs   = al_in.idxlist,
-					mmtype      = al_in.mmtype,
+				al = KeyAddrCache(self.cfg, self.proto, seed, al_in.mmtype).get(
+					al_in.idxlist,
 					skip_chksum = True,
 					add_p2pkh   = al_in.mmtype in ('S', 'B'))
 
@@ -27,7 +27,6 @@ from .obj import ImmutableAttr, ListItemAttr, MMGenPWIDString, TwComment
 from .key import PrivKey
 from .addr import MMGenPasswordType, AddrIdx, AddrListID
 from .addrlist import (
-	AddrListChksum,
 	AddrListIDStr,
 	AddrListEntryBase,
 	AddrList,
@@ -105,7 +104,7 @@ class PasswordList(AddrList):
 
 		self.num_addrs = len(self.data)
 		self.fmt_data = ''
-		self.chksum = AddrListChksum(self)
+		# self.chksum set by self.file.parse_file() or self.generate()
 
 		fs = f'{self.al_id.sid}-{self.pw_id_str}-{self.pw_fmt_disp}-{self.pw_len}[{{}}]'
 		self.id_str = AddrListIDStr(self, fmt_str=fs)
@@ -13,13 +13,25 @@ proto.btc.addrgen: Bitcoin address generation classes for the MMGen suite
 """
 
 from ...addrgen import addr_generator, check_data
-from .common import hash160
+from .common import hash160, hash160_batch
 
-class p2pkh(addr_generator.base):
+class hash160_base(addr_generator.base):
+
+	@check_data
+	def get_pubkey(self, data):
+		return data.pubkey
+
+	def to_addr_batch(self, data):
+		return [self.pubhash2addr(pubhash) for pubhash in hash160_batch(list(map(self.get_pubkey, data)))]
+
+class p2pkh(hash160_base):
 
 	@check_data
 	def to_addr(self, data):
-		return self.proto.pubhash2addr(hash160(data.pubkey), 'p2pkh')
+		return self.pubhash2addr(hash160(data.pubkey))
+
+	def pubhash2addr(self, pubhash):
+		return self.proto.pubhash2addr(pubhash, 'p2pkh')
 
 class legacy(p2pkh):
 	pass
@@ -27,17 +39,23 @@ class legacy(p2pkh):
 class compressed(p2pkh):
 	pass
 
-class segwit(addr_generator.base):
+class segwit(hash160_base):
 
 	@check_data
 	def to_addr(self, data):
-		return self.proto.pubhash2segwitaddr(hash160(data.pubkey))
+		return self.pubhash2addr(hash160(data.pubkey))
+
+	def pubhash2addr(self, pubhash):
+		return self.proto.pubhash2segwitaddr(pubhash)
 
 	def to_segwit_redeem_script(self, data): # NB: returns hex
 		return self.proto.pubhash2redeem_script(hash160(data.pubkey)).hex()
 
-class bech32(addr_generator.base):
+class bech32(hash160_base):
 
 	@check_data
 	def to_addr(self, data):
-		return self.proto.pubhash2bech32addr(hash160(data.pubkey))
+		return self.pubhash2addr(hash160(data.pubkey))
+
+	def pubhash2addr(self, pubhash):
+		return self.proto.pubhash2bech32addr(pubhash)
@@ -19,6 +19,23 @@ b58a = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 def hash160(in_bytes): # OP_HASH160
 	return hashlib.new('ripemd160', hashlib.sha256(in_bytes).digest()).digest()
 
+def hash160_batch(in_bytes_list):
+	"""
+	Return the OP_HASH160 digests of a sequence of byte strings of uniform length
+	(e.g. pubkeys), computed in a single call to the secp256k1 extension module, if
+	available
+	"""
+	try:
+		from ..secp256k1.secp256k1 import hash160_batch
+	except ImportError:
+		return [hash160(b) for b in in_bytes_list]
+	if not in_bytes_list:
+		return []
+	msg_len = len(in_bytes_list[0])
+	assert all(len(b) == msg_len for b in in_bytes_list), 'hash160_batch(): input lengths differ'
+	res = hash160_batch(b''.join(in_bytes_list), msg_len)
+	return [res[i:i+20] for i in range(0, len(res), 20)]
+
 def hash256(in_bytes): # OP_HASH256
 	return hashlib.sha256(hashlib.sha256(in_bytes).digest()).digest()
 
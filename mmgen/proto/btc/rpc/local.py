@@ -198,6 +198,7 @@ class BitcoinRPCClient(RPCClient, metaclass=AsyncInit):
 
 	auth_type = 'basic'
 	has_auth_cookie = True
+	has_batch = True
 	wallet_path = '/'
 	dfl_twname = 'mmgen-tracking-wallet'
 
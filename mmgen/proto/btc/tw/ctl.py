@@ -59,40 +59,38 @@ class BitcoinTwCtl(TwCtl):
 	@write_mode
 	async def rescan_blockchain(self, start, stop):
 
+		from .rescan import BitcoinRescanPlanner
+		planner = BitcoinRescanPlanner(self.cfg, self.proto, self.rpc)
+
 		start = start or 0
 		endless = stop is None
-		CR = '\n' if self.cfg.test_suite else '\r'
+		key = (start, stop)
 
 		if not (start >= 0 and (stop if stop is not None else start) >= start):
 			die(1, f'{start} {stop}: invalid range')
 
-		async def do_scan(chunks, tip):
-			res = None
-			for a, b in chunks:
-				msg_r(f'{CR}Scanning blocks {a}-{b} ')
-				res = await self.rpc.call('rescanblockchain', a, b, timeout=7200)
-				if res['start_height'] != a or res['stop_height'] != b:
-					die(1, f'\nAn error occurred in block range {a}-{b}')
-			msg('')
-			return b if res else tip
-
-		def gen_chunks(start, stop, tip):
-			if endless:
-				stop = tip
-			elif stop > tip:
-				die(1, f'{stop}: stop value is higher than chain tip')
-			while start <= stop:
-				yield (start, min(start + 99, stop))
-				start += 100
+		tip = self.rpc.blockcount
+		if endless:
+			stop = tip
+		elif stop > tip:
+			die(1, f'{stop}: stop value is higher than chain tip')
 
-		last_block = await do_scan(gen_chunks(start, stop, self.rpc.blockcount), self.rpc.blockcount)
+		if self.cfg.rescan_plan:
+			planner.print_plan(list(planner.gen_chunks(start, stop)))
+			return
+
+		if resume_block := planner.get_resume_block(*key):
+			msg(f'Resuming interrupted rescan at block {resume_block}')
+			start = resume_block
+
+		await planner.rescan_range(start, stop, key=key)
 
 		if endless:
-			tip = await self.rpc.call('getblockcount')
-			while last_block < tip:
-				last_block = await do_scan(gen_chunks(last_block+1, tip, tip), tip)
-				tip = await self.rpc.call('getblockcount')
+			while (tip := await self.rpc.call('getblockcount')) > stop:
+				await planner.rescan_range(stop + 1, tip, key=key)
+				stop = tip
 
+		planner.done()
 		msg('Done')
 
 	@write_mode
@@ -119,11 +117,24 @@ class BitcoinTwCtl(TwCtl):
 				len(blocks),
 				suf(blocks)))
 			self.cfg._util.vmsg(f'Blocks to rescan: {fmt_list(blocks, fmt="bare")}')
+			from .rescan import BitcoinRescanPlanner
+			planner = BitcoinRescanPlanner(self.cfg, self.proto, self.rpc)
+			if self.cfg.rescan_plan:
+				planner.print_plan(planner.merge_blocks(blocks))
+				return True
 			CR = '\n' if self.cfg.test_suite else '\r'
-			for n, block in enumerate(blocks):
-				msg_r(f'{CR}Rescanning block: {block} ({n+1}/{len(blocks)})')
-				# httplib seems to require fresh connection here, so specify timeout
-				await self.rpc.call('rescanblockchain', block, block, timeout=60)
+			remaining = blocks
+			while remaining: # replan after each call, as the per-block time estimate changes
+				a, b = planner.merge_blocks(remaining)[0]
+				remaining = [block for block in remaining if block > b]
+				msg_r('{}Rescanning block{}: {} ({}/{})'.format(
+					CR,
+					's' if b > a else '',
+					f'{a}-{b}' if b > a else a,
+					len(blocks) - len(remaining),
+					len(blocks)))
+				await planner.rescan(a, b)
+			planner.save()
 			msg(f'\nAddress balance{suf(coin_addrs)} updated successfully')
 			return True
 		else:
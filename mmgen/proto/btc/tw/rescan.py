@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+proto.btc.tw.rescan: Bitcoin base protocol blockchain rescan planner for the MMGen suite
+"""
+
+import os, json, time
+
+from ....util import msg, msg_r, ymsg, die, suf, secs_to_hms
+
+class BitcoinRescanPlanner:
+	"""
+	Planner for ‘rescanblockchain’ calls.
+
+	Target blocks are merged into ranges, joining blocks separated by gaps that
+	take less time to scan than the overhead of a separate call.  Ranges of
+	blocks are scanned in chunks sized to take about ‘chunk_secs’ seconds each.
+	Both depend on the per-block rescan time, which is measured on each call and
+	saved in a state file in the data directory.
+
+	A checkpoint is saved to the state file after each chunk, so that an
+	interrupted rescan of a range resumes where it stopped when restarted with
+	the same range.
+	"""
+	file_ext = 'json'
+	call_secs = 0.2        # estimated overhead of a ‘rescanblockchain’ call
+	dfl_block_secs = 0.05  # initial estimate of the per-block rescan time
+	chunk_secs = 30        # target duration of a chunk
+	min_chunk = 100
+	max_chunk = 20000
+
+	def __init__(self, cfg, proto, rpc):
+		self.cfg = cfg
+		self.proto = proto
+		self.rpc = rpc
+		self.fn = os.path.join(
+			cfg.data_dir,
+			'rescan',
+			f'{proto.coin.lower()}-{rpc.twname}.{self.file_ext}')
+		self.block_secs = self.dfl_block_secs
+		self.checkpoint = None
+		self.load()
+
+	def load(self):
+		try:
+			with open(self.fn) as fh:
+				data = json.load(fh)
+			assert data['coin'] == self.proto.coin and data['network'] == self.proto.network
+		except FileNotFoundError:
+			return
+		except Exception as e:
+			ymsg(f'Warning: invalid rescan state file ‘{self.fn}’ ({e!s}), ignoring')
+			return
+		self.block_secs = data['block_secs']
+		self.checkpoint = data['checkpoint']
+
+	def save(self):
+		from ....fileutil import check_or_create_dir
+		check_or_create_dir(os.path.dirname(self.fn))
+		tmp_fn = self.fn + '.tmp'
+		with open(tmp_fn, 'w') as fh:
+			json.dump({
+					'coin': self.proto.coin,
+					'network': self.proto.network,
+					'block_secs': self.block_secs,
+					'checkpoint': self.checkpoint},
+				fh)
+		os.replace(tmp_fn, self.fn)
+
+	@property
+	def max_gap(self):
+		"maximum number of untargeted blocks between two blocks rescanned in the same call"
+		return int(self.call_secs / self.block_secs)
+
+	@property
+	def chunk_size(self):
+		if self.cfg.test_suite: # fixed chunk boundaries for reproducible output
+			return self.min_chunk
+		return max(self.min_chunk, min(self.max_chunk, int(self.chunk_secs / self.block_secs)))
+
+	def merge_blocks(self, blocks):
+		"""
+		Return ‘blocks’ merged into a sorted list of ranges
+		"""
+		ret = []
+		for block in sorted(set(blocks)):
+			if ret and block - ret[-1][1] <= self.max_gap + 1:
+				ret[-1][1] = block
+			else:
+				ret.append([block, block])
+		return [tuple(r) for r in ret]
+
+	def gen_chunks(self, start, stop):
+		while start <= stop:
+			end = min(start + self.chunk_size - 1, stop)
+			yield (start, end)
+			start = end + 1
+
+	def estimate(self, ranges):
+		return sum(self.call_secs + (b - a + 1) * self.block_secs for a, b in ranges)
+
+	def print_plan(self, ranges):
+		nblocks = sum(b - a + 1 for a, b in ranges)
+		msg('Rescan plan: {} block{} in {} call{} to ‘rescanblockchain’'.format(
+			nblocks,
+			suf(nblocks),
+			len(ranges),
+			suf(ranges)))
+		for a, b in ranges:
+			msg(f'  {a}-{b}')
+		msg('Estimated time: {} (at {:.3f} seconds per block)'.format(
+			secs_to_hms(round(self.estimate(ranges))),
+			self.block_secs))
+
+	def get_resume_block(self, start, stop):
+		"""
+		Return the block at which an interrupted rescan of blocks ‘start’ through
+		‘stop’ should be resumed, or None
+		"""
+		if (c := self.checkpoint) and c['start'] == start and c['stop'] == stop:
+			return c['next']
+
+	async def rescan(self, start, stop):
+		"""
+		Rescan blocks ‘start’ through ‘stop’ in a single call, updating the per-block
+		time estimate
+		"""
+		t_start = time.time()
+		# httplib seems to require fresh connection here, so specify timeout
+		res = await self.rpc.call('rescanblockchain', start, stop, timeout=7200)
+		if res['start_height'] != start or res['stop_height'] != stop:
+			die(1, f'\nAn error occurred in block range {start}-{stop}')
+		t = max(time.time() - t_start - self.call_secs, 0) / (stop - start + 1)
+		self.block_secs = max((self.block_secs + t) / 2, 0.0001)
+
+	async def rescan_range(self, start, stop, *, key):
+		"""
+		Rescan blocks ‘start’ through ‘stop’ in chunks, checkpointing the rescan
+		identified by ‘key’ (a start, stop pair) after each chunk
+		"""
+		CR = '\n' if self.cfg.test_suite else '\r'
+		for a, b in self.gen_chunks(start, stop):
+			msg_r(f'{CR}Scanning blocks {a}-{b} ')
+			await self.rescan(a, b)
+			self.checkpoint = {'start': key[0], 'stop': key[1], 'next': b + 1}
+			self.save()
+		msg('')
+
+	def done(self):
+		self.checkpoint = None
+		self.save()
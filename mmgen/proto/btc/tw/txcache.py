@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+proto.btc.tw.txcache: Bitcoin base protocol on-disk transaction cache for the MMGen suite
+"""
+
+import os, json
+
+from ....util import ymsg
+
+class BitcoinTwTxCache:
+	"""
+	LRU cache of transaction data for the transaction history, stored in a JSON
+	file in the data directory.
+
+	Two kinds of records are kept, keyed by transaction ID:
+
+	- 'tx':   a confirmed wallet transaction (‘gettransaction’ data, including the
+	          decoded transaction).  Block-dependent fields are validated against the
+	          blockchain when the cache is loaded, and records from blocks no longer
+	          in the chain are discarded.
+	- 'vout': the outputs of a prevout transaction.  These are determined by the
+	          transaction ID and so are never invalidated.
+
+	The number of records is limited to ‘txhist_cache_size’, least recently
+	used records being evicted first.
+	"""
+	file_ext = 'json'
+	dropped_fields = ('hex', 'details', 'confirmations') # unused or volatile
+
+	def __init__(self, cfg, proto, rpc):
+		self.cfg = cfg
+		self.proto = proto
+		self.rpc = rpc
+		self.max_size = cfg.txhist_cache_size
+		self.fn = os.path.join(
+			cfg.data_dir,
+			'txcache',
+			f'{proto.coin.lower()}-{rpc.twname}.{self.file_ext}')
+		self.data = {}
+		self.modified = False
+
+	async def load(self):
+		try:
+			with open(self.fn) as fh:
+				data = json.load(fh)
+			assert data['coin'] == self.proto.coin and data['network'] == self.proto.network
+		except FileNotFoundError:
+			return
+		except Exception as e:
+			ymsg(f'Warning: invalid transaction cache file ‘{self.fn}’ ({e!s}), ignoring')
+			return
+		self.data = data['txs']
+		if data['tip']:
+			await self.check_reorg(*data['tip'])
+		self.cfg._util.dmsg(f'Loaded {len(self.data)} cached transactions from ‘{self.fn}’')
+
+	async def check_reorg(self, tip_height, tip_hash):
+		"""
+		If the highest cached block is still in the chain, so are all the others.
+		Otherwise, check each block and discard transactions from blocks no longer
+		in the chain.
+		"""
+		if (tip_height <= self.rpc.blockcount
+				and await self.rpc.call('getblockhash', tip_height) == tip_hash):
+			return
+		blocks = {(d['tx']['blockheight'], d['tx']['blockhash']) for d in self.data.values() if 'tx' in d}
+		heights = sorted({height for height, _ in blocks if height <= self.rpc.blockcount})
+		valid = set(zip(heights, await self.rpc.gathered_call('getblockhash', [(h,) for h in heights])))
+		for txid, d in tuple(self.data.items()):
+			if 'tx' in d and (d['tx']['blockheight'], d['tx']['blockhash']) not in valid:
+				del d['tx']
+				if not d:
+					del self.data[txid]
+		self.cfg._util.dmsg(f'Removed {len(blocks - valid)} reorganized block(s) from transaction cache')
+		self.modified = True
+
+	def get(self, key, txid):
+		if (d := self.data.get(txid)) and key in d:
+			self.data[txid] = self.data.pop(txid) # move to end of LRU queue
+			return d[key]
+
+	def get_tx(self, txid):
+		if tx := self.get('tx', txid):
+			return tx | {'confirmations': self.rpc.blockcount + 1 - tx['blockheight']}
+
+	def get_prevout_tx(self, txid):
+		if vout := self.get('vout', txid):
+			return {'txid': txid, 'vout': vout}
+
+	def add(self, key, txid, data):
+		self.data[txid] = self.data.pop(txid, {}) | {key: data}
+		self.modified = True
+
+	def add_tx(self, tx):
+		if tx['confirmations'] > 0 and tx.get('blockhash'):
+			self.add('tx', tx['txid'], {k: v for k, v in tx.items() if k not in self.dropped_fields} | {
+				# old/altcoin daemons return no 'blockheight' field:
+				'blockheight': tx.get('blockheight') or self.rpc.blockcount + 1 - tx['confirmations']})
+
+	def add_prevout_tx(self, tx):
+		self.add('vout', tx['txid'], tx['vout'])
+
+	def save(self):
+		if not self.modified:
+			return
+		from ....fileutil import check_or_create_dir
+		check_or_create_dir(os.path.dirname(self.fn))
+		for txid in tuple(self.data)[:max(0, len(self.data) - self.max_size)]:
+			del self.data[txid]
+		tip = max(((d['tx']['blockheight'], d['tx']['blockhash']) for d in self.data.values() if 'tx' in d),
+			default = None)
+		tmp_fn = self.fn + '.tmp'
+		fd = os.open(tmp_fn, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with os.fdopen(fd, 'w') as fh:
+			json.dump({
+					'coin': self.proto.coin,
+					'network': self.proto.network,
+					'tip': tip,
+					'txs': self.data},
+				fh,
+				separators = (',', ':'))
+		os.replace(tmp_fn, self.fn)
+		self.modified = False
@@ -321,20 +321,37 @@ class BitcoinTwTxHistory(BitcoinTwView, TwTxHistory, BitcoinTwRPC):
 					for e in await self.get_label_addr_pairs()}
 			)
 
+		if self.use_cache and self.cfg.txhist_cache_size:
+			from .txcache import BitcoinTwTxCache
+			cache = BitcoinTwTxCache(self.cfg, self.proto, self.rpc)
+			await cache.load()
+		else:
+			cache = None
+
+		_wallet_txids = list({d['txid'] for d in data})
+		_cached_txs = {txid: tx for txid in _wallet_txids if cache and (tx := cache.get_tx(txid))}
+
 		msg_r('Getting wallet transactions...')
-		_wallet_txs = await self.rpc.gathered_icall(
+		_new_txs = await self.rpc.gathered_icall(
 			'gettransaction',
-			[(i, True, True) for i in {d['txid'] for d in data}])
+			[(i, True, True) for i in _wallet_txids if i not in _cached_txs])
 		msg('done')
 
-		if not 'decoded' in _wallet_txs[0]:
+		if _new_txs and not 'decoded' in _new_txs[0]:
 			_decoded_txs = iter(
 				await self.rpc.gathered_call(
 					'decoderawtransaction',
-					[(d['hex'],) for d in _wallet_txs]))
-			for tx in _wallet_txs:
+					[(d['hex'],) for d in _new_txs]))
+			for tx in _new_txs:
 				tx['decoded'] = next(_decoded_txs)
 
+		if cache:
+			for tx in _new_txs:
+				cache.add_tx(tx)
+
+		_new_txs = iter(_new_txs)
+		_wallet_txs = [_cached_txs.get(txid) or next(_new_txs) for txid in _wallet_txids]
+
 		if self.cfg.debug_tw:
 			do_json_dump((_wallet_txs, 'wallet-txs'),)
 
@@ -349,11 +366,19 @@ class BitcoinTwTxHistory(BitcoinTwView, TwTxHistory, BitcoinTwRPC):
 
 		_prevout_txids = {i.txid for d in txdata for i in d['prevouts']}
 
+		_prevout_txs_dict = {txid: tx for txid in _prevout_txids if cache and (tx := cache.get_prevout_tx(txid))}
+		_new_prevout_txids = [txid for txid in _prevout_txids if txid not in _prevout_txs_dict]
+
 		msg_r('Getting input transactions...')
-		_prevout_txs = await self.rpc.gathered_call('getrawtransaction', [(i, True) for i in _prevout_txids])
+		_prevout_txs = await self.rpc.gathered_call('getrawtransaction', [(i, True) for i in _new_prevout_txids])
 		msg('done')
 
-		_prevout_txs_dict = dict(zip(_prevout_txids, _prevout_txs))
+		_prevout_txs_dict.update(zip(_new_prevout_txids, _prevout_txs))
+
+		if cache:
+			for tx in _prevout_txs:
+				cache.add_prevout_tx(tx)
+			cache.save()
 
 		for d in txdata:
 			d['prevout_txs'] = [_prevout_txs_dict[txid] for txid in {i.txid for i in d['prevouts']}]
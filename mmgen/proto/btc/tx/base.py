@@ -179,6 +179,8 @@ def DeserializeTX(proto, txhex):
 
 	d['locktime'] = bytes2int(bshift(4))
 	d['unsigned_hex'] = raw_tx.hex()
+	# weight is 4 * non-witness size + witness size (incl. marker and flag):
+	d['vsize'] = (len(tx) * 4 - d['witness_size'] * 3 + 3) // 4
 
 	return namedtuple('deserialized_tx', list(d.keys()))(**d)
 
@@ -18,10 +18,8 @@ from .completed import Completed
 
 class Signed(Completed, TxBase.Signed):
 
-	def compare_size_and_estimated_size(self, tx_decoded):
+	def compare_size_and_estimated_size(self, vsize):
 		est_vsize = self.estimate_size()
-		d = tx_decoded
-		vsize = d['vsize'] if 'vsize' in d else d['size']
 		self.cfg._util.vmsg(f'\nVsize: {vsize} (true) {est_vsize} (estimated)')
 		ratio = float(est_vsize) / vsize
 		if not (0.95 < ratio < 1.05): # allow for 5% error
@@ -14,7 +14,7 @@ proto.btc.tx.unsigned: Bitcoin unsigned transaction class
 
 from ....tx import unsigned as TxBase
 from ....obj import CoinTxID, MMGenDict
-from ....util import msg, msg_r, ymsg, suf, die
+from ....util import msg, msg_r, ymsg, suf
 from .completed import Completed
 
 class Unsigned(Completed, TxBase.Unsigned):
@@ -42,6 +42,12 @@ class Unsigned(Completed, TxBase.Unsigned):
 			kg = KeyGenerator(self.cfg, self.proto, 'std')
 			ag = AddrGenerator(self.cfg, self.proto, 'segwit')
 			keydict = MMGenDict([(d.addr, d.sec) for d in keys])
+			# derive each redeem script only once, even if several inputs share a key:
+			segwit_addrs = list(dict.fromkeys(d.addr for d in self.inputs if d.mmtype == 'S'))
+			redeem_scripts = dict(zip(
+				segwit_addrs,
+				map(ag.to_segwit_redeem_script, kg.gen_data_batch([keydict[a] for a in segwit_addrs])),
+				strict = True))
 
 		sig_data = []
 		for d in self.inputs:
@@ -49,7 +55,7 @@ class Unsigned(Completed, TxBase.Unsigned):
 			e['amount'] = e['amt']
 			del e['amt']
 			if d.mmtype == 'S':
-				e['redeemScript'] = ag.to_segwit_redeem_script(kg.gen_data(keydict[d.addr]))
+				e['redeemScript'] = redeem_scripts[d.addr]
 			sig_data.append(e)
 
 		msg_r(f'Signing transaction{tx_num_str}...')
@@ -69,11 +75,8 @@ class Unsigned(Completed, TxBase.Unsigned):
 			self.update_serialized(ret['hex'])
 			from ....tx import SignedTX
 			new = SignedTX(cfg=self.cfg, data=self.__dict__, automount=self.automount)
-			tx_decoded = await self.rpc.call('decoderawtransaction', ret['hex'])
-			new.compare_size_and_estimated_size(tx_decoded)
+			new.compare_size_and_estimated_size(self.deserialized.vsize)
 			new.coin_txid = CoinTxID(self.deserialized.txid)
-			if new.coin_txid != tx_decoded['txid']:
-				die('BadMMGenTxID', 'txid mismatch (after signing)')
 			msg('OK')
 			return new
 		except Exception as e:
@@ -66,12 +66,7 @@ class Contract:
 
 		data = data or (self.create_method_id(method_sig) + method_args)
 
-		args = {
-			'to': '0x' + self.addr,
-			('data' if self.rpc.daemon.id == 'parity' else 'input'): '0x' + data}
-
-		if from_addr:
-			args['from'] = '0x' + from_addr
+		args = self.make_call_args(data, from_addr=from_addr)
 
 		if self.cfg.debug_evm:
 			msg('{a}:\n  {b} {c}'.format(
@@ -90,6 +85,14 @@ class Contract:
 
 		return int(ret, 16) * self.base_unit if toUnit else ret
 
+	def make_call_args(self, data, *, from_addr=None):
+		args = {
+			'to': '0x' + self.addr,
+			('data' if self.rpc.daemon.id == 'parity' else 'input'): '0x' + data}
+		if from_addr:
+			args['from'] = '0x' + from_addr
+		return args
+
 	def make_tx_in(self, *, gas, gasPrice, nonce, data):
 		assert isinstance(gas, int), f'{type(gas)}: incorrect type for ‘gas’ (must be an int)'
 		return {
@@ -141,6 +144,23 @@ class Token(Contract):
 			await self.do_call('balanceOf(address)', acct_addr.rjust(64, '0'), toUnit=True, block=block),
 			from_decimal = True)
 
+	async def get_balances(self, acct_addrs, block='latest'):
+		method_id = self.create_method_id('balanceOf(address)')
+		calls = [method_id + addr.rjust(64, '0') for addr in acct_addrs]
+		mc = Multicall(self.cfg, self.proto, self.proto.multicall_addr, rpc=self.rpc) if (
+			self.proto.multicall_addr and len(calls) > 1) else None
+		if mc and await mc.is_deployed():
+			res = await mc.aggregate([(self.addr, data) for data in calls], block=block)
+			for n, ret in enumerate(res):
+				if ret is None: # failed call: retry it separately to get the error
+					res[n] = await self.rpc.call('eth_call', self.make_call_args(calls[n]), block)
+		else:
+			res = await self.rpc.gathered_call(
+				'eth_call',
+				[(self.make_call_args(data), block) for data in calls])
+		await erigon_sleep(self)
+		return [self.proto.coin_amt(int(ret, 16) * self.base_unit, from_decimal=True) for ret in res]
+
 	async def get_name(self):
 		return self.strip(bytes.fromhex((await self.do_call('name()'))[2:]))
 
@@ -221,3 +241,79 @@ class THORChainRouterContract(Token):
 			+ '{:064x}'.format(expiry)                      # 32 bytes
 			+ '{:064x}'.format(len(memo))                   # dynamic arg
 			+ memo.hex().ljust(64 * memo_chunks, '0'))
+
+class Multicall(Contract):
+	"""
+	Multicall3 aggregator contract (https://github.com/mds1/multicall), used to
+	perform multiple read-only contract calls with a single eth_call.  The
+	contract address is set per network by the protocol’s ‘multicall_addr’
+	attribute, which is empty (disabling Multicall) unless set in mmgen.cfg.
+	"""
+	chunk_size = 500 # calls per aggregate call, keeping gas usage well below the node’s RPC gas cap
+	deployed = {}    # results of code checks, keyed by network and contract address
+
+	async def is_deployed(self):
+		key = (self.proto.network, self.addr)
+		if key not in self.deployed:
+			self.deployed[key] = bool(await self.code())
+			if not self.deployed[key]:
+				self.cfg._util.vmsg(f'Multicall contract not found at address {self.addr}, using single calls')
+		return self.deployed[key]
+
+	def create_aggregate3_data(self, calls):
+		"""
+		ABI-encode aggregate3((address target, bool allowFailure, bytes callData)[]).
+		‘calls’ is a list of (target, calldata) pairs, calldata in hex.  Failure is
+		allowed for all calls.
+		"""
+		def encode_call(target, data):
+			nchunks = len(data) // 64 + bool(len(data) % 64)
+			return (
+				target.rjust(64, '0')                       # target
+				+ '{:064x}'.format(1)                       # allowFailure
+				+ '{:064x}'.format(32 * 3)                  # callData offset
+				+ '{:064x}'.format(len(data) // 2)          # callData length
+				+ data.ljust(64 * nchunks, '0'))            # callData
+		encoded = [encode_call(*c) for c in calls]
+		offsets, pos = [], 32 * len(encoded)
+		for e in encoded:
+			offsets.append(pos)
+			pos += len(e) // 2
+		return (
+			self.create_method_id('aggregate3((address,bool,bytes)[])')
+			+ '{:064x}'.format(32)                          # array offset
+			+ '{:064x}'.format(len(calls))                  # array length
+			+ ''.join(f'{n:064x}' for n in offsets)
+			+ ''.join(encoded))
+
+	@staticmethod
+	def parse_aggregate3_result(ret):
+		"""
+		Decode the (bool success, bytes returnData)[] returned by aggregate3(),
+		returning the return data of each call as a hex string with ‘0x’ prefix,
+		or None if the call failed
+		"""
+		data = bytes.fromhex(ret.removeprefix('0x'))
+		def word(pos):
+			return int.from_bytes(data[pos:pos+32], 'big')
+		arr = word(0)
+		def gen():
+			for n in range(word(arr)):
+				item = arr + 32 + word(arr + 32 + 32 * n)
+				if word(item):
+					rd = item + word(item + 32)
+					yield '0x' + data[rd + 32:rd + 32 + word(rd)].hex()
+				else:
+					yield None
+		return list(gen())
+
+	async def aggregate(self, calls, block='latest'):
+		"""
+		Perform the read-only ‘calls’ (a list of (target, calldata) pairs) via the
+		aggregator, returning their results in a list
+		"""
+		chunks = [calls[i:i+self.chunk_size] for i in range(0, len(calls), self.chunk_size)]
+		res = await self.rpc.gathered_call(
+			'eth_call',
+			[(self.make_call_args(self.create_aggregate3_data(chunk)), block) for chunk in chunks])
+		return [r for ret in res for r in self.parse_aggregate3_result(ret)]
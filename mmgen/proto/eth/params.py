@@ -64,7 +64,11 @@ class mainnet(CoinProtocol.DummyWIF, CoinProtocol.Secp256k1):
 		'max_tx_fee')
 
 	proto_cfg_opts = (
-		'chain_names')
+		'chain_names',
+		'multicall_addr')
+
+	# Multicall3 aggregator contract (opt-in via the eth_mainnet_multicall_addr cfg file option):
+	multicall_addr = ''
 
 	@property
 	def dcoin(self):
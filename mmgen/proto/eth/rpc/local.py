@@ -34,6 +34,8 @@ class CallSigs:
 
 class EthereumRPCClient(RPCClient, metaclass=AsyncInit):
 
+	has_batch = True
+
 	async def __init__(
 			self,
 			cfg,
@@ -36,7 +36,8 @@ class EthereumTwGetBalance(TwGetBalance):
 	async def create_data(self):
 		in_data = self.twctl.mmid_ordered_dict
 		block = self.twctl.rpc.get_block_from_minconf(self.minconf)
-		for d in in_data:
+		amts = await self.twctl.get_balances([d['addr'] for d in in_data.values()], block=block)
+		for d, amt in zip(in_data, amts, strict=True):
 			if d.type == 'mmgen':
 				label = d.obj.sid
 				if label not in self.data:
@@ -44,8 +45,6 @@ class EthereumTwGetBalance(TwGetBalance):
 			else:
 				label = 'Non-MMGen'
 
-			amt = await self.twctl.get_balance(in_data[d]['addr'], block=block)
-
 			self.data['TOTAL']['ge_minconf'] += amt
 			self.data[label]['ge_minconf'] += amt
 
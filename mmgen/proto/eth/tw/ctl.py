@@ -84,6 +84,10 @@ class EthereumTwCtl(TwCtlWithStore):
 			int(await self.rpc.call('eth_getBalance', '0x' + addr, block), 16),
 			from_unit = 'wei')
 
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return [self.proto.coin_amt(int(res, 16), from_unit='wei')
+			for res in await self.rpc.gathered_call('eth_getBalance', [('0x' + addr, block) for addr in addrs])]
+
 	async def addr2sym(self, req_addr):
 		for addr in self.data['tokens']:
 			if addr == req_addr:
@@ -150,6 +154,10 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 	def data_root_desc(self):
 		return 'token ' + self.get_param('symbol')
 
+	@property
+	def data_root_path(self):
+		return ('tokens', self.token)
+
 	async def rpc_get_balance(self, addr, block='latest'):
 		return await Token(
 			self.cfg,
@@ -158,6 +166,14 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 			decimals = self.decimals,
 			rpc = self.rpc).get_balance(addr, block=block)
 
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return await Token(
+			self.cfg,
+			self.proto,
+			self.token,
+			decimals = self.decimals,
+			rpc = self.rpc).get_balances(addrs, block=block)
+
 	async def get_eth_balance(self, addr, *, force_rpc=False, block='latest'):
 		cache = self.cur_eth_balances
 		r = self.data['accounts']
@@ -167,6 +183,15 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 			self.cache_balance(addr, ret, session_cache=cache, data_root=r)
 		return ret
 
+	async def get_eth_balances(self, addrs, *, force_rpc=False, block='latest'):
+		return await self.get_balances_common(
+			addrs,
+			session_cache    = self.cur_eth_balances,
+			data_root        = self.data['accounts'],
+			rpc_get_balances = super().rpc_get_balances,
+			force_rpc        = force_rpc,
+			block            = block)
+
 	def get_param(self, param):
 		return self.data['tokens'][self.token]['params'][param]
 
@@ -182,3 +207,5 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 			'params': {
 				'symbol': await t.get_symbol(),
 				'decimals': await t.get_decimals()}}
+		self.generation += 1
+		self.record_change('token', ('tokens', tokenaddr), self.data['tokens'][tokenaddr])
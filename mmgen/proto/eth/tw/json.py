@@ -102,7 +102,7 @@ class EthereumTwJSON(TwJSON):
 				'network': self.network.upper(),
 				'accounts': dict(gen_data(self.entries['accounts'])),
 				'tokens': {k: dict(gen_data(v)) for k, v in self.entries['tokens'].items()}}
-			self.twctl.write(quiet=False)
+			self.twctl.write(quiet=False, compact=True)
 
 	class Export(TwJSON.Export, Base):
 
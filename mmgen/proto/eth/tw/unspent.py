@@ -36,5 +36,5 @@ class EthereumTokenTwUnspentOutputs(EthereumTwUnspentOutputs):
 
 	async def get_data(self):
 		await super().get_data()
-		for e in self.data:
-			e.amt2 = await self.twctl.get_eth_balance(e.addr)
+		for e, amt in zip(self.data, await self.twctl.get_eth_balances([e.addr for e in self.data]), strict=True):
+			e.amt2 = amt
@@ -28,14 +28,26 @@ class backend:
 
 		def __init__(self, cfg):
 			super().__init__(cfg)
-			from .secp256k1 import pubkey_gen
-			self.pubkey_gen = pubkey_gen
+			from . import secp256k1
+			self.pubkey_gen = secp256k1.pubkey_gen
+			# absent in extension modules built from older sources:
+			self.pubkey_gen_batch = getattr(secp256k1, 'pubkey_gen_batch', None)
 
 		def to_pubkey(self, privkey):
 			return PubKey(
 				s = self.pubkey_gen(privkey, int(privkey.compressed)),
 				compressed = privkey.compressed)
 
+		def to_pubkey_batch(self, privkeys):
+			if not (privkeys and self.pubkey_gen_batch):
+				return super().to_pubkey_batch(privkeys)
+			compressed = privkeys[0].compressed
+			assert all(privkey.compressed == compressed for privkey in privkeys), (
+				'to_pubkey_batch(): compressed and uncompressed keys may not be mixed')
+			pklen = 33 if compressed else 65
+			res = self.pubkey_gen_batch(b''.join(privkeys), int(compressed))
+			return [PubKey(s=res[i:i+pklen], compressed=compressed) for i in range(0, len(res), pklen)]
+
 		@classmethod
 		def get_clsname(cls, cfg, *, silent=False):
 			try:
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+proto.xmr.common: Shared Monero functions and constants
+"""
+
+# Monero base58 encodes data in blocks of 8 bytes (11 digits), with a shorter final
+# block.  Each block is converted as a single integer, using a table of digit pairs
+# to halve the number of divisions.
+
+b58a = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+b58_pairs = [a + b for a in b58a for b in b58a]
+b58_idx = {ch: n for n, ch in enumerate(b58a)}
+
+enc_block_lens = (0, 2, 3, 5, 6, 7, 9, 10, 11) # indexed by decoded block length
+dec_block_lens = {v: k for k, v in enumerate(enc_block_lens)}
+
+def b58enc_block(block):
+	n = int.from_bytes(block, 'big')
+	width = enc_block_lens[len(block)]
+	out = []
+	for _ in range(width // 2):
+		n, r = divmod(n, 3364)
+		out.append(b58_pairs[r])
+	if width % 2:
+		out.append(b58a[n % 58])
+	return ''.join(reversed(out))
+
+def b58dec_block(s):
+	if len(s) not in dec_block_lens:
+		raise ValueError(f'{len(s)}: invalid Monero base58 block length')
+	n = 0
+	for ch in s:
+		n = n * 58 + b58_idx[ch]
+	return n.to_bytes(dec_block_lens[len(s)], 'big') # raises OverflowError if too large
+
+def b58enc(in_bytes):
+	return ''.join(b58enc_block(in_bytes[i:i+8]) for i in range(0, len(in_bytes), 8))
+
+def b58dec(s):
+	try:
+		return b''.join(b58dec_block(s[i:i+11]) for i in range(0, len(s), 11))
+	except KeyError as e:
+		raise ValueError(f'{e.args[0]!r}: invalid character in Monero base58 string') from None
+	except OverflowError:
+		raise ValueError('Monero base58 block value out of range') from None
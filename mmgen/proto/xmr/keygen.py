@@ -12,8 +12,8 @@
 proto.xmr.keygen: Monero public key generation backends for the MMGen suite
 """
 
-from ...key import PubKey
-from ...keygen import keygen_base
+from ...key import PubKey, PrivKey
+from ...keygen import keygen_base, keygen_public_data
 
 class backend:
 
@@ -32,6 +32,19 @@ class backend:
 				self.keccak_256(privkey).digest(),
 				None)
 
+		def gen_data(self, privkey):
+			# the viewkey is part of the pubkey, so compute it only once:
+			assert isinstance(privkey, PrivKey)
+			viewkey = self.to_viewkey(privkey)
+			return keygen_public_data(
+				self.to_pubkey(privkey, viewkey=viewkey),
+				viewkey,
+				privkey.pubkey_type,
+				privkey.compressed)
+
+		def gen_data_batch(self, privkeys):
+			return [self.gen_data(privkey) for privkey in privkeys]
+
 	class nacl(base):
 
 		production_safe = True
@@ -41,10 +54,10 @@ class backend:
 			from nacl.bindings import crypto_scalarmult_ed25519_base_noclamp
 			self.scalarmultbase = crypto_scalarmult_ed25519_base_noclamp
 
-		def to_pubkey(self, privkey):
+		def to_pubkey(self, privkey, *, viewkey=None):
 			return PubKey(
 				self.scalarmultbase(privkey) +
-				self.scalarmultbase(self.to_viewkey(privkey)),
+				self.scalarmultbase(viewkey or self.to_viewkey(privkey)),
 				compressed = privkey.compressed
 			)
 
@@ -79,10 +92,10 @@ class backend:
 		def rev_bytes2int(in_bytes):
 			return int.from_bytes(in_bytes[::-1], 'big')
 
-		def to_pubkey(self, privkey):
+		def to_pubkey(self, privkey, *, viewkey=None):
 			return PubKey(
 				self.encodepoint(self.scalarmultbase(self.rev_bytes2int(privkey))) +
-				self.encodepoint(self.scalarmultbase(self.rev_bytes2int(self.to_viewkey(privkey)))),
+				self.encodepoint(self.scalarmultbase(self.rev_bytes2int(viewkey or self.to_viewkey(privkey)))),
 				compressed = privkey.compressed
 			)
 
@@ -59,15 +59,7 @@ class mainnet(CoinProtocol.RPC, CoinProtocol.DummyWIF, CoinProtocol.Base):
 
 	def decode_addr(self, addr):
 
-		from ...baseconv import baseconv
-
-		def b58dec(addr_str):
-			bc = baseconv('b58')
-			l = len(addr_str)
-			a = b''.join([bc.tobytes(addr_str[i*11:i*11+11], pad=8) for i in range(l//11)])
-			b = bc.tobytes(addr_str[-(l%11):], pad=5)
-			return a + b
-
+		from .common import b58dec
 		ret = b58dec(addr)
 
 		chk = self.keccak_256(ret[:-4]).digest()[:4]
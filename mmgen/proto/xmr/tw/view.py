@@ -173,8 +173,8 @@ class MoneroTwView:
 				'amt': self.amt_widths['amt'],
 				'spc': len(self.display_type.squeezed.cols)},
 			maxws = { # expandable cols
-				'addr': max(len(d.addr) for d in data),
-				'comment': max(d.comment.screen_width for d in data)},
+				'addr': self.col_max('addr', data, lambda d: len(d.addr)),
+				'comment': self.col_max('comment', data, lambda d: d.comment.screen_width)},
 			minws = {
 				'addr': 16,
 				'comment': len('Comment')},
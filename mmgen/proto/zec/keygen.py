@@ -15,6 +15,22 @@ proto.zec.keygen: Zcash-Z public key generation backend for the MMGen suite
 from ...key import PubKey
 from ...keygen import keygen_base
 
+def get_sha256_compress_func():
+	"""
+	return the SHA-256 compression function from the secp256k1 extension module, or
+	the pure-Python implementation if the former is unavailable
+	"""
+	try:
+		from ..secp256k1.secp256k1 import sha256_compress
+	except ImportError:
+		return sha256_compress_python
+	else:
+		return sha256_compress
+
+def sha256_compress_python(data):
+	from ...sha2 import Sha256
+	return Sha256(data, preprocess=False).digest()
+
 class backend:
 
 	class nacl(keygen_base):
@@ -25,14 +41,13 @@ class backend:
 			super().__init__(cfg)
 			from nacl.bindings import crypto_scalarmult_base
 			self.crypto_scalarmult_base = crypto_scalarmult_base
-			from ...sha2 import Sha256
-			self.Sha256 = Sha256
+			self.sha256_compress = get_sha256_compress_func()
 
 		def zhash256(self, s, t):
 			s = bytearray(s + bytes(32))
 			s[0] |= 0xc0
 			s[32] = t
-			return self.Sha256(s, preprocess=False).digest()
+			return self.sha256_compress(bytes(s))
 
 		def to_pubkey(self, privkey):
 			return PubKey(
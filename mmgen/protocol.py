@@ -221,10 +221,13 @@ class CoinProtocol(MMGenObject):
 		@classmethod
 		def get_opt_clsval(cls, cfg, opt):
 			coin, *rem = opt.split('_', 2)
-			network = rem[0] if rem[0] in init_proto(cfg, coin, return_cls=True).network_names else None
+			network_names = init_proto(cfg, coin, return_cls=True).network_names
+			network = rem[0] if rem[0] in network_names else None
 			opt_name = '_'.join(rem[bool(network):])
 			if ((network is None and opt_name in cls.coin_cfg_opts) or
 				(network and opt_name in cls.proto_cfg_opts)):
+				# network names may differ from network keys, e.g. ‘devnet’ for ETH regtest:
+				network = network and network_names._fields[network_names.index(network)]
 				# raises AttributeError on failure:
 				return getattr(init_proto(cfg, coin, network=network, return_cls=True), opt_name)
 			else:
@@ -235,7 +238,7 @@ class CoinProtocol(MMGenObject):
 				if opt.startswith(self.coin.lower() + '_'):
 					res = opt.split('_', 2)[1:]
 					network = res[0] if res[0] in self.network_names else None
-					if network is None or network == self.network:
+					if network is None or network == getattr(self.network_names, self.network):
 						setattr(self, '_'.join(res[bool(network):]), getattr(self.cfg, opt))
 
 	class Secp256k1(RPC, Base):
@@ -45,7 +45,7 @@ class curl(base):
 		if len(data) > self.arg_max:
 			from .httplib import httplib
 			ymsg('Warning: Curl data payload length exceeded - falling back on httplib')
-			return httplib(self.caller).run(payload, timeout, host_path)
+			return httplib(self.caller).run_noasync(payload, timeout, host_path)
 		dmsg_rpc_backend(self.host_url, host_path, payload)
 		exec_cmd = [
 			'curl',
@@ -25,40 +25,76 @@ class httplib(base):
 	Ignores *_PROXY environment vars
 	"""
 	def __del__(self):
-		self.session.close()
+		if session := getattr(self, 'session', None):
+			session.close()
 
 	def __init__(self, caller):
 		super().__init__(caller)
-		import http.client
-		self.session = http.client.HTTPConnection(caller.host, caller.port, caller.timeout)
+		self.session = self.make_connection()
 		if caller.auth_type == 'basic':
 			auth_str = f'{caller.auth.user}:{caller.auth.passwd}'
 			auth_str_b64 = 'Basic ' + base64.b64encode(auth_str.encode()).decode()
 			self.http_hdrs.update({'Host': self.host, 'Authorization': auth_str_b64})
 			dmsg_rpc(f'    RPC AUTHORIZATION data ==> raw: [{auth_str}]\n{"":>31}enc: [{auth_str_b64}]\n')
 
-	async def run(self, payload, timeout, host_path):
-		dmsg_rpc_backend(self.host_url, host_path, payload)
+	def make_connection(self, timeout=None):
+		import http.client
+		return http.client.HTTPConnection(self.host, self.port, timeout or self.timeout)
 
-		if timeout:
-			import http.client
-			s = http.client.HTTPConnection(self.host, self.port, timeout)
-		else:
-			s = self.session
+	@staticmethod
+	def connection_dropped(s):
+		"""
+		Return True if the server has closed kept-alive connection ‘s’.  An idle
+		connection is readable only if it has been closed (or has unexpected data).
+		"""
+		if s.sock is None:
+			return False
+		import select
+		try:
+			return bool(select.select([s.sock], [], [], 0)[0])
+		except (OSError, ValueError):
+			return True
+
+	def send(self, s, payload, host_path):
+		data = json.dumps(payload, cls=json_encoder)
+		if self.connection_dropped(s):
+			s.close() # reconnect
+		# retry once if sending on a kept-alive connection fails.  Once the request
+		# has been sent it’s never retried, as the call may not be idempotent:
+		for retry in (s.sock is not None, False):
+			try:
+				s.request(
+					method  = 'POST',
+					url     = host_path,
+					body    = data,
+					headers = self.http_hdrs)
+				break
+			except ConnectionError as e:
+				s.close()
+				if not retry:
+					die('RPCFailure', str(e))
+			except Exception as e:
+				s.close()
+				die('RPCFailure', str(e))
 
 		try:
-			s.request(
-				method  = 'POST',
-				url     = host_path,
-				body    = json.dumps(payload, cls=json_encoder),
-				headers = self.http_hdrs)
 			r = s.getresponse() # => http.client.HTTPResponse instance
+			return (r.read(), r.status)
 		except Exception as e:
+			s.close()
 			die('RPCFailure', str(e))
 
+	async def run(self, *args, **kwargs):
+		return self.run_noasync(*args, **kwargs)
+
+	def run_noasync(self, payload, timeout, host_path):
+		dmsg_rpc_backend(self.host_url, host_path, payload)
+
 		if timeout:
-			ret = (r.read(), r.status)
-			s.close()
-			return ret
+			s = self.make_connection(timeout)
+			try:
+				return self.send(s, payload, host_path)
+			finally:
+				s.close()
 		else:
-			return (r.read(), r.status)
+			return self.send(self.session, payload, host_path)
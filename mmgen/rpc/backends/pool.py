@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+rpc.backends.pool: connection pool RPC backend for the MMGen Project
+"""
+
+import asyncio
+from queue import LifoQueue
+from concurrent.futures import ThreadPoolExecutor
+
+from ..util import dmsg_rpc_backend
+
+from .httplib import httplib
+
+class pool(httplib):
+	"""
+	Pool of persistent (keep-alive) httplib connections to the daemon, each
+	used by one request at a time in a worker thread.  Provides concurrency
+	for RPCClient.gathered_call() without aiohttp.  The pool size is set by
+	the ‘rpc_pool_size’ configuration option.
+
+	Ignores *_PROXY environment vars
+	"""
+	def __del__(self):
+		if executor := getattr(self, 'executor', None):
+			executor.shutdown(wait=False)
+		if idle := getattr(self, 'idle', None):
+			while not idle.empty():
+				idle.get().close()
+
+	def __init__(self, caller):
+		super().__init__(caller)
+		self.pool_size = max(1, self.cfg.rpc_pool_size)
+		self.idle = LifoQueue() # most recently used connections are most likely still open
+		self.idle.put(self.session)
+		for _ in range(self.pool_size - 1):
+			self.idle.put(self.make_connection())
+		self.executor = ThreadPoolExecutor(
+			max_workers = self.pool_size,
+			thread_name_prefix = 'mmgen-rpc')
+
+	async def run(self, payload, timeout, host_path):
+		return await asyncio.get_running_loop().run_in_executor(
+			self.executor,
+			self.run_noasync,
+			payload,
+			timeout,
+			host_path)
+
+	def run_noasync(self, payload, timeout, host_path):
+
+		if timeout:
+			return super().run_noasync(payload, timeout, host_path)
+
+		dmsg_rpc_backend(self.host_url, host_path, payload)
+
+		s = self.idle.get() # each worker thread holds at most one connection
+		try:
+			return self.send(s, payload, host_path)
+		finally:
+			self.idle.put(s)
@@ -19,9 +19,13 @@ from ..util import msg, die, fmt, oneshot_warning, isAsync
 
 from . import util
 
+def float_parser(n):
+	return n
+
 class RPCClient:
 
 	is_remote = False
+	has_batch = False # daemon supports JSON-RPC batch requests
 	auth_type = None
 	has_auth_cookie = False
 	network_proto = 'http'
@@ -107,23 +111,57 @@ class RPCClient:
 		Can be called two ways:
 		  1) method = methodname, args_list = [args_tuple1, args_tuple2,...]
 		  2) method = None, args_list = [(methodname1, args_tuple1), (methodname2, args_tuple2), ...]
+		If supported by the daemon, calls are sent in JSON-RPC batch requests of up
+		to ‘rpc_batch_size’ calls each
 		"""
 		cmd_list = args_list if method is None else tuple(zip([method] * len(args_list), args_list))
+		host_path = self.make_host_path(wallet)
+
+		def make_payload(pos, method, params):
+			return {'id': pos + 1, 'jsonrpc': '2.0', 'method': method, 'params': params}
+
+		batch_size = self.cfg.rpc_batch_size if self.has_batch else 0
+
+		if batch_size > 1 and len(cmd_list) > 1:
+			batches = [range(i, min(i + batch_size, len(cmd_list))) for i in range(0, len(cmd_list), batch_size)]
+			resps = await self.gather_requests(
+				[[make_payload(n, *cmd_list[n]) for n in b] for b in batches],
+				timeout   = timeout,
+				host_path = host_path)
+			ret = []
+			for b, resp in zip(batches, resps):
+				if (res := self.process_batch_resp(resp, [(n, cmd_list[n][0]) for n in b])) is None:
+					self.has_batch = False # batch request rejected or mishandled by daemon, so use single calls
+					res = [self.process_http_resp(r) for r in await self.gather_requests(
+						[make_payload(n, *cmd_list[n]) for n in b],
+						timeout   = timeout,
+						host_path = host_path)]
+				ret.extend(res)
+			return ret
+		else:
+			return [self.process_http_resp(r) for r in await self.gather_requests(
+				[make_payload(n, *cmd) for n, cmd in enumerate(cmd_list)],
+				timeout   = timeout,
+				host_path = host_path)]
 
+	async def gather_requests(self, payloads, *, timeout, host_path):
+		"""
+		Send HTTP requests concurrently, returning the raw responses in a list
+		"""
 		cur_pos = 0
 		chunk_size = 1024
 		ret = []
 
-		while cur_pos < len(cmd_list):
+		while cur_pos < len(payloads):
 			tasks = [self.backend.run(
-						payload = {'id': n, 'jsonrpc': '2.0', 'method': method, 'params': params},
+						payload = payload,
 						timeout = timeout,
-						host_path = self.make_host_path(wallet)
-					) for n, (method, params)  in enumerate(cmd_list[cur_pos:chunk_size+cur_pos], 1)]
+						host_path = host_path
+					) for payload in payloads[cur_pos:chunk_size+cur_pos]]
 			ret.extend(await asyncio.gather(*tasks))
 			cur_pos += chunk_size
 
-		return [self.process_http_resp(r) for r in ret]
+		return ret
 
 	# Icall family of methods - indirect RPC call using CallSigs mechanism:
 	# - 'timeout' and 'wallet' kwargs are passed to corresponding Call method
@@ -145,41 +183,68 @@ class RPCClient:
 			timeout = timeout,
 			wallet = wallet)
 
-	def process_http_resp(self, run_ret, *, batch=False, json_rpc=True):
+	def process_batch_resp(self, run_ret, calls):
+		"""
+		Map the responses to a batch request back to their calls, which are given as
+		(position, method) pairs.  Return None if the batch request was rejected or
+		responses are missing.  Each response is processed as the response to a
+		single call.
+		"""
+		text, status = run_ret
+
+		if status != 200:
+			return None
+
+		util.dmsg_rpc('    RPC RESPONSE data ==>\n{}\n', text, is_json=True)
+
+		resps = json.loads(text, parse_float=float_parser)
+
+		if not isinstance(resps, list):
+			return None
 
-		def float_parser(n):
-			return n
+		resps = {r.get('id'): r for r in resps if isinstance(r, dict)}
+
+		if any(pos + 1 not in resps for pos, _ in calls):
+			return None
+
+		# an error response to a single call has no ‘result’ member (JSON-RPC 2.0):
+		return [self.process_resp(r if r.get('error') is None else {'error': r['error']})
+			for r in (resps[pos + 1] for pos, _ in calls)]
+
+	def process_resp(self, data, *, json_rpc=True):
+		m = None
+		try:
+			if json_rpc:
+				ret = data['result']
+				if isinstance(ret, list) and ret and type(ret[0]) == dict and 'success' in ret[0]:
+					for res in ret:
+						if not res['success']:
+							m = str(res['error'])
+							assert False
+				return ret
+			else:
+				return data
+		except:
+			if not m:
+				try:
+					m = data['error']['message']
+				except:
+					try:
+						m = data['error']
+					except:
+						m = data
+			die('RPCFailure', m)
+
+	def process_http_resp(self, run_ret, *, batch=False, json_rpc=True):
 
 		text, status = run_ret
 
 		if status == 200:
 			util.dmsg_rpc('    RPC RESPONSE data ==>\n{}\n', text, is_json=True)
-			m = None
 			if batch:
 				return [r['result'] for r in json.loads(text, parse_float=float_parser)]
 			else:
-				try:
-					if json_rpc:
-						ret = json.loads(text, parse_float=float_parser)['result']
-						if isinstance(ret, list) and ret and type(ret[0]) == dict and 'success' in ret[0]:
-							for res in ret:
-								if not res['success']:
-									m = str(res['error'])
-									assert False
-						return ret
-					else:
-						return json.loads(text, parse_float=float_parser)
-				except:
-					if not m:
-						t = json.loads(text)
-						try:
-							m = t['error']['message']
-						except:
-							try:
-								m = t['error']
-							except:
-								m = t
-					die('RPCFailure', m)
+				return self.process_resp(json.loads(text, parse_float=float_parser), json_rpc=json_rpc)
 		else:
 			import http
 			m, s = ('', http.HTTPStatus(status))
@@ -23,9 +23,7 @@ tool.fileutil: File routines for the 'mmgen-tool' utility
 import os
 
 from .common import tool_cmd_base
-from ..cfg import gc
 from ..util import msg, msg_r, die, suf, make_full_path
-from ..crypto import Crypto
 
 class tool_cmd(tool_cmd_base):
 	"file utilities"
@@ -34,40 +32,20 @@ class tool_cmd(tool_cmd_base):
 			filename: str,
 			incog_id: str,
 			*,
-			keep_searching: 'continue search after finding data (ID collisions can yield false positives)' = False):
+			keep_searching: 'continue search after finding data (ID collisions can yield false positives)' = False,
+			jobs: 'number of worker processes (0 = number of CPUs)' = 0):
 		"Use an Incog ID to find hidden incognito wallet data"
 
-		from hashlib import sha256
-		from itertools import count
+		if len(incog_id) != 8 or incog_id.strip('0123456789ABCDEF'):
+			die(2, f'{incog_id!r}: invalid Incog ID')
 
-		ivsize, bsize, mod = (Crypto.aesctr_iv_len, 4096, 4096*8)
-		carry = b' ' * ivsize
-		flgs = os.O_RDONLY|os.O_BINARY if gc.platform == 'win32' else os.O_RDONLY
-		f = os.open(filename, flgs)
-
-		for ch in incog_id:
-			if ch not in '0123456789ABCDEF':
-				die(2, f'{incog_id!r}: invalid Incog ID')
-
-		for n in count(step=bsize):
-			d = os.read(f, bsize)
-			if not d:
+		from ..incogscan import IncogScanner
+		for offset in IncogScanner(filename, incog_id, jobs=jobs).run():
+			msg(f'\rIncog data for ID {incog_id} found at offset {offset}')
+			if not keep_searching:
 				break
-			d = carry + d
-			for i in range(bsize):
-				if sha256(d[i:i+ivsize]).hexdigest()[:8].upper() == incog_id:
-					if n+i < ivsize:
-						continue
-					msg(f'\rIncog data for ID {incog_id} found at offset {n+i-ivsize}')
-					if not keep_searching:
-						import sys
-						sys.exit(0)
-			carry = d[len(d)-ivsize:]
-			if not n % mod:
-				msg_r(f'\rSearched: {n} bytes')
 
 		msg('')
-		os.close(f)
 		return True
 
 	def rand2file(self, outfile: str, nbytes: str, *, silent=False):
@@ -107,12 +107,14 @@ class tool_cmd(tool_cmd_base):
 			sinceblock:  'display transactions starting from this block' = 0,
 			sort:        'transaction sort order ' + options_annot_str(TwTxHistory.sort_funcs) = 'age',
 			age_fmt:     'format for the Age/Date column ' + options_annot_str(TwView.age_fmts) = 'confs',
-			interactive: 'enable interactive operation' = False):
+			interactive: 'enable interactive operation' = False,
+			use_cache:   'use on-disk cache of transaction data (0 to bypass)' = True):
 		"view transaction history of tracking wallet"
 
 		obj = await TwTxHistory(self.cfg, self.proto, sinceblock=sinceblock)
 		return await self.twops(
-			obj, pager, reverse, detail, sort, age_fmt, interactive)
+			obj, pager, reverse, detail, sort, age_fmt, interactive,
+			use_cache = use_cache)
 
 	async def listaddress(self,
 			mmgen_addr: str,
@@ -201,8 +203,11 @@ class tool_cmd(tool_cmd_base):
 		NOTE:
 
 		  The rescanning process typically takes several hours and may be interrupted
-		  using Ctrl-C.  An interrupted rescan may be resumed using the ‘start_block’
-		  parameter.
+		  using Ctrl-C.  An interrupted rescan is resumed from the last completed chunk
+		  of blocks when the command is repeated with the same parameters.
+
+		  Use the ‘--rescan-plan’ option to display the planned block ranges and the
+		  estimated time of the rescan.
 		"""
 		from ..tw.ctl import TwCtl
 		await (await TwCtl(self.cfg, self.proto, mode='w')).rescan_blockchain(start_block, stop_block)
@@ -137,8 +137,10 @@ class TwAddresses(TwView):
 		minconf = int(self.minconf)
 		block = self.twctl.rpc.get_block_from_minconf(minconf)
 
-		for e in await self.twctl.get_label_addr_pairs():
-			bal = await self.twctl.get_balance(e.coinaddr, block=block)
+		pairs = await self.twctl.get_label_addr_pairs()
+		bals = await self.twctl.get_balances([e.coinaddr for e in pairs], block=block)
+
+		for e, bal in zip(pairs, bals, strict=True):
 			addrs[e.label.mmid] = {
 				'addr':    e.coinaddr,
 				'amt':     bal,
@@ -191,7 +193,7 @@ class TwAddresses(TwView):
 		return self.column_widths_data(
 			widths = { # fixed cols
 				'num':       max(2, len(str(len(data)))+1),
-				'mmid':      max(len(d.twmmid.disp) for d in data),
+				'mmid':      self.col_max('mmid', data, lambda d: len(d.twmmid.disp)),
 				'used':      self.used_w,
 				'amt':       self.amt_widths['amt'],
 				'date':      self.age_w if self.has_age else 0,
@@ -199,8 +201,8 @@ class TwAddresses(TwView):
 				'date_time': self.age_col_params['date_time'][0] if wide and self.has_age else 0,
 				'spc':       self.spc_w},
 			maxws = { # expandable cols
-				'addr':    max(len(d.addr) for d in data) if self.showcoinaddrs else 0,
-				'comment': max(d.comment.screen_width for d in data)},
+				'addr':    self.col_max('addr', data, lambda d: len(d.addr)) if self.showcoinaddrs else 0,
+				'comment': self.col_max('comment', data, lambda d: d.comment.screen_width)},
 			minws = {
 				'addr':    12 if self.showcoinaddrs else 0,
 				'comment': len('Comment')},
@@ -261,17 +263,9 @@ class TwAddresses(TwView):
 
 	async def set_dates(self, addrs):
 		if not self.dates_set:
-			bc = self.rpc.blockcount + 1
 			caddrs = [addr for addr in addrs if addr.confs]
-			hashes = await self.rpc.gathered_call(
-				'getblockhash',
-				[(n,) for n in [bc - a.confs for a in caddrs]])
-			dates = [d['time']
-				for d in await self.rpc.gathered_call(
-					'getblockheader',
-					[(h,) for h in hashes])]
-			for idx, addr in enumerate(caddrs):
-				addr.date = dates[idx]
+			for addr, date in zip(caddrs, await self.get_block_times([a.confs for a in caddrs]), strict=True):
+				addr.date = date
 			self.dates_set = True
 
 	sort_disp = {
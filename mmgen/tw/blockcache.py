@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+tw.blockcache: Persistent block height index for the MMGen suite
+"""
+
+import os, json
+
+from ..util import ymsg
+
+class TwBlockCache:
+	"""
+	Index of block height -> (block hash, block time), stored in a JSON file
+	in the data directory and filled on demand.
+
+	Only blocks more than ‘reorg_horizon’ blocks below the chain tip are
+	stored.  When uncached blocks are fetched, the hash of the highest cached
+	block is checked in the same batch of calls, and the cache is discarded if
+	the block is no longer in the chain or is above the chain tip.  Regtest chains are disposable, so
+	their index is not saved.
+	"""
+	file_ext = 'json'
+	reorg_horizon = 100
+
+	def __init__(self, cfg, proto, rpc):
+		self.cfg = cfg
+		self.proto = proto
+		self.rpc = rpc
+		self.persistent = proto.network != 'regtest'
+		self.fn = os.path.join(cfg.data_dir, 'blockcache', f'{proto.coin.lower()}.{self.file_ext}')
+		self.data = {}
+		self.recent = {} # blocks above the reorg horizon, not saved
+		self.loaded = False
+		self.modified = False
+
+	def load(self):
+		self.loaded = True
+		if not self.persistent:
+			return
+		try:
+			with open(self.fn) as fh:
+				data = json.load(fh)
+			assert data['coin'] == self.proto.coin and data['network'] == self.proto.network
+		except FileNotFoundError:
+			return
+		except Exception as e:
+			ymsg(f'Warning: invalid block cache file ‘{self.fn}’ ({e!s}), ignoring')
+			return
+		self.data = {height: (block_hash, time) for height, block_hash, time in data['blocks']}
+		self.cfg._util.dmsg(f'Loaded {len(self.data)} cached blocks from ‘{self.fn}’')
+
+	async def fetch(self, heights):
+		"""
+		Fetch and cache the hashes and times of blocks at ‘heights’, discarding the
+		existing data if the highest cached block has been reorganized or is above
+		the chain tip (e.g. after a resync or a change of data directory)
+		"""
+		check = max(self.data, default=None)
+		if check is not None and check > self.rpc.blockcount:
+			self.cfg._util.dmsg(f'Block {check} above chain tip, discarding block cache')
+			self.data = {}
+			self.modified = True
+			check = None
+		hashes = await self.rpc.gathered_call(
+			'getblockhash',
+			[(h,) for h in heights + ([] if check is None else [check])])
+		if check is not None and hashes.pop() != self.data[check][0]:
+			self.cfg._util.dmsg(f'Block {check} reorganized, discarding block cache')
+			self.data = {}
+			self.modified = True
+		headers = await self.rpc.gathered_call('getblockheader', [(h,) for h in hashes])
+		horizon = self.rpc.blockcount - self.reorg_horizon
+		for height, block_hash, hdr in zip(heights, hashes, headers, strict=True):
+			if height <= horizon:
+				self.data[height] = (block_hash, hdr['time'])
+				self.modified = True
+			else:
+				self.recent[height] = (block_hash, hdr['time'])
+
+	async def get_times(self, heights):
+		"""
+		Return the times of blocks at ‘heights’.  Only uncached blocks are fetched
+		via RPC
+		"""
+		if not self.loaded:
+			self.load()
+		def get_missing():
+			return sorted(set(heights) - self.data.keys() - self.recent.keys())
+		for _ in range(2): # repeat if cache was discarded
+			if missing := get_missing():
+				await self.fetch(missing)
+		self.save()
+		return [(self.data.get(h) or self.recent[h])[1] for h in heights]
+
+	def save(self):
+		if not (self.modified and self.persistent):
+			return
+		from ..fileutil import check_or_create_dir
+		check_or_create_dir(os.path.dirname(self.fn))
+		tmp_fn = self.fn + '.tmp'
+		fd = os.open(tmp_fn, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with os.fdopen(fd, 'w') as fh:
+			json.dump({
+					'coin': self.proto.coin,
+					'network': self.proto.network,
+					'blocks': [(h, *self.data[h]) for h in sorted(self.data)]},
+				fh,
+				separators = (',', ':'))
+		os.replace(tmp_fn, self.fn)
+		self.modified = False
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+tw.journal: Append-only change journal for the tracking wallet store
+"""
+
+import os, json
+from hashlib import sha256
+
+from ..util import ymsg, die
+
+class TwJournal:
+	"""
+	Journal of changes to tracking wallet data, kept in a file alongside the
+	wallet file (the snapshot), one JSON record per line.
+
+	The first line identifies the snapshot the journal applies to.  Each
+	subsequent line holds an operation, a key path into the wallet data and,
+	for all operations except ‘remove’, a value to store at the path.
+
+	Changes are appended only if neither the snapshot nor the journal has been
+	altered by another program since they were last read or written.
+	"""
+	ops = ('import', 'remove', 'label', 'balance', 'token')
+
+	def __init__(self, cfg, snapshot_path):
+		self.cfg = cfg
+		self.snapshot_path = snapshot_path
+		self.path = snapshot_path.with_name(snapshot_path.name + '.journal')
+		self.snapshot_id = None
+		self.snapshot_stat = None
+		self.size = 0
+		self.truncate = False
+
+	def get_snapshot_stat(self):
+		st = self.snapshot_path.stat()
+		return (st.st_size, st.st_mtime_ns)
+
+	@staticmethod
+	def make_snapshot_id(snapshot_data):
+		return sha256(snapshot_data.encode()).hexdigest()[:16]
+
+	@property
+	def header(self):
+		return json.dumps({'snapshot': self.snapshot_id}) + '\n'
+
+	def replay(self, data, snapshot_data):
+		"""
+		Apply the changes in the journal, if any, to ‘data’, which was loaded from
+		‘snapshot_data’.  Return the number of changes applied
+		"""
+		self.snapshot_id = self.make_snapshot_id(snapshot_data)
+		self.snapshot_stat = self.get_snapshot_stat()
+		self.size = 0
+		try:
+			with open(self.path) as fh:
+				lines = fh.readlines()
+		except FileNotFoundError:
+			return 0
+		if not lines or json.loads(lines[0]).get('snapshot') != self.snapshot_id:
+			ymsg(f'Ignoring stale tracking wallet journal ‘{self.path}’')
+			return 0
+		count = 0
+		for lineno, line in enumerate(lines[1:], 2):
+			if not line.endswith('\n'): # partially written record
+				ymsg(f'Ignoring incomplete record at line {lineno} of ‘{self.path}’')
+				self.truncate = True
+				break
+			try:
+				op, path, *value = json.loads(line)
+				assert op in self.ops, f'{op!r}: invalid operation'
+			except Exception as e:
+				die('WalletFileError', f'Invalid record at line {lineno} of ‘{self.path}’: {e}')
+			d = data
+			for k in path[:-1]:
+				d = d[k]
+			if op == 'remove':
+				d.pop(path[-1], None)
+			else:
+				d[path[-1]] = value[0]
+			count += 1
+		self.size = sum(len(line.encode()) for line in lines[:count+1])
+		self.cfg._util.dmsg(f'Replayed {count} change{"s"[count==1:]} from ‘{self.path}’')
+		return count
+
+	def append(self, records):
+		"""
+		Append ‘records’ (op, path[, value]) to the journal, syncing the file to disk
+		"""
+		if self.get_snapshot_stat() != self.snapshot_stat:
+			die('WalletFileError', f'Tracking wallet file {str(self.snapshot_path)!r} has been altered by some other program! Aborting journal write')
+		if not self.size:
+			self.reset()
+		elif self.truncate:
+			os.truncate(self.path, self.size)
+			self.truncate = False
+		try:
+			cur_size = self.path.stat().st_size
+		except FileNotFoundError:
+			cur_size = None
+		if cur_size != self.size:
+			die('WalletFileError', f'Tracking wallet journal {str(self.path)!r} has been altered by some other program! Aborting journal write')
+		data = ''.join(json.dumps(rec, separators=(',', ':')) + '\n' for rec in records).encode()
+		fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+		try:
+			os.write(fd, data)
+			os.fsync(fd)
+		finally:
+			os.close(fd)
+		self.size += len(data)
+
+	def reset(self):
+		hdr = self.header.encode()
+		fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		try:
+			os.write(fd, hdr)
+			os.fsync(fd)
+		finally:
+			os.close(fd)
+		self.size = len(hdr)
+		self.truncate = False
+
+	def snapshot_written(self, snapshot_data):
+		"""
+		Remove the journal after its changes have been written to a new snapshot
+		"""
+		self.snapshot_id = self.make_snapshot_id(snapshot_data)
+		self.snapshot_stat = self.get_snapshot_stat()
+		try:
+			os.unlink(self.path)
+		except FileNotFoundError:
+			pass
+		self.size = 0
+		self.truncate = False
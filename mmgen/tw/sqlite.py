@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+tw.sqlite: SQLite database store for the tracking wallet
+"""
+
+import json, sqlite3
+from hashlib import sha256
+from contextlib import contextmanager
+
+from ..util import die, cached_property
+from .shared import TwMMGenID
+
+class TwSQLiteStore:
+	"""
+	Tracking wallet data stored in an SQLite database alongside the wallet file.
+
+	Each address entry is a row of the ‘addrs’ table, with its balance in a
+	column.  Entries in the main section of the wallet data have an empty
+	‘token’ column; token entries hold the token address.  Entries are indexed
+	by token and address (the primary key), by address and by token and MMGen
+	ID sort key, so sorted address lists and balance lookups are index scans.
+
+	Changes are applied in the format of the tracking wallet journal records
+	(see tw.journal), in a single transaction per call to append().  Each
+	transaction increments the generation number in the ‘state’ table, and
+	changes are applied only if the database hasn’t been altered by some other
+	program since it was last read or written.
+
+	The JSON wallet file is kept in sync with the database by the tracking
+	wallet when compacting.  The ‘state’ table records the ID of the wallet
+	file data last synced and whether the database has changed since, so a
+	wallet file altered by another program can be detected when loading.
+
+	The database is loaded into memory in its entirety, as with the JSON wallet
+	file.
+	"""
+	sections = ('tokens',)
+	chunk_size = 500 # maximum number of SQL variables per query
+
+	schema = """
+		CREATE TABLE IF NOT EXISTS state (
+			key      TEXT PRIMARY KEY,
+			value    TEXT NOT NULL);
+		CREATE TABLE IF NOT EXISTS meta (
+			key      TEXT PRIMARY KEY,
+			value    TEXT NOT NULL);
+		CREATE TABLE IF NOT EXISTS tokens (
+			token    TEXT PRIMARY KEY,
+			params   TEXT NOT NULL);
+		CREATE TABLE IF NOT EXISTS addrs (
+			token    TEXT NOT NULL,
+			addr     TEXT NOT NULL,
+			mmid     TEXT NOT NULL,
+			sort_key TEXT NOT NULL,
+			comment  TEXT NOT NULL,
+			balance  TEXT,
+			PRIMARY KEY (token, addr)) WITHOUT ROWID;
+		CREATE INDEX IF NOT EXISTS addrs_addr ON addrs (addr);
+		CREATE INDEX IF NOT EXISTS addrs_sort ON addrs (token, sort_key, addr);
+	"""
+
+	def __init__(self, cfg, proto, path, data_key):
+		self.cfg = cfg
+		self.proto = proto
+		self.path = path
+		self.data_key = data_key
+		self.data = None # the wallet data object last loaded from or written to the database
+		self.state = {}
+
+	@cached_property
+	def con(self):
+		con = sqlite3.connect(self.path)
+		con.executescript(self.schema)
+		return con
+
+	@property
+	def exists(self):
+		return bool(self.con.execute("SELECT 1 FROM meta WHERE key = 'keys'").fetchone())
+
+	@staticmethod
+	def make_json_id(json_data):
+		return sha256(json_data.encode()).hexdigest()[:16]
+
+	@property
+	def json_id(self):
+		"ID of the JSON wallet file data last synced with the database"
+		return self.state.get('json_id')
+
+	@property
+	def json_synced(self):
+		"True if the database hasn’t changed since the JSON wallet file was last synced"
+		return 'json_synced' in self.state
+
+	def read_state(self):
+		"""
+		Read the state of the database, against which subsequent writes are checked
+		"""
+		self.state = dict(self.con.execute('SELECT key, value FROM state'))
+		return self.state
+
+	@contextmanager
+	def transaction(self, **new_state):
+		"""
+		Context manager for a write transaction, incrementing the generation number
+		and updating the state with ‘new_state’
+		"""
+		with self.con as con:
+			con.execute('BEGIN IMMEDIATE')
+			if dict(con.execute('SELECT key, value FROM state')) != self.state:
+				die('WalletFileError',
+					f'Tracking wallet database {str(self.path)!r} has been altered by some other program! '
+					'Aborting database write')
+			state = {k: v for k, v in self.state.items() if k != 'json_synced'} | new_state | {
+				'generation': str(int(self.state.get('generation', 0)) + 1)}
+			con.execute('DELETE FROM state')
+			con.executemany('INSERT INTO state VALUES (?, ?)', state.items())
+			yield con
+		self.state = state
+
+	def set_json_synced(self, json_data):
+		"""
+		Record that ‘json_data’, the current wallet data, has been written to the JSON
+		wallet file
+		"""
+		json_id = self.make_json_id(json_data)
+		if not (self.json_synced and self.json_id == json_id):
+			with self.transaction(json_id=json_id, json_synced='1'):
+				pass
+
+	def get_token(self, path):
+		"return the ‘token’ column value for the wallet data key path ‘path’"
+		return '' if path[0] == self.data_key else path[1]
+
+	def gen_addr_rows(self, token, entries):
+		for addr, d in entries.items():
+			if addr != 'params':
+				yield (
+					token,
+					addr,
+					str(d['mmid']),
+					TwMMGenID(self.proto, d['mmid']).sort_key,
+					str(d['comment']),
+					None if d.get('balance') is None else str(d['balance']))
+
+	def load(self):
+		"""
+		Return the wallet data in the format of the JSON wallet file
+		"""
+		con = self.con
+		meta = dict(con.execute('SELECT key, value FROM meta'))
+		data = {k: json.loads(meta[k]) if k in meta else {} for k in json.loads(meta['keys'])}
+		if 'tokens' in data:
+			data['tokens'] = {t: {'params': json.loads(p)} for t, p in con.execute('SELECT token, params FROM tokens')}
+		for token, addr, mmid, comment, balance in con.execute(
+				'SELECT token, addr, mmid, comment, balance FROM addrs'):
+			(data['tokens'][token] if token else data[self.data_key])[addr] = (
+				{'mmid': mmid, 'comment': comment} | ({} if balance is None else {'balance': balance}))
+		self.data = data
+		self.cfg._util.dmsg(f'Loaded tracking wallet data from ‘{self.path}’')
+		return data
+
+	def import_data(self, data):
+		"""
+		Replace the contents of the database with ‘data’
+		"""
+		sections = (self.data_key,) + self.sections
+		with self.transaction() as con:
+			for table in ('meta', 'tokens', 'addrs'):
+				con.execute(f'DELETE FROM {table}')
+			con.executemany('INSERT INTO meta VALUES (?, ?)',
+				[('keys', json.dumps(list(data)))] +
+				[(k, json.dumps(v)) for k, v in data.items() if k not in sections])
+			con.executemany('INSERT INTO tokens VALUES (?, ?)',
+				[(t, json.dumps(v['params'])) for t, v in data.get('tokens', {}).items()])
+			con.executemany('INSERT INTO addrs VALUES (?, ?, ?, ?, ?, ?)',
+				self.gen_addr_rows('', data[self.data_key]))
+			for t, v in data.get('tokens', {}).items():
+				con.executemany('INSERT INTO addrs VALUES (?, ?, ?, ?, ?, ?)', self.gen_addr_rows(t, v))
+		self.data = data
+
+	def append(self, records):
+		"""
+		Apply ‘records’ (op, path[, value]) in a single transaction
+		"""
+		with self.transaction() as con:
+			for op, path, *value in records:
+				if op == 'token':
+					con.execute(
+						'INSERT OR REPLACE INTO tokens VALUES (?, ?)',
+						(path[1], json.dumps(value[0]['params'])))
+					continue
+				token = self.get_token(path)
+				addr = path[-1] if op in ('import', 'remove') else path[-2]
+				match op:
+					case 'import':
+						con.executemany(
+							'INSERT OR REPLACE INTO addrs VALUES (?, ?, ?, ?, ?, ?)',
+							self.gen_addr_rows(token, {addr: value[0]}))
+					case 'remove':
+						con.execute('DELETE FROM addrs WHERE token = ? AND addr = ?', (token, addr))
+					case 'label':
+						con.execute(
+							'UPDATE addrs SET comment = ? WHERE token = ? AND addr = ?',
+							(str(value[0]), token, addr))
+					case 'balance':
+						con.execute(
+							'UPDATE addrs SET balance = ? WHERE token = ? AND addr = ?',
+							(value[0], token, addr))
+
+	def get_sorted_addrs(self, path):
+		"""
+		Return the addresses in the data section at ‘path’, sorted by MMGen ID and
+		address
+		"""
+		return [r[0] for r in self.con.execute(
+			'SELECT addr FROM addrs WHERE token = ? ORDER BY sort_key, addr',
+			(self.get_token(path),))]
+
+	def get_balance(self, path, addr):
+		"""
+		Return the stored balance of ‘addr’ in the data section at ‘path’, or None if
+		the address has no stored balance
+		"""
+		r = self.con.execute(
+			'SELECT balance FROM addrs WHERE token = ? AND addr = ?',
+			(self.get_token(path), addr)).fetchone()
+		return r[0] if r else None
+
+	def get_balances(self, path, addrs):
+		"""
+		Bulk version of get_balance(): return a dict of stored balances of ‘addrs’
+		"""
+		token = self.get_token(path)
+		ret = {}
+		for i in range(0, len(addrs), self.chunk_size):
+			chunk = addrs[i:i+self.chunk_size]
+			ret.update(self.con.execute(
+				'SELECT addr, balance FROM addrs WHERE token = ? AND balance IS NOT NULL AND addr IN ({})'.format(
+					','.join('?' * len(chunk))),
+				(token, *chunk)))
+		return ret
@@ -14,6 +14,7 @@ tw.store: Tracking wallet control class with store
 
 import json
 from pathlib import Path
+from types import MappingProxyType
 
 from ..base_obj import AsyncInit
 from ..obj import TwComment
@@ -29,6 +30,13 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 	tw_subdir = None
 	tw_fn = 'tracking-wallet.json'
 	aggressive_sync = False
+	journal = None
+	db = None
+	journal_compact_min = 1 << 16 # compact when journal exceeds this size or the snapshot size
+	generation = 0 # incremented on each change to the addresses or labels in the wallet
+	sort_keys_cache = None
+	sorted_list_cache = None
+	mmid_ordered_dict_cache = None
 
 	async def __init__(
 			self,
@@ -51,6 +59,15 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 		self.tw_dir = type(self).get_tw_dir(self.cfg, self.proto)
 		self.tw_path = self.tw_dir / self.tw_fn
 
+		if cfg.tw_store == 'journal':
+			from .journal import TwJournal
+			self.journal = TwJournal(cfg, self.tw_path)
+			self.changes = []
+		elif cfg.tw_store == 'sqlite':
+			from .sqlite import TwSQLiteStore
+			self.db = TwSQLiteStore(cfg, proto, self.tw_path.with_suffix('.db'), self.data_key)
+			self.changes = []
+
 		if no_wallet_init:
 			return
 
@@ -76,7 +93,7 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 		Since no exceptions are raised, errors will not be caught by the test suite.
 		"""
 		if getattr(self, 'mode', None) == 'w': # mode attr might not exist in this state
-			self.write()
+			self.write(compact=True)
 		elif self.cfg.debug:
 			msg('read-only wallet, doing nothing')
 
@@ -106,8 +123,51 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 			'addresses': {}}
 
 	def init_from_wallet_file(self):
-		from ..fileutil import check_or_create_dir, get_data_from_file
+		from ..fileutil import check_or_create_dir
 		check_or_create_dir(self.tw_dir)
+		if self.db:
+			self.db.read_state()
+		if self.db and self.db.exists:
+			self.init_from_db()
+		else:
+			self.init_from_json_file()
+
+		# ensure that wallet file is written when user exits via KeyboardInterrupt:
+		if self.mode == 'w':
+			import atexit
+			def del_twctl(twctl):
+				self.cfg._util.dmsg(f'Running exit handler del_twctl() for {twctl!r}')
+				del twctl
+			atexit.register(del_twctl, self)
+
+	def init_from_db(self):
+		"""
+		Load the wallet data from the database, checking that the JSON wallet file,
+		if it exists, hasn’t been altered since it was last synced with the database.
+		If it has, and the database is unchanged, import the wallet file again
+		"""
+		from ..fileutil import get_data_from_file
+		self.orig_data = get_data_from_file(self.cfg, self.tw_path, quiet=True) if self.tw_path.exists() else ''
+		self.data = self.db.load()
+
+		def json_altered():
+			if self.db.json_id in (None, self.db.make_json_id(self.orig_data)):
+				return False
+			try:
+				return json.loads(self.orig_data) != self.data
+			except ValueError:
+				return True
+
+		if self.orig_data and json_altered():
+			if not self.db.json_synced:
+				die('WalletFileError',
+					f'Tracking wallet file {str(self.tw_path)!r} and database {str(self.db.path)!r} '
+					'have both been altered!')
+			msg(f'Tracking wallet file ‘{self.tw_path}’ has been altered by some other program')
+			self.init_from_json_file()
+
+	def init_from_json_file(self):
+		from ..fileutil import get_data_from_file
 		try:
 			self.orig_data = get_data_from_file(self.cfg, self.tw_path, quiet=True)
 			self.data = json.loads(self.orig_data)
@@ -121,15 +181,12 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 			else:
 				die('WalletFileError', f'File ‘{self.tw_path}’ exists but does not contain valid JSON data')
 		else:
+			if self.journal:
+				self.journal.replay(self.data, self.orig_data)
 			self.upgrade_wallet_maybe()
-
-		# ensure that wallet file is written when user exits via KeyboardInterrupt:
-		if self.mode == 'w':
-			import atexit
-			def del_twctl(twctl):
-				self.cfg._util.dmsg(f'Running exit handler del_twctl() for {twctl!r}')
-				del twctl
-			atexit.register(del_twctl, self)
+			if self.db: # migrate JSON wallet to database
+				msg(f'Importing {self.desc} data from ‘{self.tw_path}’ into ‘{self.db.path}’')
+				self.force_write()
 
 	@write_mode
 	async def batch_import_address(self, args_list):
@@ -148,6 +205,9 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 				r[addr]['comment'] = label.comment
 		else:
 			r[addr] = {'mmid': label.mmid, 'comment': label.comment}
+		self.generation += 1
+		self.set_sort_key(r, addr)
+		self.record_change('import', self.data_root_path + (addr,), r[addr])
 
 	@write_mode
 	async def remove_address(self, addr):
@@ -165,6 +225,9 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 				# return the addr resolved to mmid if possible
 				ret = r[k]['mmid'] if is_mmgen_id(self.proto, r[k]['mmid']) else addr
 				del r[k]
+				self.generation += 1
+				self.set_sort_key(r, k)
+				self.record_change('remove', self.data_root_path + (k,))
 				self.write()
 				return ret
 		msg(f'Address {addr!r} not found in {self.data_root_desc!r} section of tracking wallet')
@@ -175,23 +238,72 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 		for addr, d in list(self.data_root.items()):
 			if addr == coinaddr:
 				d['comment'] = lbl.comment
+				self.generation += 1
+				self.record_change('label', self.data_root_path + (addr, 'comment'), lbl.comment)
 				self.write()
 				return True
 		msg(f'Address {coinaddr!r} not found in {self.data_root_desc!r} section of tracking wallet')
 		return False
 
+	def sync_db(self):
+		"""
+		Apply pending changes to the database store, if in write mode.  Return True
+		if the database holds the current wallet data
+		"""
+		if self.db.data is not self.data:
+			return False
+		if self.changes and self.mode == 'w':
+			self.write_changes()
+		return True
+
+	def get_sort_keys(self, r):
+		"sort keys of the entries of data root ‘r’, computed once per loaded or imported entry"
+		if (c := self.sort_keys_cache) and c[0] is r:
+			return c[1]
+		keys = {k: (r[k]['mmid'].sort_key, k) for k in r if k not in ('params', 'coin')}
+		self.sort_keys_cache = (r, keys)
+		return keys
+
+	def set_sort_key(self, r, addr):
+		if (c := self.sort_keys_cache) and c[0] is r:
+			if addr in r:
+				c[1][addr] = (r[addr]['mmid'].sort_key, addr)
+			else:
+				c[1].pop(addr, None)
+
 	@property
 	def sorted_list(self):
-		return sorted([{
-				'addr':    x[0],
-				'mmid':    x[1]['mmid'],
-				'comment': x[1]['comment']
-			} for x in self.data_root.items() if x[0] not in ('params', 'coin')],
-			key = lambda x: x['mmid'].sort_key + x['addr'])
+		"""
+		The entries of ‘data_root’ sorted by MMGen ID and address, as a tuple of
+		read-only mappings.  The tuple is memoized until the next change to the
+		addresses or labels in the wallet and shared by all callers
+		"""
+		r = self.data_root
+		if (c := self.sorted_list_cache) and c[0] == self.generation and c[1] is r:
+			return c[2]
+		if self.db and self.sync_db():
+			addrs = self.db.get_sorted_addrs(self.data_root_path)
+		else:
+			keys = self.get_sort_keys(r)
+			addrs = sorted(keys, key=keys.__getitem__)
+		ret = tuple(MappingProxyType({
+				'addr':    k,
+				'mmid':    r[k]['mmid'],
+				'comment': r[k]['comment']
+			}) for k in addrs)
+		self.sorted_list_cache = (self.generation, r, ret)
+		return ret
 
 	@property
 	def mmid_ordered_dict(self):
-		return {x['mmid']: {'addr': x['addr'], 'comment': x['comment']} for x in self.sorted_list}
+		"read-only mapping of MMGen IDs to addresses and comments, ordered as ‘sorted_list’"
+		sl = self.sorted_list
+		if not (c := self.mmid_ordered_dict_cache) or c[0] is not sl:
+			c = self.mmid_ordered_dict_cache = (
+				sl,
+				MappingProxyType({x['mmid']: MappingProxyType({'addr': x['addr'], 'comment': x['comment']})
+					for x in sl}))
+		return c[1]
 
 	async def get_label_addr_pairs(self):
 		return [label_addr_pair(
@@ -213,11 +325,20 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 	def data_root_desc(self):
 		return self.data_key
 
+	@property
+	def data_root_path(self):
+		"key path of ‘data_root’ in the wallet data"
+		return (self.data_key,)
+
+	def get_data_root_path(self, data_root):
+		return self.data_root_path if data_root is self.data_root else (self.data_key,)
+
 	def cache_balance(self, addr, bal, *, session_cache, data_root, force=False):
 		if force or addr not in session_cache:
 			session_cache[addr] = str(bal)
 			if addr in data_root:
 				data_root[addr]['balance'] = str(bal)
+				self.record_change('balance', self.get_data_root_path(data_root) + (addr, 'balance'), str(bal))
 				if self.aggressive_sync:
 					self.write()
 
@@ -225,6 +346,8 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 		if addr in session_cache:
 			return self.proto.coin_amt(session_cache[addr])
 		if self.use_cached_balances:
+			if self.db and self.sync_db():
+				return self.proto.coin_amt(self.db.get_balance(self.get_data_root_path(data_root), addr) or '0')
 			return self.proto.coin_amt(
 				data_root[addr]['balance'] if addr in data_root and 'balance' in data_root[addr]
 				else '0')
@@ -237,12 +360,68 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 				self.cache_balance(addr, ret, session_cache=self.cur_balances, data_root=self.data_root)
 		return ret
 
+	async def get_balances(self, addrs, *, force_rpc=False, block='latest'):
+		"""
+		Bulk version of get_balance(): return the balances of ‘addrs’ in a list,
+		fetching balances not found in the caches with a single gathered RPC call
+		"""
+		return await self.get_balances_common(
+			addrs,
+			session_cache    = self.cur_balances,
+			data_root        = self.data_root,
+			rpc_get_balances = self.rpc_get_balances,
+			force_rpc        = force_rpc,
+			block            = block)
+
+	async def get_balances_common(self, addrs, *, session_cache, data_root, rpc_get_balances, force_rpc, block):
+		ret = dict.fromkeys(addrs) if force_rpc else self.get_cached_balances(addrs, session_cache, data_root)
+		if uncached := [addr for addr, bal in ret.items() if bal is None]:
+			for addr, bal in zip(uncached, await rpc_get_balances(uncached, block=block), strict=True):
+				if bal is not None:
+					self.cache_balance(addr, bal, session_cache=session_cache, data_root=data_root)
+				ret[addr] = bal
+		return [ret[addr] for addr in addrs]
+
+	def get_cached_balances(self, addrs, session_cache, data_root):
+		if self.use_cached_balances and self.db and self.sync_db():
+			stored = self.db.get_balances(
+				self.get_data_root_path(data_root),
+				[addr for addr in addrs if addr not in session_cache])
+			return {addr: self.proto.coin_amt(session_cache.get(addr) or stored.get(addr, '0')) for addr in addrs}
+		return {addr: self.get_cached_balance(addr, session_cache, data_root) for addr in addrs}
+
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return [await self.rpc_get_balance(addr, block=block) for addr in addrs]
+
 	def force_write(self):
 		mode_save = self.mode
 		self.mode = 'w'
-		self.write()
+		self.write(compact=True)
 		self.mode = mode_save
 
+	def record_change(self, op, path, *value):
+		if self.journal or self.db:
+			self.changes.append((op, path, *value))
+
+	@write_mode
+	def write_changes(self):
+		(self.db or self.journal).append(self.changes)
+		self.changes = []
+
+	@write_mode
+	def write_db(self, quiet):
+		self.db.import_data(self.data)
+		self.changes = []
+		if not quiet:
+			msg(f'{self.base_desc} data written to ‘{self.db.path}’')
+
+	@write_mode
+	def write_json(self, quiet):
+		wdata = json.dumps(self.data)
+		if self.orig_data != wdata:
+			self.write_changed(wdata, quiet=quiet)
+		self.db.set_json_synced(self.orig_data)
+
 	@write_mode
 	def write_changed(self, data, quiet):
 		from ..fileutil import write_data_to_file
@@ -259,7 +438,34 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 
 		self.orig_data = data
 
-	def write(self, *, quiet=True):
+	def write(self, *, quiet=True, compact=False):
+		"""
+		With the journal store, append recorded changes to the journal, rewriting
+		the wallet file only if ‘compact’ is set or the journal has grown too large.
+
+		With the database store, apply recorded changes to the database, writing
+		all the wallet data only if it has been replaced.  If ‘compact’ is set, sync
+		the wallet file with the database
+		"""
+		if self.db:
+			if self.db.data is not self.data:
+				self.write_db(quiet=quiet)
+			elif self.changes:
+				self.cfg._util.dmsg(f'write(): applying {len(self.changes)} change(s) to database')
+				self.write_changes()
+			if compact:
+				self.write_json(quiet=quiet)
+			return
+
+		if self.journal and not compact:
+			if self.changes:
+				if self.journal.size < max(self.journal_compact_min, len(self.orig_data)):
+					self.cfg._util.dmsg(f'write(): appending {len(self.changes)} change(s) to journal')
+					self.write_changes()
+					return
+			else:
+				return
+
 		self.cfg._util.dmsg(f'write(): checking if {self.desc} data has changed')
 
 		wdata = json.dumps(self.data)
@@ -267,3 +473,7 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 			self.write_changed(wdata, quiet=quiet)
 		elif self.cfg.debug:
 			msg('Data is unchanged\n')
+
+		if self.journal and self.mode == 'w':
+			self.journal.snapshot_written(self.orig_data)
+			self.changes = []
@@ -36,6 +36,7 @@ class TwTxHistory(TwView):
 	show_txid = False
 	show_unconfirmed = False
 	show_total_amt = False
+	use_cache = True # use on-disk cache of transaction data, if implemented
 	update_widths_on_age_toggle = True
 	print_output_types = ('squeezed', 'detail')
 	filters = ('show_unconfirmed',)
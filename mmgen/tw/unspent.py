@@ -132,12 +132,13 @@ class TwUnspentOutputs(TwView):
 		block = self.twctl.rpc.get_block_from_minconf(minconf)
 		if self.addrs:
 			wl = [d for d in wl if d['addr'] in self.addrs]
+		amts = await self.twctl.get_balances([d['addr'] for d in wl], block=block)
 		return [{
 				'account': TwLabel(self.proto, d['mmid']+' '+d['comment']),
 				'address': d['addr'],
-				'amt': await self.twctl.get_balance(d['addr'], block=block),
+				'amt': amt,
 				'confirmations': minconf,
-				} for d in wl]
+				} for d, amt in zip(wl, amts, strict=True)]
 
 	def get_disp_data(self):
 
@@ -160,7 +161,7 @@ class TwUnspentOutputs(TwView):
 				'num': max(2, len(str(len(data)))+1),
 				'txid': 0,
 				'vout': self.vout_w,
-				'mmid': max(len(d.twmmid.disp) for d in data) if show_mmid else 0,
+				'mmid': self.col_max('mmid', data, lambda d: len(d.twmmid.disp)) if show_mmid else 0,
 				'amt': self.amt_widths['amt'],
 				'amt2': self.amt_widths.get('amt2', 0),
 				'block': self.age_col_params['block'][0] if wide else 0,
@@ -168,8 +169,8 @@ class TwUnspentOutputs(TwView):
 				'date': self.age_w,
 				'spc': self.disp_spc + (2 * show_mmid) + self.has_amt2},
 			maxws = { # expandable cols
-				'addr': max(len(d.addr) for d in data),
-				'comment': max(d.comment.screen_width for d in data) if show_mmid else 0,
+				'addr': self.col_max('addr', data, lambda d: len(d.addr)),
+				'comment': self.col_max('comment', data, lambda d: d.comment.screen_width) if show_mmid else 0,
 			} | self.txid_max_w,
 			minws = {
 				'addr': 10,
@@ -246,13 +247,13 @@ class TwUnspentOutputs(TwView):
 
 	async def set_dates(self, us):
 		if not self.dates_set:
-			# 'blocktime' differs from 'time', is same as getblockheader['time']
-			dates = [o.get('blocktime', 0)
-				for o in await self.rpc.gathered_icall(
-					'gettransaction',
-					[(o.txid, True, False) for o in us])]
-			for idx, o in enumerate(us):
-				o.date = dates[idx]
+			# block time, same as gettransaction['blocktime']:
+			cus = [o for o in us if o.confs]
+			for o, date in zip(cus, await self.get_block_times([o.confs for o in cus]), strict=True):
+				o.date = date
+			for o in us:
+				if not o.confs:
+					o.date = 0
 			self.dates_set = True
 
 	class sort_action(TwView.sort_action):
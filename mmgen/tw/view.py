@@ -21,7 +21,8 @@ tw.view: base class for tracking wallet view classes
 """
 
 import sys, time, asyncio
-from collections import namedtuple
+from collections import namedtuple, Counter
+from itertools import islice
 
 from ..cfg import gv, gc
 from ..objmethods import MMGenObject
@@ -48,6 +49,81 @@ def enable_echo(orig_func):
 		return ret
 	return f
 
+class TwDisplayLines:
+	"""
+	Display body lines formatted lazily from a line generator.  Lines are formatted
+	only as far as required by the slices taken and positions requested, so the
+	cost of drawing a window of a scrolling display doesn’t depend on the total
+	number of lines.
+	"""
+	def __init__(self, lines):
+		self.gen = iter(lines)
+		self.lines = []
+		self.done = False
+
+	def fill(self, n=None):
+		"format lines up to ‘n’ (all lines if None) and return the number of lines available"
+		lines = self.lines
+		if not self.done:
+			if n is None:
+				lines.extend(self.gen)
+				self.done = True
+			elif n > len(lines):
+				lines.extend(islice(self.gen, n - len(lines)))
+				self.done = len(lines) < n
+		return len(lines) if n is None else min(n, len(lines))
+
+	def clamp_pos(self, pos, height):
+		"return ‘pos’, reduced if necessary to the last position with a full window of ‘height’ lines"
+		return max(0, min(pos, self.fill(pos + height) - height))
+
+	def __len__(self):
+		return self.fill()
+
+	def __iter__(self):
+		self.fill()
+		return iter(self.lines)
+
+	def __getitem__(self, key):
+		self.fill(key.stop if isinstance(key, slice) else key + 1)
+		return self.lines[key]
+
+class TwColumnMaxima:
+	"""
+	Maximum of a column width function over a changing set of display items,
+	maintained incrementally: widths are computed only for items added since the
+	last update
+	"""
+	def __init__(self, func):
+		self.func = func
+		self.items = {} # id(item) -> (item, width), holding a reference to the item keeps its id valid
+		self.counts = Counter()
+
+	def add(self, item):
+		w = self.func(item)
+		self.items[id(item)] = (item, w)
+		self.counts[w] += 1
+
+	def discard(self, key):
+		if key in self.items:
+			w = self.items.pop(key)[1]
+			self.counts[w] -= 1
+			if not self.counts[w]:
+				del self.counts[w]
+
+	def update(self, data):
+		cur = {id(d): d for d in data}
+		for key in self.items.keys() - cur.keys():
+			self.discard(key)
+		for key in cur.keys() - self.items.keys():
+			self.add(cur[key])
+		return max(self.counts)
+
+	def refresh(self, item):
+		if id(item) in self.items:
+			self.discard(id(item))
+			self.add(item)
+
 # base class for TwUnspentOutputs, TwAddresses, TwTxHistory:
 class TwView(MMGenObject, metaclass=AsyncInit):
 
@@ -200,6 +276,8 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 	async def __init__(self, cfg, proto):
 		self.cfg = cfg
 		self.proto = proto
+		self.col_maxima = {}
+		self.sort_keys = {}
 		if have_rpc := 'rpc_init' in proto.mmcaps:
 			self.rpc = await rpc_init(cfg, proto)
 		if self.has_wallet:
@@ -248,6 +326,12 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 				case _:
 					return self.date_formatter[age_fmt](self.rpc, o.date)
 
+	async def get_block_times(self, confs):
+		"return the times of the blocks at the given confirmation depths, using the block cache"
+		from .blockcache import TwBlockCache
+		bc = self.rpc.blockcount + 1
+		return await TwBlockCache(self.cfg, self.proto, self.rpc).get_times([bc - n for n in confs])
+
 	def get_disp_prec(self, wide):
 		return self.proto.coin_amt.max_prec
 
@@ -278,11 +362,31 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 		if key not in self.sort_funcs:
 			die(1, f'{key!r}: invalid sort key.  Valid options: {" ".join(self.sort_funcs)}')
 		self.sort_key = key
-		save = self.data.copy()
-		self.data.sort(key=self.sort_funcs[key], reverse=self.reverse)
-		if self.data != save:
+		keys = self.get_sort_keys(key)
+		order = sorted(range(len(keys)), key=keys.__getitem__, reverse=self.reverse)
+		if order != list(range(len(order))):
+			self.data[:] = [self.data[i] for i in order]
 			self.pos = 0
 
+	def get_sort_keys(self, key):
+		"""
+		Return the sort keys of the items of ‘self.data’ for sort key ‘key’.  Keys are
+		computed once per item and cached until the data is replaced.
+		"""
+		if self.sort_keys.get('data') is not self.data:
+			self.sort_keys = {'data': self.data}
+		if key not in self.sort_keys:
+			func = self.sort_funcs[key]
+			self.sort_keys[key] = {id(d): func(d) for d in self.data}
+		cache = self.sort_keys[key]
+		return [cache[id(d)] for d in self.data]
+
+	def col_max(self, name, data, func):
+		"return the maximum of ‘func’ over ‘data’, maintained incrementally across redraws"
+		if name not in self.col_maxima:
+			self.col_maxima[name] = TwColumnMaxima(func)
+		return self.col_maxima[name].update(data)
+
 	async def get_data(self):
 
 		rpc_data = await self.get_rpc_data()
@@ -416,8 +520,10 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 	def set_amt_widths(self, data):
 		# width of amts column: min(7, width of integer part) + len('.') + width of fractional part
 		self.amt_widths = {
-			k: min(7, max(len(str(getattr(d, k).to_integral_value()))
-				for d in data)) + 1 + self.disp_prec
+			k: min(7, self.col_max(
+				f'{k}_iwidth',
+				data,
+				lambda d, k=k: len(str(getattr(d, k).to_integral_value())))) + 1 + self.disp_prec
 					for k in self.amt_iwidth_keys}
 
 	async def format(
@@ -508,11 +614,14 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 			else:
 				cw = hdr_fs = fs = None
 
+			body = (
+				get_body(getattr(self, dt.fmt_method)) if self.disp_data else
+				[(nocolor, yellow)[color](self.nodata_msg.ljust(self.term_width))])
+
 			return (
 				tuple(gen_hdr(spc='' if line_processing == 'print' else ' ')),
-				tuple(
-					get_body(getattr(self, dt.fmt_method)) if self.disp_data else
-					[(nocolor, yellow)[color](self.nodata_msg.ljust(self.term_width))]))
+				# when scrolling, format only the lines displayed:
+				TwDisplayLines(body) if scroll else tuple(body))
 
 		if not gv.stdout.isatty():
 			line_processing = 'print'
@@ -549,19 +658,17 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 					display_hdr, display_body = make_display()
 
 				self.scrollable_height = self.term_height - fixed_height
-				self.max_pos = max(0, len(display_body) - self.scrollable_height)
-				self.pos = min(self.pos, self.max_pos)
+				self.pos = display_body.clamp_pos(self.pos, self.scrollable_height)
 
 			if not dt.detail:
 				self.display_hdr = display_hdr
 				self.display_body = display_body
 
 		if scroll:
-			top = self.pos
-			bot = self.pos + self.scrollable_height
+			display_body = display_body[self.pos:self.pos + self.scrollable_height]
 			fill = ('\n' + ''.ljust(self.term_width)) * (self.scrollable_height - len(display_body))
 		else:
-			top, bot, fill = (None, None, '')
+			fill = ''
 
 		if interactive:
 			footer = ''
@@ -571,7 +678,7 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 
 		return (
 			'\n'.join(display_hdr) + '\n'
-			+ dt.item_separator.join(display_body[top:bot])
+			+ dt.item_separator.join(display_body)
 			+ fill
 			+ footer)
 
@@ -858,6 +965,8 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 			edited = old_comment and new_comment
 			if isinstance(new_comment, TwComment):
 				entry.comment = new_comment
+				for m in parent.col_maxima.values():
+					m.refresh(entry)
 				parent.oneshot_msg = (green if new_comment else yellow)('Label {a} {b}{c}'.format(
 					a = 'for' if edited else 'added to' if new_comment else 'removed from',
 					b = desc,
@@ -873,26 +982,28 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 	class scroll_action:
 
 		def run(self, parent, action_method):
-			self.use_cached = True
+			parent.use_cached = True
 			return action_method(parent)
 
 		def m_cursor_up(self, parent):
 			parent.pos -= min(parent.pos - 0, 1)
 
 		def m_cursor_down(self, parent):
-			parent.pos += min(parent.max_pos - parent.pos, 1)
+			parent.pos = parent.display_body.clamp_pos(parent.pos + 1, parent.scrollable_height)
 
 		def m_pg_up(self, parent):
 			parent.pos -= min(parent.scrollable_height, parent.pos - 0)
 
 		def m_pg_down(self, parent):
-			parent.pos += min(parent.scrollable_height, parent.max_pos - parent.pos)
+			parent.pos = parent.display_body.clamp_pos(
+				parent.pos + parent.scrollable_height,
+				parent.scrollable_height)
 
 		def m_top(self, parent):
 			parent.pos = 0
 
 		def m_bot(self, parent):
-			parent.pos = parent.max_pos
+			parent.pos = parent.display_body.clamp_pos(len(parent.display_body), parent.scrollable_height)
 
 	class sort_action:
 
@@ -16,6 +16,7 @@ from ..cfg import gc
 from ..util import msg, suf, fmt, die, remove_dups, get_extension
 from ..addr import MMGenAddrType
 from ..addrlist import AddrIdxList, KeyAddrList
+from ..keycache import KeyAddrCache
 from ..wallet import Wallet, get_wallet_extensions, get_wallet_cls
 
 def _pop_matching_fns(args, cmplist): # strips found args
@@ -155,12 +156,8 @@ class TxKeys:
 			for id_str in MMGenAddrType.mmtypes:
 				idx_list = [i.idx for i in mmids if i.sid == sid and i.mmtype == id_str]
 				if idx_list:
-					yield KeyAddrList(
-						cfg         = self.cfg,
-						proto       = proto,
-						seed        = seed,
-						addr_idxs   = AddrIdxList(idx_list=idx_list),
-						mmtype      = MMGenAddrType(proto, id_str),
+					yield KeyAddrCache(self.cfg, proto, seed, id_str).get(
+						AddrIdxList(idx_list=idx_list),
 						skip_chksum = True)
 
 	def add_keys(self, src, io_list, *, from_keyaddrlist=False):
@@ -182,21 +179,24 @@ class TxKeys:
 		self.cfg._util.qmsg(
 			f'Checking {gc.proj_name} -> {proto.coin} address mappings for {src} (from {desc})')
 
+		# entries are looked up by address list ID and index, using the lists’ own indexes:
+		kals_by_id = {}
+		for kal in kals:
+			kals_by_id.setdefault(kal.al_id, kal)
+
 		def gen_keys():
 			for e in need_keys:
-				for kal in kals:
-					for f in kal.data:
-						if mmid := f'{kal.al_id}:{f.idx}' == e.mmid:
-							if f.addr == e.addr:
-								e.have_wif = True
-								if src == 'inputs':
-									yield f
-							else:
-								die(3, fmt(f"""
-									{gc.proj_name} -> {proto.coin} address mappings differ!
-									{err_desc:<23} {mmid} -> {f.addr}
-									{'tx file:':<23} {e.mmid} -> {e.addr}
-									""").strip())
+				if (kal := kals_by_id.get(e.mmid.al_id)) and (f := kal.entry(e.mmid.idx)):
+					if f.addr == e.addr:
+						e.have_wif = True
+						if src == 'inputs':
+							yield f
+					else:
+						die(3, fmt(f"""
+							{gc.proj_name} -> {proto.coin} address mappings differ!
+							{err_desc:<23} {kal.al_id}:{f.idx} -> {f.addr}
+							{'tx file:':<23} {e.mmid} -> {e.addr}
+							""").strip())
 
 		if new_keys := list(gen_keys()):
 			self.cfg._util.vmsg(f'Added {len(new_keys)} wif key{suf(new_keys)} from {desc}')
@@ -452,20 +452,47 @@ def async_run(cfg, func, *, args=(), kwargs={}):
 		return asyncio.run(func(*args, **kwargs))
 
 def wrap_ripemd160(called=[]):
-	if not called:
+	"""
+	If hashlib lacks ripemd160 (e.g. with OpenSSL 3), make hashlib.new() use the
+	implementation in the secp256k1 extension module, falling back to the pure-Python
+	one.  Return a description of the implementation used on the call that installs
+	the wrapper, otherwise None.
+	"""
+	if called:
+		return None
+	called.append(True)
+	try:
+		import hashlib
+		hashlib.new('ripemd160')
+	except ValueError:
+		def hashlib_new_wrapper(name, data=b'', **kwargs):
+			if name == 'ripemd160':
+				return ripemd160(data) # ignore hashlib.new() kwargs, e.g. ‘usedforsecurity’
+			else:
+				return hashlib_new(name, data, **kwargs)
 		try:
-			import hashlib
-			hashlib.new('ripemd160')
-		except ValueError:
-			def hashlib_new_wrapper(name, *args, **kwargs):
-				if name == 'ripemd160':
-					return ripemd160(*args, **kwargs)
-				else:
-					return hashlib_new(name, *args, **kwargs)
+			from .proto.secp256k1.secp256k1 import ripemd160 as ripemd160_digest
+		except ImportError:
 			from .contrib.ripemd160 import ripemd160
-			hashlib_new = hashlib.new
-			hashlib.new = hashlib_new_wrapper
-		called.append(True)
+			desc = 'pure-Python'
+		else:
+			class ripemd160:
+				name = 'ripemd160'
+				digest_size = 20
+				def __init__(self, data=b'', **kwargs):
+					self.res = ripemd160_digest(data)
+				def digest(self):
+					return self.res
+				def hexdigest(self):
+					return self.res.hex()
+				def update(self, *args, **kwargs):
+					raise NotImplementedError('update() method not implemented for native ripemd160')
+				def copy(self, *args, **kwargs):
+					raise NotImplementedError('copy() method not implemented for native ripemd160')
+			desc = 'secp256k1 extension module'
+		hashlib_new = hashlib.new
+		hashlib.new = hashlib_new_wrapper
+		return desc
 
 def exit_if_mswin(feature):
 	if gc.platform == 'win32':
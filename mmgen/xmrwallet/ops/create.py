@@ -65,13 +65,10 @@ class OpCreateOffline(OpCreate):
 		super().__init__(cfg, uarg_tuple)
 
 		gmsg('\nCreating viewkey-address file for watch-only wallets')
-		vkal = ViewKeyAddrList(
-			cfg       = self.cfg,
-			proto     = self.proto,
-			infile    = None,
-			addr_idxs = self.uargs.wallets,
-			seed      = self.seed_src.seed,
-			skip_chksum_msg = True)
+		from ...keycache import KeyAddrCache
+		vkal = KeyAddrCache(self.cfg, self.proto, self.seed_src.seed).get(
+			self.uargs.wallets,
+			al_cls = ViewKeyAddrList)
 		vkf = vkal.file
 
 		# before writing viewkey-address file, shred any old ones in the directory:
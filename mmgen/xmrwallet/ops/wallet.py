@@ -87,12 +87,8 @@ class OpWallet(OpBase):
 				ignore_in_fmt = True)
 
 			gmsg('\nCreating ephemeral key-address list for offline wallets')
-			self.kal = KeyAddrList(
-				cfg       = cfg,
-				proto     = self.proto,
-				seed      = self.seed_src.seed,
-				addr_idxs = self.uargs.wallets,
-				skip_chksum_msg = True)
+			from ...keycache import KeyAddrCache
+			self.kal = KeyAddrCache(cfg, self.proto, self.seed_src.seed).get(self.uargs.wallets)
 		else:
 			self.mount_removable_device()
 			# with watch_only, make a second attempt to open the file as KeyAddrList:
@@ -286,6 +286,8 @@ class CmdTestEthdevMethods:
 		match key:
 			case 'Token':
 				self.write_to_tmpfile(f'token_addr{num}', contract_addr+'\n')
+			case 'Multicall3':
+				self.write_to_tmpfile('multicall_addr', contract_addr+'\n')
 			case 'thorchain_router':
 				from mmgen.fileutil import write_data_to_file
 				write_data_to_file(
@@ -398,6 +400,34 @@ class CmdTestEthdevMethods:
 					usr_mmaddrs[i],
 					usr_addrs[i]))
 
+		async def cmp_multicall_bals(rpc):
+			from mmgen.cfg import Config
+			from mmgen.protocol import init_proto
+			from mmgen.proto.eth.contract import Multicall
+			mc_addr = self.read_from_tmpfile('multicall_addr').strip()
+			# set the Multicall address for the devnet, as with the cfg file option:
+			mc_cfg = Config({
+				'_clone': self.cfg,
+				f'{self.proto.coin.lower()}_{self.proto.network_names.regtest}_multicall_addr': mc_addr})
+			mc_proto = init_proto(mc_cfg, network_id=self.proto.coin+'_rt', need_amt=True)
+			assert mc_proto.multicall_addr == mc_addr, f'{mc_proto.multicall_addr}: wrong Multicall address'
+			addrs = [dfl_devaddr, burn_addr] + usr_addrs
+			for i in range(len(usr_mmaddrs)):
+				tk = await ResolvedToken(
+					mc_cfg,
+					mc_proto,
+					self.read_from_tmpfile(token_addr or f'token_addr{i+1}').strip(),
+					rpc = rpc)
+				Multicall.deployed.clear()
+				res = await tk.get_balances(addrs)
+				assert Multicall.deployed[(mc_proto.network, mc_addr)], 'Multicall contract not found'
+				ref = [await tk.get_balance(addr) for addr in addrs]
+				imsg('Token: {}'.format(await tk.get_symbol()))
+				for addr, bal in zip(addrs, res):
+					imsg(f'  {addr} {bal}')
+				assert res == ref, f'aggregated balances {res} differ from single-call balances {ref}'
+				assert res[0] and res[2 + i], 'funded token balances are zero'
+
 		def gen_addr(addr):
 			return tool_cmd(
 				self.cfg, cmdname='gen_addr', proto=self.proto).gen_addr(addr, wallet=dfl_words_file)
@@ -409,6 +439,8 @@ class CmdTestEthdevMethods:
 				await show_bals(await self.rpc)
 			case 'fund_user':
 				await fund_user(await self.rpc)
+			case 'cmp_multicall_bals':
+				await cmp_multicall_bals(await self.rpc)
 		end_silence()
 		return 'ok'
 
@@ -593,12 +625,16 @@ class CmdTestEthdev(CmdTestEthdevMethods, CmdTestBase, CmdTestShared):
 		('token_deploy2a',  'deploying ERC20 token #2 (SafeMath)'),
 		('token_deploy2b',  'deploying ERC20 token #2 (Owned)'),
 		('token_deploy2c',  'deploying ERC20 token #2 (Token)'),
+
+		('multicall_compile', 'compiling the Multicall3 aggregator contract'),
+		('multicall_deploy',  'deploying the Multicall3 aggregator contract'),
 	),
 	'token': (
 		'creating, signing, sending and bumping ERC20 token transactions',
 
 		('token_fund_users',           'transferring token funds from dev to user'),
 		('token_user_bals',            'show balances after transfer'),
+		('token_bals_multicall',       'comparing aggregated token balances with single-call balances'),
 		('token_addrgen',              'generating token addresses'),
 		('token_addrimport_badaddr1',  'importing token addresses (no token address)'),
 		('token_addrimport_badaddr2',  'importing token addresses (bad token address)'),
@@ -1387,6 +1423,32 @@ class CmdTestEthdev(CmdTestEthdevMethods, CmdTestBase, CmdTestShared):
 	async def token_deploy2c(self):
 		return await self._token_deploy_token(num=2)
 
+	def multicall_compile(self):
+		if not self.using_solc:
+			imsg(yellow('Solidity compiler not available, skipping Multicall3 deployment'))
+			return 'skip'
+		imsg('Compiling Multicall3 aggregator contract')
+		self.spawn(msg_only=True)
+		cmd = [
+			'solc',
+			'--evm-version=constantinople',
+			'--overwrite',
+			f'--output-dir={self.tmpdir}',
+			'--bin',
+			'test/ref/ethereum/Multicall3.sol']
+		imsg('Executing: {}'.format(' '.join(cmd)))
+		if (cp := run(cmd, stdout=DEVNULL, stderr=PIPE, text=True)).returncode:
+			rmsg('solc failed with the following output:')
+			die(2, cp.stderr)
+		imsg('Multicall3 aggregator contract compiled')
+		return 'ok'
+
+	async def multicall_deploy(self):
+		fn = joinpath(self.tmpdir, 'Multicall3.bin')
+		if not os.path.exists(fn):
+			return 'skip'
+		return await self._token_deploy(key='Multicall3', gas=1_000_000, gas_price='6G', fn=fn)
+
 	def tx_status2(self):
 		return self.tx_status(
 			ext        = self.proto.coin+'[0,7000]{}.regtest.sigtx',
@@ -1401,6 +1463,11 @@ class CmdTestEthdev(CmdTestEthdevMethods, CmdTestBase, CmdTestShared):
 	async def token_user_bals(self):
 		return await self._token_transfer_ops(op='show_bals', mm_idxs=[11, 21])
 
+	async def token_bals_multicall(self):
+		if not os.path.exists(joinpath(self.tmpdir, 'multicall_addr')):
+			return 'skip'
+		return await self._token_transfer_ops(op='cmp_multicall_bals', mm_idxs=[11, 21])
+
 	def token_addrgen(self):
 		return self._token_addrgen(mm_idxs=[11, 21], naddrs=3)
 
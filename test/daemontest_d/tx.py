@@ -58,6 +58,7 @@ async def test_tx(tx_proto, tx_hex, desc, n):
 	assert dt.txid == d['txid'], 'TXID does not match'
 	assert dt.locktime == d['locktime'], 'Locktime does not match'
 	assert dt.version == d['version'], 'Version does not match'
+	assert dt.vsize == d.get('vsize', d['size']), 'Vsize does not match'
 
 	# inputs
 	a, b = d['vin'], dt.txins
@@ -4,15 +4,30 @@
 test.modtest_d.addrlist: address list unit tests for the MMGen suite
 """
 
+import os, time
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+
 from mmgen.color import blue
-from mmgen.util import msg
+from mmgen.util import msg, make_chksum_N
+from mmgen.exception import MMGenError
 
+from mmgen.cfg import Config
 from mmgen.seed import Seed
-from mmgen.addr import MMGenAddrType
-from mmgen.addrlist import AddrIdxList, AddrList, KeyList, KeyAddrList, ViewKeyAddrList
+from mmgen.addr import MMGenAddrType, AddrListID
+from mmgen.addrlist import (
+	AddrIdxList,
+	AddrList,
+	KeyList,
+	KeyAddrList,
+	ViewKeyAddrList,
+	AddrListEntry,
+	AddrListData,
+	AddrListChksum)
+from mmgen.addrlistdata import CompactAddrListData
 from mmgen.passwdlist import PasswordList
 from mmgen.protocol import init_proto
-from ..include.common import cfg, qmsg, vmsg
+from ..include.common import cfg, qmsg, vmsg, silence, end_silence
 
 def do_test(
 		list_type,
@@ -63,9 +78,215 @@ def do_test(
 
 	return True
 
+def do_jobs_test(list_type, idx_spec, coin=None, addrtype=None):
+	qmsg(blue(f'Testing {list_type.__name__} (multi-process generation)'))
+	proto = init_proto(cfg, coin or 'btc')
+	kwargs = {
+		'seed': Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8)),
+		'addr_idxs': AddrIdxList(fmt_str=idx_spec),
+		'mmtype': MMGenAddrType(proto, addrtype or 'C'),
+		'skip_chksum_msg': True}
+	al1 = list_type(cfg, proto, **kwargs)
+	al2 = list_type(Config({'_clone': cfg, 'jobs': 3}), proto, **kwargs)
+	al1.file.format()
+	al2.file.format()
+	vmsg(f'  Checksum: {al2.chksum}')
+	assert al1.chksum == al2.chksum, f'{al1.chksum} != {al2.chksum}'
+	assert al1.file.fmt_data == al2.file.fmt_data, 'formatted data mismatch'
+	return True
+
+def do_jobs_exit_test():
+	qmsg(blue('Testing shutdown of multi-process generation on early exit'))
+	import multiprocessing
+	from mmgen.addrgen_mp import AddrGenPool
+	proto = init_proto(cfg, 'btc')
+	seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+	c = Config({'_clone': cfg, 'jobs': 3})
+	al = KeyAddrList(c, proto, seed=seed, addr_idxs=AddrIdxList(fmt_str='1'), skip_chksum_msg=True)
+	closed = []
+	close_save = AddrGenPool.close
+	def close(pool):
+		closed.append(pool)
+		close_save(pool)
+	AddrGenPool.close = close
+	silence()
+	try:
+		for exit_type in ('consumer', 'interrupt'):
+			gen = al.gen_entries(seed, AddrIdxList(fmt_str='1-5000'))
+			assert len(next(gen)) == al.gen_batch_size
+			assert multiprocessing.active_children(), 'no worker processes'
+			if exit_type == 'consumer':
+				gen.close()
+			else:
+				try:
+					gen.throw(KeyboardInterrupt)
+				except KeyboardInterrupt:
+					pass
+			assert len(closed) == 1 and not closed[0].pending, f'{exit_type}: pool not closed'
+			assert not multiprocessing.active_children(), f'{exit_type}: worker processes still running'
+			vmsg(f'  {exit_type} exit: pool closed')
+			closed.clear()
+	finally:
+		AddrGenPool.close = close_save
+		end_silence()
+	return True
+
+def legacy_chksum(al):
+	ea = al.al_id.mmtype.extra_attrs or ()
+	return make_chksum_N(
+		' '.join(' '.join(al.chksum_rec_f(e) + tuple(getattr(e, a) for a in ea if getattr(e, a)))
+			for e in al.data),
+		nchars = 16,
+		sep    = True)
+
+def do_compact_test(list_type, idx_spec, coin=None, addrtype=None, cashaddr=None):
+	qmsg(blue(f'Testing {list_type.__name__} (compact data)'))
+	proto = init_proto(cfg, coin or 'btc')
+	kwargs = {
+		'seed': Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8)),
+		'addr_idxs': AddrIdxList(fmt_str=idx_spec),
+		'mmtype': MMGenAddrType(proto, addrtype or 'C'),
+		'skip_chksum_msg': True}
+	al = list_type(Config({'_clone': cfg, 'cashaddr': cashaddr}) if cashaddr else cfg, proto, **kwargs)
+	assert isinstance(al.data, CompactAddrListData)
+	fmt_data = al.file.format()
+	entries = AddrListData(al.data)
+	for e in entries:
+		assert e._asdict() == al.entry_type(proto=proto, **e._asdict())._asdict()
+		if e.addr:
+			assert e.addr.views == al.data[entries.index(e)].addr.views
+	al.data = entries
+	assert al.file.format() == fmt_data, 'formatted data mismatch'
+	if al.chksum:
+		# checksum computed incrementally during generation matches the one computed from the list:
+		assert al.chksum == AddrListChksum(al) == legacy_chksum(al), 'checksum mismatch'
+
+	# attribute assignments on entry views are written back to the columns:
+	al.data = CompactAddrListData(proto, al.entry_type, entries)
+	e = al.data[-1]
+	e.comment = 'Last entry'
+	assert al.data[-1].comment == 'Last entry'
+	al.data[0].comment = 'First entry'
+	assert al.data.comments.keys() == {0, len(entries) - 1}
+	assert al.file.format(add_comments=True) != fmt_data
+	e.comment = ''
+	al.data[0].comment = ''
+	assert not al.data.comments
+	assert al.file.format() == fmt_data
+	vmsg(f'  {len(al.data)} entries: OK')
+	return True
+
+def do_index_test(nentries):
+	qmsg(blue(f'Testing AddrList indexes ({nentries:,} entries)'))
+	proto = init_proto(cfg, 'btc')
+	addrs = [proto.pubhash2addr(sha256(str(i).encode()).digest()[:20], 'p2pkh') for i in range(nentries)]
+	al = AddrList(
+		cfg,
+		proto,
+		al_id = AddrListID(sid=Seed(cfg, seed_bin=bytes(32)).sid, mmtype=MMGenAddrType(proto, 'L')),
+		adata = AddrListData(AddrListEntry(proto, idx=i+1, addr=a) for i, a in enumerate(addrs)))
+
+	sample = range(1, nentries + 1, nentries // 100)
+
+	t_start = time.time()
+	for idx in sample: # linear scan, as performed by the unindexed methods
+		assert next(e for e in al.data if e.idx == idx).addr == addrs[idx-1]
+	t_scan = (time.time() - t_start) / len(sample)
+
+	t_start = time.time()
+	for idx in range(1, nentries + 1):
+		assert al.coinaddr(idx) == addrs[idx-1]
+	t_index = (time.time() - t_start) / nentries
+
+	t_start = time.time()
+	for idx in sample: # list search, as performed by the unindexed reverse dict method
+		assert addrs[addrs.index(al.data[idx-1].addr)] == addrs[idx-1]
+	t_search = (time.time() - t_start) / len(sample)
+
+	t_start = time.time()
+	d = al.make_reverse_dict_addrlist(addrs)
+	t_rdict = time.time() - t_start
+	assert len(d) == nentries
+	for idx in sample:
+		assert d[addrs[idx-1]][0] == f'{al.al_id}:{idx}'
+
+	vmsg(f'  lookup by index: {t_scan*1e6:10.1f}µs (scan)  {t_index*1e6:6.2f}µs (index)  speedup {t_scan/t_index:.0f}x')
+	vmsg(f'  reverse dict:    {t_search*nentries:10.1f}s (search, est.)  {t_rdict:.2f}s (index)')
+
+	# indexes are invalidated on mutation:
+	al.data.append(AddrListEntry(proto, idx=nentries+1, addr=addrs[0]))
+	assert al.entry(nentries+1).addr == addrs[0]
+	al.data = CompactAddrListData(proto, AddrListEntry, al.data[:1000])
+	assert al.entry(nentries+1) is None
+	assert al.coinaddr(1000) == addrs[999]
+	al.data.append(AddrListEntry(proto, idx=nentries+2, addr=addrs[1]))
+	assert al.coinaddr(nentries+2) == addrs[1]
+	al.set_comment(1, 'First entry')
+	assert al.comment(1) == 'First entry'
+	assert al.make_reverse_dict_addrlist(addrs[:2])[addrs[0]][1] == 'First entry'
+	return True
+
+def do_stream_test(list_type, idx_spec, coin=None, addrtype=None):
+	qmsg(blue(f'Testing {list_type.__name__} (streaming file I/O)'))
+	proto = init_proto(cfg, coin or 'btc')
+	kwargs = {
+		'seed': Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8)),
+		'addr_idxs': AddrIdxList(fmt_str=idx_spec),
+		'mmtype': MMGenAddrType(proto, addrtype or 'C'),
+		'skip_chksum_msg': True}
+	al = list_type(cfg, proto, **kwargs)
+	with TemporaryDirectory() as tmpdir:
+		fn = os.path.join(tmpdir, al.file.filename)
+		al_s = list_type(cfg, proto, stream=True, **kwargs)
+		assert not al_s.data
+		assert al_s.file.write_stream(fn) == fn
+		with open(fn) as fp:
+			assert fp.read() == al.file.format(), 'streamed file data mismatch'
+		assert al_s.chksum == al.chksum, f'{al_s.chksum} != {al.chksum}'
+		assert os.listdir(tmpdir) == [al.file.filename], 'temporary file not removed'
+
+		# an interrupted write leaves no output file:
+		def gen_entries_interrupted(*args):
+			raise KeyboardInterrupt
+			yield
+		al_i = list_type(cfg, proto, stream=True, **kwargs)
+		al_i.gen_entries = gen_entries_interrupted
+		fn_i = os.path.join(tmpdir, 'interrupted')
+		try:
+			al_i.file.write_stream(fn_i)
+		except KeyboardInterrupt:
+			pass
+		assert os.listdir(tmpdir) == [al.file.filename], 'output file created by interrupted write'
+
+		if list_type is KeyList: # key files cannot be parsed
+			return True
+
+		al_p = list_type(cfg, proto, infile=fn, stream=True, key_address_validity_check=True)
+		entries = list(al_p.file.iter_file())
+		chk_entries = list_type(cfg, proto, infile=fn, skip_chksum_msg=True, key_address_validity_check=False).data
+		def entry_data(e):
+			return {k: v for k, v in e._asdict().items() if v} # empty comments are not stored in list data
+		assert list(map(entry_data, entries)) == list(map(entry_data, chk_entries)), 'parsed data mismatch'
+		assert al_p.chksum == al.chksum, f'{al_p.chksum} != {al.chksum}'
+		assert al_p.id_str == al.id_str, f'{al_p.id_str} != {al.id_str}'
+		vmsg(f'  {al_p.id_str}: {al_p.chksum}')
+
+		# a file with altered data fails the checksum test:
+		with open(fn) as fp:
+			text = fp.read()
+		with open(fn, 'w') as fp:
+			fp.write(text.replace(f'  {al.data[-1].idx}  ', f'  {al.data[-1].idx + 1}  '))
+		try:
+			list(list_type(cfg, proto, infile=fn, stream=True, key_address_validity_check=False).file.iter_file())
+		except MMGenError as e:
+			assert 'checksum mismatch' in str(e), str(e)
+		else:
+			raise AssertionError('altered data not detected')
+	return True
+
 class unit_tests:
 
-	altcoin_deps = ('keyaddr_xmr', 'viewkeyaddr')
+	altcoin_deps = ('keyaddr_xmr', 'viewkeyaddr', 'keyaddr_xmr_jobs', 'compact_altcoin', 'stream_altcoin')
 
 	def idxlist(self, name, ut):
 		for i, o in (
@@ -91,6 +312,42 @@ class unit_tests:
 
 		return True
 
+	def derive(self, name, ut):
+		from mmgen.derive import derive_coin_privkey_bytes, ChainCheckpoints
+		seed = bytes.fromhex('deadbeef' * 8)
+		ChainCheckpoints.wipe_cache()
+		for idx_spec in ('1-3,2500,4999-5001', '7000', '1,3000-3001,6999-7001'):
+			idxs = AddrIdxList(fmt_str=idx_spec)
+			chk = list(derive_coin_privkey_bytes(seed, idxs))
+			res = list(derive_coin_privkey_bytes(seed, idxs, checkpoints=ChainCheckpoints(cfg, seed)))
+			vmsg(f'  {idx_spec}: {len(ChainCheckpoints.cache)} cached checkpoint set(s)')
+			assert res == chk, f'checkpointed derivation mismatch for index list {idx_spec}'
+		assert sorted(ChainCheckpoints(cfg, seed).data) == list(range(1000, 8000, 1000))
+		ChainCheckpoints.wipe_cache()
+
+		# address lists use checkpoints only if a checkpoint directory is configured:
+		proto = init_proto(cfg, 'btc')
+		seed = Seed(cfg, seed_bin=bytes.fromhex('deadbeef' * 8))
+		silence()
+		KeyAddrList(cfg, proto, seed=seed, addr_idxs='1,1001', skip_chksum=True)
+		end_silence()
+		assert not ChainCheckpoints.cache, 'checkpoints cached without checkpoint directory'
+		with TemporaryDirectory() as tmpdir:
+			silence()
+			KeyAddrList(
+				Config({'_clone': cfg, 'chain_checkpoint_dir': tmpdir}),
+				proto,
+				seed = seed,
+				addr_idxs = '1,1001',
+				skip_chksum = True)
+			end_silence()
+			assert len(ChainCheckpoints.cache) == 1 and len(os.listdir(tmpdir)) == 1
+		ChainCheckpoints.wipe_cache()
+		return True
+
+	def index(self, name, ut):
+		return do_index_test(100_000)
+
 	def addr(self, name, ut):
 		return (
 			do_test(AddrList, 'BCE8 082C 0973 A525', '1-3') and
@@ -109,6 +366,38 @@ class unit_tests:
 	def viewkeyaddr(self, name, ut):
 		return do_test(ViewKeyAddrList, 'C122 2E58 DC28 D6AE', coin='XMR', addrtype='M')
 
+	def keyaddr_jobs(self, name, ut):
+		return do_jobs_test(KeyAddrList, '1-600,1000')
+
+	def jobs_exit(self, name, ut):
+		return do_jobs_exit_test()
+
+	def keyaddr_xmr_jobs(self, name, ut):
+		return do_jobs_test(ViewKeyAddrList, '1-300', coin='XMR', addrtype='M')
+
+	def stream(self, name, ut):
+		return (
+			do_stream_test(AddrList, '1-300,1000') and
+			do_stream_test(KeyAddrList, '1-3', addrtype='S') and
+			do_stream_test(KeyList, '1-3'))
+
+	def stream_altcoin(self, name, ut):
+		return (
+			do_stream_test(ViewKeyAddrList, '1-3', coin='XMR', addrtype='M') and
+			do_stream_test(KeyAddrList, '1-3', coin='ZEC', addrtype='Z'))
+
+	def compact(self, name, ut):
+		return (
+			do_compact_test(AddrList, '1-5,100') and
+			do_compact_test(KeyAddrList, '1-5', addrtype='B') and
+			do_compact_test(KeyList, '1-5', addrtype='L'))
+
+	def compact_altcoin(self, name, ut):
+		return (
+			do_compact_test(KeyAddrList, '1-3', coin='BCH', cashaddr=True) and
+			do_compact_test(ViewKeyAddrList, '1-3', coin='XMR', addrtype='M') and
+			do_compact_test(KeyAddrList, '1-3', coin='ZEC', addrtype='Z'))
+
 	def passwd(self, name, ut):
 		return do_test(PasswordList, 'FF4A B716 4513 8F8F', pw_id_str='foo')
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.blockcache: block height index unit tests for the MMGen suite
+"""
+
+import os, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.protocol import init_proto
+from mmgen.tw.blockcache import TwBlockCache
+
+from ..include.common import cfg, vmsg
+
+class FakeRPC:
+
+	def __init__(self, blockcount):
+		self.chain = [f'{n:064x}' for n in range(blockcount + 1)]
+		self.calls = []
+
+	@property
+	def blockcount(self):
+		return len(self.chain) - 1
+
+	async def gathered_call(self, method, args_list):
+		self.calls.append((method, len(args_list)))
+		match method:
+			case 'getblockhash':
+				if any(h > self.blockcount for (h,) in args_list):
+					raise ValueError('Block height out of range')
+				return [self.chain[h] for (h,) in args_list]
+			case 'getblockheader':
+				return [{'time': 1_600_000_000 + self.chain.index(h) * 600} for (h,) in args_list]
+
+def get_cache(tmpdir, rpc, network='mainnet'):
+	c = TwBlockCache(cfg, init_proto(cfg, 'btc', network=network), rpc)
+	c.fn = os.path.join(tmpdir, 'blockcache.json')
+	return c
+
+def get_times(c, heights):
+	c.rpc.calls = []
+	ret = asyncio.run(c.get_times(heights))
+	assert ret == [1_600_000_000 + h * 600 for h in heights], 'wrong block times'
+	vmsg(f'  heights {heights}: RPC calls {c.rpc.calls}')
+	return c.rpc.calls
+
+class unit_tests:
+
+	def cache(self, name, ut):
+		heights = [10, 500, 950, 10, 990]
+		with TemporaryDirectory() as tmpdir:
+			rpc = FakeRPC(1000)
+			assert get_times(get_cache(tmpdir, rpc), heights) == [('getblockhash', 4), ('getblockheader', 4)]
+			# blocks within the reorg horizon are re-fetched, together with the top cached block:
+			assert get_times(get_cache(tmpdir, rpc), heights) == [('getblockhash', 3), ('getblockheader', 2)]
+			assert get_times(get_cache(tmpdir, rpc), heights[:2]) == []
+			# regtest index isn’t saved:
+			get_times(get_cache(tmpdir, rpc, network='regtest'), [20])
+			assert get_times(get_cache(tmpdir, rpc), [20]) == [('getblockhash', 2), ('getblockheader', 1)]
+		return True
+
+	def reorg(self, name, ut):
+		with TemporaryDirectory() as tmpdir:
+			rpc = FakeRPC(1000)
+			get_times(get_cache(tmpdir, rpc), [10, 500])
+			rpc.chain[400:] = [h.replace('0', 'f', 1) for h in rpc.chain[400:]]
+			c = get_cache(tmpdir, rpc)
+			assert get_times(c, [10, 500, 600]) == [
+				('getblockhash', 2), ('getblockheader', 1),  # reorg of block 500 detected
+				('getblockhash', 3), ('getblockheader', 2)]  # discarded blocks re-fetched
+			assert sorted(c.data) == [10, 500, 600]
+		return True
+
+	def shorter_chain(self, name, ut):
+		with TemporaryDirectory() as tmpdir:
+			rpc = FakeRPC(1000)
+			get_times(get_cache(tmpdir, rpc), [10, 500])
+			del rpc.chain[301:] # chain reset or resync: cached blocks above the tip
+			c = get_cache(tmpdir, rpc)
+			assert get_times(c, [10, 150]) == [
+				('getblockhash', 1), ('getblockheader', 1),  # cache discarded without RPC check
+				('getblockhash', 2), ('getblockheader', 1)]  # discarded block re-fetched, with check
+			assert sorted(c.data) == [10, 150]
+			c = get_cache(tmpdir, rpc)
+			c.load()
+			assert sorted(c.data) == [10, 150], 'discarded blocks saved'
+		return True
@@ -6,6 +6,7 @@ test.modtest_d.ecc: elliptic curve unit test for the MMGen suite
 
 from mmgen.proto.secp256k1.secp256k1 import (
 	pubkey_gen,
+	pubkey_gen_batch,
 	pubkey_tweak_add,
 	pubkey_check,
 	pubkey_decompress,
@@ -134,6 +135,24 @@ class unit_tests:
 
 		return True
 
+	def pubkey_batch(self, name, ut):
+		vmsg('  Generating pubkeys in batch mode:')
+		privkeys = [bytes.fromhex(k) for k in (
+			'beadcafe' * 8,
+			f'{1:064x}',
+			f'{secp256k1_group_order-1:x}',
+			f'{123456789 * 2**222:064x}')]
+		for compressed, length in ((False, 65), (True, 33)):
+			vmsg(f'    {compressed=}')
+			res = pubkey_gen_batch(b''.join(privkeys), int(compressed))
+			assert len(res) == len(privkeys) * length
+			for n, privkey in enumerate(privkeys):
+				pubkey = res[n*length:(n+1)*length]
+				vmsg(f'      pubkey:  {pubkey.hex()}')
+				assert pubkey == pubkey_gen(privkey, int(compressed))
+			assert pubkey_gen_batch(bytearray(), int(compressed)) == b''
+		return True
+
 	def pubkey_errors(self, name, ut):
 		vmsg('  Testing error handling for public key ops')
 
@@ -144,6 +163,9 @@ class unit_tests:
 		def gen5(): pubkey_gen(bytes.fromhex('ab'*31), 1)
 		def gen6(): pubkey_gen(bytes.fromhex('ab'*33), 1)
 
+		def batch1(): pubkey_gen_batch(bytes.fromhex('beadcafe'*8) + bytes(32), 1)
+		def batch2(): pubkey_gen_batch(bytes.fromhex('ab'*63), 1)
+
 		pubkey_bytes = pubkey_gen(bytes.fromhex('beadcafe'*8), 1)
 		def tweak1(): pubkey_tweak_add(pubkey_bytes, bytes(32))
 		def tweak2(): pubkey_tweak_add(bytes.fromhex('03'*64), int.to_bytes(1, length=32, byteorder='big'))
@@ -162,6 +184,9 @@ class unit_tests:
 			('len(privkey) == 31',        'ValueError', 'Private key length not 32 bytes',    gen5),
 			('len(privkey) == 33',        'ValueError', 'Private key length not 32 bytes',    gen6),
 
+			('batch: privkey #1 == 0',    'ValueError', 'Private key #1 not in allowable',    batch1),
+			('batch: bad buffer length',  'ValueError', 'not a multiple of 32 bytes',         batch2),
+
 			('tweak == 0',                'ValueError', 'Tweak not in allowable range',       tweak1),
 			('pubkey length == 64',       'ValueError', 'Serialized public key length not',   tweak2),
 
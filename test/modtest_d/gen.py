@@ -77,6 +77,9 @@ def do_test(proto, wif, addr_chk, addr_type, internal_keccak):
 
 		assert addr == addr_chk, f'{addr} != {addr_chk}'
 
+		assert kg.gen_data_batch([privkey, privkey]) == [data, data], 'gen_data_batch() mismatch'
+		assert ag.to_addr_batch([data, data]) == [addr, addr], 'to_addr_batch() mismatch'
+
 	cfg.use_internal_keccak_module = False
 
 def do_tests(coin, internal_keccak=False):
@@ -87,7 +90,7 @@ def do_tests(coin, internal_keccak=False):
 
 class unit_tests:
 
-	altcoin_deps = ('eth', 'xmr', 'zec')
+	altcoin_deps = ('eth', 'xmr', 'xmr_b58', 'xmr_batch', 'zec')
 
 	def btc(self, name, ut):
 		return do_tests('btc')
@@ -101,5 +104,94 @@ class unit_tests:
 			do_tests('xmr')
 		return do_tests('xmr', internal_keccak=True)
 
+	def xmr_b58(self, name, ut):
+		import os
+		from mmgen.baseconv import baseconv
+		from mmgen.proto.xmr.common import b58enc, b58dec, enc_block_lens
+		bc = baseconv('b58')
+		def b58enc_ref(data):
+			return ''.join(
+				bc.frombytes(data[i:i+8], pad=enc_block_lens[len(data[i:i+8])], tostr=True)
+					for i in range(0, len(data), 8))
+		for n in list(range(1, 33)) + [69, 77]:
+			data = os.urandom(n)
+			enc = b58enc(data)
+			assert enc == b58enc_ref(data), f'{data.hex()}: encodings differ'
+			assert b58dec(enc) == data, f'{data.hex()}: round trip failed'
+		assert b58enc(bytes(8)) == '1' * 11 and b58enc(b'\xff' * 8) == 'jpXCZedGfVQ'
+		for bad in ('jpXCZedGfVR', '1111', '0' * 11, 'I' * 11):
+			try:
+				b58dec(bad)
+			except ValueError as e:
+				qmsg(f'  {bad}: {e}')
+			else:
+				raise AssertionError(f'{bad}: invalid string decoded without error')
+		return True
+
+	def xmr_batch(self, name, ut):
+		import os, time
+		from mmgen.keygen import keygen_base
+		from mmgen.baseconv import baseconv
+		from mmgen.proto.xmr import addrgen, common
+		proto = init_proto(cfg, 'xmr')
+		kg = KeyGenerator(cfg, proto, 'monero', silent=True)
+		ag = AddrGenerator(cfg, proto, 'monero')
+		privkeys = [PrivKey(proto, os.urandom(32), compressed=False, pubkey_type='monero') for _ in range(1000)]
+		ag.to_addr_batch(kg.gen_data_batch(privkeys[:10])) # warm up
+		t_start = time.time()
+		addrs = ag.to_addr_batch(kg.gen_data_batch(privkeys))
+		t_new = time.time() - t_start
+		# previous code path: viewkey computed twice, general-purpose base58 coder
+		bc = baseconv('b58')
+		def b58enc_ref(data):
+			l = len(data)
+			return ''.join(bc.frombytes(data[i:i+8], pad=11, tostr=True) for i in range(0, l - l%8, 8)) + (
+				bc.frombytes(data[l-l%8:], pad=7, tostr=True))
+		# CoinAddr() validates the address with proto.decode_addr(), which calls common.b58dec():
+		def b58dec_ref(s):
+			ndec[0] += 1
+			l = len(s)
+			return b''.join(bc.tobytes(s[i:i+11], pad=8) for i in range(0, l - l%11, 11)) + (
+				bc.tobytes(s[-(l%11):], pad=5))
+		ndec = [0]
+		saved = (addrgen.b58enc, common.b58dec)
+		addrgen.b58enc, common.b58dec = (b58enc_ref, b58dec_ref)
+		try:
+			t_start = time.time()
+			ref = [ag.to_addr(keygen_base.gen_data(kg, pk)) for pk in privkeys]
+			t_ref = time.time() - t_start
+		finally:
+			addrgen.b58enc, common.b58dec = saved
+		assert addrs == ref, 'addresses differ'
+		n = len(privkeys)
+		assert ndec[0] == n, 'previous decoder not used'
+		qmsg(f'  {n} addresses: {n/t_ref:.0f}/s (previous), {n/t_new:.0f}/s (batched), speedup {t_ref/t_new:.1f}x')
+		return True
+
 	def zec(self, name, ut):
 		return do_tests('zec')
+
+	def zec_sha256_compress(self, name, ut):
+		import os, time
+		from mmgen.proto.zec.keygen import get_sha256_compress_func, sha256_compress_python
+		compress = get_sha256_compress_func()
+		if compress is sha256_compress_python:
+			ut.skip_msg('native SHA-256 compression function (extension module unavailable)')
+			return True
+		for nblks in (1, 2, 5):
+			for _ in range(20):
+				data = os.urandom(64 * nblks)
+				assert compress(data) == sha256_compress_python(data), f'{data.hex()}: digests differ'
+		# key generation with native and pure-Python compression:
+		proto = init_proto(cfg, 'zec')
+		kg = KeyGenerator(cfg, proto, 'zcash_z', silent=True)
+		privkeys = [PrivKey(proto, os.urandom(32), compressed=True, pubkey_type='zcash_z') for _ in range(200)]
+		t_start = time.time()
+		ref = kg.gen_data_batch(privkeys)
+		t_native = time.time() - t_start
+		kg.sha256_compress = sha256_compress_python
+		t_start = time.time()
+		assert kg.gen_data_batch(privkeys) == ref, 'key data differs'
+		t_python = time.time() - t_start
+		qmsg(f'  {len(privkeys)} keys: {t_native:.3f}s (native), {t_python:.3f}s (Python), speedup {t_python/t_native:.0f}x')
+		return True
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.incogscan: incog data scanner unit tests for the MMGen suite
+"""
+
+import os
+from hashlib import sha256
+
+from mmgen.incogscan import IncogScanner, IncogScanWorker, get_prefix_scan_func, prefix_scan_python
+
+from ..include.common import vmsg
+
+def legacy_find_incog_data(fn, incog_id):
+	"the original ‘find_incog_data’ algorithm, generalized to IDs of any length"
+	ivsize, bsize = (16, 4096)
+	carry = b' ' * ivsize
+	with open(fn, 'rb') as fh:
+		n = 0
+		while d := fh.read(bsize):
+			d = carry + d
+			for i in range(bsize):
+				if sha256(d[i:i+ivsize]).hexdigest()[:len(incog_id)].upper() == incog_id:
+					if n+i >= ivsize:
+						yield n+i-ivsize
+			carry = d[len(d)-ivsize:]
+			n += bsize
+
+def scan(fn, incog_id, *, jobs, task_size=None, win_size=None):
+	saved = (IncogScanner.task_size, IncogScanWorker.win_size)
+	IncogScanner.task_size = task_size or saved[0]
+	IncogScanWorker.win_size = win_size or saved[1]
+	try:
+		return list(IncogScanner(fn, incog_id, jobs=jobs, silent=True).run())
+	finally:
+		IncogScanner.task_size, IncogScanWorker.win_size = saved
+
+class unit_tests:
+
+	def prefix_scan_ext(self, name, ut):
+		if not (func := get_prefix_scan_func()):
+			ut.skip_msg('sha256_prefix_scan() extension function')
+			return True
+		data = os.urandom(100000)
+		for msg_len in (1, 16, 55):
+			prefix = sha256(data[7:7+msg_len]).digest()[:1]
+			res = func(data, msg_len, prefix)
+			vmsg(f'  msg_len={msg_len:<2} matches={len(res)}')
+			assert 7 in res
+			assert res == prefix_scan_python(memoryview(data), msg_len, prefix)
+		return True
+
+	def legacy_compat(self, name, ut):
+		tmpdir = os.path.join('test', 'tmp')
+		fn = os.path.join(tmpdir, 'incogscan.bin')
+		os.makedirs(tmpdir, exist_ok=True)
+		# one-byte IDs ensure many matches, including in truncated IVs at end of data:
+		for size in (0, 10, 16, 17, 4096, 4112, 4113, 3 * 4096, 3 * 4096 + 100, 20000):
+			with open(fn, 'wb') as fh:
+				fh.write(os.urandom(size))
+			for incog_id in ('A7', 'E3'): # E3: hash of empty IV
+				ref = list(legacy_find_incog_data(fn, incog_id))
+				assert scan(fn, incog_id, jobs=1) == ref, f'size {size}: single-process results differ'
+				assert scan(fn, incog_id, jobs=2, task_size=5000, win_size=1000) == ref, (
+					f'size {size}: multi-process results differ')
+			vmsg(f'  size {size:<5} OK ({len(ref)} matches)')
+		os.unlink(fn)
+		return True
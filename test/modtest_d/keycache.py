@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.keycache: key-address cache unit tests for the MMGen suite
+"""
+
+import time
+
+from mmgen.seed import Seed
+from mmgen.protocol import init_proto
+from mmgen.addrlist import AddrIdxList, KeyAddrList, ViewKeyAddrList
+from mmgen.keycache import KeyAddrCache
+
+from ..include.common import cfg, vmsg, silence, end_silence
+
+seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+
+def gen_direct(proto, idx_spec, mmtype, al_cls=KeyAddrList, **kwargs):
+	return al_cls(
+		cfg,
+		proto,
+		seed      = seed,
+		addr_idxs = AddrIdxList(fmt_str=idx_spec),
+		mmtype    = mmtype,
+		skip_chksum_msg = True,
+		**kwargs)
+
+def check_lists(a, b):
+	assert a.al_id == b.al_id, f'{a.al_id} != {b.al_id}'
+	assert a.chksum == b.chksum, f'{a.chksum} != {b.chksum}'
+	assert a.id_str == b.id_str, f'{a.id_str} != {b.id_str}'
+
+class unit_tests:
+
+	altcoin_deps = ('viewkeyaddr',)
+
+	def keyaddr(self, name, ut):
+		KeyAddrCache.wipe()
+		proto = init_proto(cfg, 'btc')
+		c = KeyAddrCache(cfg, proto, seed, 'C')
+		al = c.get('1-5')
+		check_lists(al, gen_direct(proto, '1-5', 'C'))
+		saved = dict(c.data)
+		# only missing entries are generated:
+		al = c.get('3-8,1000')
+		check_lists(al, gen_direct(proto, '3-8,1000', 'C'))
+		assert all(c.data[i] is saved[i] for i in (3, 4, 5)), 'cached entries regenerated'
+		# returned entries are copies:
+		al.set_comment(3, 'changed')
+		assert al.comment(3) == 'changed' and c.data[3].comment is None, 'cached entry modified'
+		assert c.get('3').comment(3) is None
+		assert sorted(c.data) == list(range(1, 9)) + [1000]
+		# separate entries for each address type and network:
+		assert not KeyAddrCache(cfg, proto, seed, 'B').data
+		assert not KeyAddrCache(cfg, init_proto(cfg, 'btc', network='testnet'), seed, 'C').data
+		# entries regenerated when P2PKH addresses requested:
+		al = KeyAddrCache(cfg, proto, seed, 'S').get('1-3', skip_chksum=True)
+		assert al.chksum is None and al.data[0].addr_p2pkh is None
+		al = KeyAddrCache(cfg, proto, seed, 'S').get('1-3', add_p2pkh=True)
+		check_lists(al, gen_direct(proto, '1-3', 'S', add_p2pkh=True))
+		assert al.data[0].addr_p2pkh
+		KeyAddrCache.wipe()
+		assert not KeyAddrCache.cache and not c.data, 'cache not wiped'
+		return True
+
+	def viewkeyaddr(self, name, ut):
+		KeyAddrCache.wipe()
+		proto = init_proto(cfg, 'xmr')
+		c = KeyAddrCache(cfg, proto, seed)
+		check_lists(c.get('1-3'), gen_direct(proto, '1-3', 'M'))
+		check_lists(c.get('1-3', al_cls=ViewKeyAddrList), gen_direct(proto, '1-3', 'M', al_cls=ViewKeyAddrList))
+		KeyAddrCache.wipe()
+		return True
+
+	def timing(self, name, ut):
+		KeyAddrCache.wipe()
+		proto = init_proto(cfg, 'btc')
+		ntx = 10
+		silence()
+		t_start = time.time()
+		for _ in range(ntx):
+			gen_direct(proto, '1-200', 'C', skip_chksum=True)
+		t_direct = time.time() - t_start
+		t_start = time.time()
+		for _ in range(ntx):
+			KeyAddrCache(cfg, proto, seed, 'C').get('1-200', skip_chksum=True)
+		t_cached = time.time() - t_start
+		end_silence()
+		vmsg(f'  {ntx} lists of 200 keys: {t_direct:.3f}s (uncached), {t_cached:.3f}s (cached)')
+		KeyAddrCache.wipe()
+		return True
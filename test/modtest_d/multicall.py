@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.multicall: Multicall token balance aggregation unit tests for the MMGen suite
+"""
+
+import asyncio
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.proto.eth.contract import Token, Multicall
+
+from ..include.common import cfg, vmsg
+
+token_addr = 'deadbeef' * 5
+failing_addr = 'ff' * 20
+
+mc_addr = 'ca11bde05977b3631167028862be2a173976ca11'
+
+# Multicall is opt-in:
+mc_cfg = Config({'_clone': cfg, 'eth_mainnet_multicall_addr': mc_addr})
+devnet_cfg = Config({'_clone': cfg, 'eth_devnet_multicall_addr': mc_addr})
+
+def word(n):
+	return f'{n:064x}'
+
+class FakeRPC:
+	"""
+	Token and Multicall3 contract emulation, decoding calldata independently of
+	the code under test
+	"""
+	class daemon:
+		id = 'geth'
+
+	def __init__(self, proto, balances, *, multicall_deployed):
+		self.proto = proto
+		self.balances = balances
+		self.multicall_deployed = multicall_deployed
+		self.calls = []
+
+	def balance_of(self, data):
+		assert data[:8] == '70a08231', 'wrong balanceOf() selector'
+		addr = data[8+24:8+64]
+		if addr == failing_addr:
+			return None
+		return word(self.balances[addr])
+
+	def aggregate3(self, data):
+		assert data[:8] == '82ad56cb', 'wrong aggregate3() selector'
+		d = bytes.fromhex(data[8:])
+		def w(pos):
+			return int.from_bytes(d[pos:pos+32], 'big')
+		arr = w(0)
+		results = []
+		for n in range(w(arr)):
+			item = arr + 32 + w(arr + 32 + 32 * n)
+			assert d[item+12:item+32].hex() == token_addr, 'wrong target'
+			assert w(item + 32) == 1, 'allowFailure not set'
+			cd = item + w(item + 64)
+			ret = self.balance_of(d[cd+32:cd+32+w(cd)].hex())
+			results.append((0, '') if ret is None else (1, ret))
+		# encode (bool success, bytes returnData)[]:
+		items = [word(ok) + word(64) + word(len(ret) // 2) + ret for ok, ret in results]
+		offsets, pos = [], 32 * len(items)
+		for i in items:
+			offsets.append(pos)
+			pos += len(i) // 2
+		return '0x' + word(32) + word(len(items)) + ''.join(map(word, offsets)) + ''.join(items)
+
+	async def call(self, method, *args):
+		self.calls.append(method)
+		match method:
+			case 'eth_getCode':
+				return '0x' + ('6080604052' if self.multicall_deployed else '')
+			case 'eth_call':
+				args, block = args
+				assert block == 'latest'
+				data = args['input'][2:]
+				if args['to'] == '0x' + self.proto.multicall_addr:
+					return self.aggregate3(data)
+				assert args['to'] == '0x' + token_addr
+				if (ret := self.balance_of(data)) is None:
+					raise ValueError('execution reverted')
+				return '0x' + ret
+
+	async def gathered_call(self, method, args_list):
+		return [await self.call(method, *args) for args in args_list]
+
+def run_test(network, *, multicall_deployed, naddrs, chunk_size=None, multicall=True, test_cfg=None):
+	proto = init_proto(test_cfg or (mc_cfg if multicall else cfg), 'eth', network=network, need_amt=True)
+	addrs = [f'{n:040x}' for n in range(1, naddrs + 1)]
+	rpc = FakeRPC(proto, {a: n * 10**16 for n, a in enumerate(addrs, 1)}, multicall_deployed=multicall_deployed)
+	token = Token(cfg, proto, token_addr, rpc=rpc, decimals=18)
+	Multicall.deployed.clear()
+	if chunk_size:
+		Multicall.chunk_size, saved_chunk_size = chunk_size, Multicall.chunk_size
+	try:
+		res = asyncio.run(token.get_balances(addrs))
+	finally:
+		if chunk_size:
+			Multicall.chunk_size = saved_chunk_size
+	assert res == [proto.coin_amt(n * 10**16, from_unit='wei') for n in range(1, naddrs + 1)], 'wrong balances'
+	vmsg(f'  {network:8} deployed={multicall_deployed!s:5} addrs={naddrs:<3} RPC calls: {" ".join(rpc.calls)}')
+	return rpc.calls
+
+class unit_tests:
+
+	def aggregate(self, name, ut):
+		assert run_test('mainnet', multicall_deployed=True, naddrs=100) == ['eth_getCode', 'eth_call']
+		calls = run_test('mainnet', multicall_deployed=True, naddrs=100, chunk_size=30)
+		assert calls == ['eth_getCode'] + ['eth_call'] * 4, 'wrong number of chunks'
+		return True
+
+	def fallback(self, name, ut):
+		assert run_test('mainnet', multicall_deployed=False, naddrs=5) == ['eth_getCode'] + ['eth_call'] * 5
+		assert run_test('regtest', multicall_deployed=True, naddrs=5) == ['eth_call'] * 5
+		assert run_test('mainnet', multicall_deployed=True, naddrs=1) == ['eth_call']
+		# disabled by default:
+		assert run_test('mainnet', multicall_deployed=True, naddrs=5, multicall=False) == ['eth_call'] * 5
+		return True
+
+	def network(self, name, ut):
+		# devnet option (as in the ethdev cmdtest) applies to the regtest network only:
+		for network, addr in (('mainnet', ''), ('testnet', ''), ('regtest', mc_addr)):
+			assert init_proto(devnet_cfg, 'eth', network=network).multicall_addr == addr, network
+		assert init_proto(cfg, 'eth').get_opt_clsval(cfg, 'eth_devnet_multicall_addr') == ''
+		assert run_test('regtest', multicall_deployed=True, naddrs=5, test_cfg=devnet_cfg) == ['eth_getCode', 'eth_call']
+		assert run_test('mainnet', multicall_deployed=True, naddrs=5, test_cfg=devnet_cfg) == ['eth_call'] * 5
+		return True
+
+	def failed_call(self, name, ut):
+		proto = init_proto(mc_cfg, 'eth', need_amt=True)
+		rpc = FakeRPC(proto, {'00' * 19 + '01': 1}, multicall_deployed=True)
+		token = Token(cfg, proto, token_addr, rpc=rpc, decimals=18)
+		Multicall.deployed.clear()
+		try:
+			asyncio.run(token.get_balances(['00' * 19 + '01', failing_addr]))
+		except ValueError as e:
+			vmsg(f'  failed call retried separately: {e}')
+		else:
+			raise AssertionError('failed call not retried')
+		assert rpc.calls == ['eth_getCode', 'eth_call', 'eth_call']
+		return True
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.rescanplan: blockchain rescan planner unit tests for the MMGen suite
+"""
+
+import os, time, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.proto.btc.tw.rescan import BitcoinRescanPlanner
+
+from ..include.common import vmsg, silence, end_silence
+
+class FakeRPC:
+
+	twname = 'test-wallet'
+
+	def __init__(self, block_secs=0, fail_at=None):
+		self.block_secs = block_secs
+		self.fail_at = fail_at
+		self.calls = []
+
+	async def call(self, method, start, stop, timeout):
+		assert method == 'rescanblockchain'
+		if self.fail_at is not None and start <= self.fail_at <= stop:
+			raise KeyboardInterrupt
+		self.calls.append((start, stop))
+		time.sleep((stop - start + 1) * self.block_secs)
+		return {'start_height': start, 'stop_height': stop}
+
+def get_planner(tmpdir, rpc, test_suite=False):
+	c = Config({'data_dir': tmpdir, 'test_suite': test_suite})
+	return BitcoinRescanPlanner(c, init_proto(c, 'btc'), rpc)
+
+class unit_tests:
+
+	def merge(self, name, ut):
+		with TemporaryDirectory() as tmpdir:
+			p = get_planner(tmpdir, FakeRPC())
+			blocks = [900, 5, 6, 8, 20, 30, 31, 100, 104, 900]
+			p.block_secs = 0.05 # max_gap = 4 blocks
+			res = p.merge_blocks(blocks)
+			vmsg(f'  max_gap {p.max_gap}: {res}')
+			assert res == [(5, 8), (20, 20), (30, 31), (100, 104), (900, 900)]
+			p.block_secs = 1 # max_gap = 0: only adjacent blocks merged
+			assert p.merge_blocks(blocks) == [(5, 6), (8, 8), (20, 20), (30, 31), (100, 100), (104, 104), (900, 900)]
+			p.block_secs = 0.01 # max_gap = 20
+			assert p.merge_blocks(blocks) == [(5, 31), (100, 104), (900, 900)]
+			silence()
+			p.print_plan(p.merge_blocks(blocks))
+			end_silence()
+		return True
+
+	def chunks(self, name, ut):
+		with TemporaryDirectory() as tmpdir:
+			rpc = FakeRPC(block_secs=0.0002)
+			p = get_planner(tmpdir, rpc)
+			p.call_secs = 0
+			p.chunk_secs = 1
+			silence()
+			asyncio.run(p.rescan_range(0, 4999, key=(0, 4999)))
+			end_silence()
+			sizes = [b - a + 1 for a, b in rpc.calls]
+			vmsg(f'  chunk sizes: {sizes}, block_secs: {p.block_secs:.5f}')
+			assert sizes[0] == 100 and max(sizes) > 100, 'chunk size not adapted'
+			assert rpc.calls[-1][1] == 4999 and all(
+				rpc.calls[i][1] + 1 == rpc.calls[i+1][0] for i in range(len(rpc.calls) - 1))
+			assert 0.0001 < p.block_secs < 0.005
+			# per-block time is saved:
+			assert get_planner(tmpdir, rpc).block_secs == p.block_secs
+			# fixed chunk size in test suite:
+			rpc.calls = []
+			silence()
+			asyncio.run(get_planner(tmpdir, rpc, test_suite=True).rescan_range(0, 349, key=(0, 349)))
+			end_silence()
+			assert rpc.calls == [(0, 99), (100, 199), (200, 299), (300, 349)]
+		return True
+
+	def resume(self, name, ut):
+		with TemporaryDirectory() as tmpdir:
+			p = get_planner(tmpdir, FakeRPC(fail_at=250), test_suite=True)
+			silence()
+			try:
+				asyncio.run(p.rescan_range(0, 499, key=(0, None)))
+			except KeyboardInterrupt:
+				pass
+			end_silence()
+			assert p.rpc.calls == [(0, 99), (100, 199)]
+			p = get_planner(tmpdir, FakeRPC())
+			assert p.get_resume_block(0, None) == 200
+			assert p.get_resume_block(0, 499) is None, 'checkpoint of different rescan used'
+			p.done()
+			assert get_planner(tmpdir, FakeRPC()).get_resume_block(0, None) is None
+			assert os.listdir(os.path.join(tmpdir, 'rescan')) == ['btc-test-wallet.json']
+		return True
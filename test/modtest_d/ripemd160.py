@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.ripemd160: RIPEMD-160 and HASH160 unit tests for the MMGen suite
+"""
+
+import os, time, hashlib
+
+from mmgen.contrib.ripemd160 import ripemd160 as ripemd160_python
+from mmgen.proto.btc.common import hash160, hash160_batch
+
+from ..include.common import vmsg
+
+# from https://homes.esat.kuleuven.be/~bosselae/ripemd160.html
+vectors = (
+	(b'', '9c1185a5c5e9fc54612808977ee8f548b2258d31'),
+	(b'abc', '8eb208f7e05d987a9b044a8e98c6b087f15a0bfc'),
+	(b'message digest', '5d0689ef49d2fae572b881b123a85ffa21595f36'),
+	(b'abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq', '12a053384a9c0c88e405a06c27dcf49ada62eb2b'),
+	(b'1234567890' * 8, '9b752e45573d4b39f4dbd3323cab82bf63326bfb'),
+	(b'a' * 1000000, '52783243c1697bdbe16d37f97f68f08325dc1528'))
+
+def get_ext_funcs(ut):
+	try:
+		from mmgen.proto.secp256k1.secp256k1 import ripemd160, hash160_batch
+	except ImportError:
+		ut.skip_msg('native RIPEMD-160 (extension module unavailable)')
+		return (None, None)
+	return (ripemd160, hash160_batch)
+
+class unit_tests:
+
+	def wrapper(self, name, ut):
+		from mmgen.util import wrap_ripemd160
+		called = wrap_ripemd160.__defaults__[0]
+		saved = (hashlib.new, called.copy())
+		def new_without_ripemd160(name, *args, **kwargs):
+			if name == 'ripemd160':
+				raise ValueError('unsupported hash type')
+			return saved[0](name, *args, **kwargs)
+		hashlib.new = new_without_ripemd160
+		called.clear()
+		try:
+			desc = wrap_ripemd160()
+			vmsg(f'  using {desc} implementation')
+			assert desc and wrap_ripemd160() is None, 'implementation not reported once'
+			for h in (hashlib.new('ripemd160', b'abc', usedforsecurity=False), ripemd160_python(b'abc')):
+				assert h.hexdigest() == vectors[1][1] and h.digest().hex() == vectors[1][1]
+				assert (h.name, h.digest_size) == ('ripemd160', 20)
+				for method in (h.update, h.copy):
+					try:
+						method(b'')
+					except NotImplementedError:
+						pass
+					else:
+						raise AssertionError(f'{method.__name__}(): NotImplementedError not raised')
+			assert hashlib.new('sha256', b'abc', usedforsecurity=False).digest() == hashlib.sha256(b'abc').digest()
+		finally:
+			hashlib.new = saved[0]
+			called[:] = saved[1]
+		return True
+
+	def ripemd160(self, name, ut):
+		ripemd160, _ = get_ext_funcs(ut)
+		if not ripemd160:
+			return True
+		for data, chk in vectors:
+			assert ripemd160(data).hex() == chk, f'{data[:16]}...: digest mismatch'
+		for n in range(200):
+			data = os.urandom(n)
+			assert ripemd160(data) == ripemd160_python(data).digest(), f'{data.hex()}: digest mismatch'
+		return True
+
+	def hash160_batch(self, name, ut):
+		_, hash160_batch_ext = get_ext_funcs(ut)
+		for msg_len in (33, 65):
+			pubkeys = [os.urandom(msg_len) for _ in range(5000)]
+			t_start = time.time()
+			ref = [hash160(pubkey) for pubkey in pubkeys]
+			t_single = time.time() - t_start
+			t_start = time.time()
+			assert hash160_batch(pubkeys) == ref, 'hash160_batch() mismatch'
+			t_batch = time.time() - t_start
+			vmsg(f'  {len(pubkeys)} {msg_len}-byte pubkeys: {t_single:.4f}s (hash160), {t_batch:.4f}s (batch)')
+		assert hash160_batch([]) == []
+		if hash160_batch_ext:
+			try:
+				hash160_batch_ext(bytes(34), 33)
+			except ValueError as e:
+				vmsg(f'  {e}')
+			else:
+				raise AssertionError('bad buffer length not detected')
+		t_start = time.time()
+		ref = [ripemd160_python(hashlib.sha256(pubkey).digest()).digest() for pubkey in pubkeys[:500]]
+		t_python = time.time() - t_start
+		assert ref == hash160_batch(pubkeys[:500])
+		vmsg(f'  500 pubkeys, pure-Python ripemd160: {t_python:.4f}s')
+		return True
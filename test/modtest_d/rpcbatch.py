@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.rpcbatch: JSON-RPC batch request unit tests for the MMGen suite
+"""
+
+import json, asyncio
+
+from mmgen.cfg import Config
+from mmgen.exception import RPCFailure
+from mmgen.rpc.local import RPCClient
+
+from ..include.common import cfg, vmsg
+
+class FakeBackend:
+	"""
+	backend answering ‘echo’ calls with their params and ‘fail’ calls with an
+	error, recording the number of calls in each request
+	"""
+	def __init__(self, *, batch_resp=None):
+		self.batch_resp = batch_resp # function modifying (text, status) of batch responses
+		self.requests = []
+
+	def resp(self, req):
+		if req['method'] == 'fail':
+			return {'jsonrpc': '2.0', 'error': {'code': -1, 'message': f'failed: {req["params"][0]}'}, 'id': req['id']}
+		return {'jsonrpc': '2.0', 'result': req['params'], 'id': req['id']}
+
+	async def run(self, *, payload, timeout, host_path):
+		if isinstance(payload, list):
+			self.requests.append(len(payload))
+			ret = (json.dumps([self.resp(req) for req in reversed(payload)]), 200)
+			return self.batch_resp(*ret) if self.batch_resp else ret
+		else:
+			self.requests.append(1)
+			return (json.dumps(self.resp(payload)), 200)
+
+class FakeRPC(RPCClient):
+
+	has_batch = True
+
+	def __init__(self, backend, batch_size):
+		super().__init__(Config({'_clone': cfg, 'rpc_batch_size': batch_size}), 'localhost', 0, test_connection=False)
+		self.backend = backend
+
+	def make_host_path(self, wallet):
+		return '/'
+
+def run(rpc, method, args_list):
+	return asyncio.run(rpc.gathered_call(method, args_list))
+
+def get_error(rpc, method, args_list):
+	try:
+		run(rpc, method, args_list)
+	except RPCFailure as e:
+		vmsg(f'  {type(e).__name__}: {e}')
+		return str(e)
+	raise AssertionError('RPC error not raised')
+
+args_list = [(n,) for n in range(10)]
+results = [[n] for n in range(10)]
+
+class unit_tests:
+
+	def batch(self, name, ut):
+		# results in order of calls, though daemon responds in reverse order:
+		rpc = FakeRPC(FakeBackend(), 4)
+		assert run(rpc, 'echo', args_list) == results
+		assert rpc.backend.requests == [4, 4, 2], rpc.backend.requests
+		assert rpc.has_batch
+		# mixed methods:
+		assert run(rpc, None, [('echo', (1,)), ('echo', (2, 3))]) == [[1], [2, 3]]
+		# batching disabled:
+		rpc = FakeRPC(FakeBackend(), 1)
+		assert run(rpc, 'echo', args_list) == results
+		assert rpc.backend.requests == [1] * 10
+		return True
+
+	def fallback(self, name, ut):
+		for desc, batch_resp in (
+				('non-200 status', lambda text, status: ('Method not found', 404)),
+				('non-list response', lambda text, status: (json.dumps(json.loads(text)[0]), status)),
+				('missing id', lambda text, status: (json.dumps(json.loads(text)[1:]), status))):
+			vmsg(f'  {desc}')
+			rpc = FakeRPC(FakeBackend(batch_resp=batch_resp), 4)
+			assert run(rpc, 'echo', args_list) == results
+			# first batch sent in one request, remaining ones as single calls:
+			assert rpc.backend.requests == [4, 4, 2] + [1] * 10, rpc.backend.requests
+			assert not rpc.has_batch, 'batch requests not disabled'
+			rpc.backend.requests.clear()
+			assert run(rpc, 'echo', args_list) == results
+			assert rpc.backend.requests == [1] * 10, rpc.backend.requests
+		return True
+
+	def errors(self, name, ut):
+		cmd_list = [('echo', (1,)), ('fail', (2,)), ('echo', (3,))]
+		# batch error is reported as for a single call:
+		rpc = FakeRPC(FakeBackend(), 4)
+		e_batch = get_error(rpc, None, cmd_list)
+		assert rpc.backend.requests == [3] and rpc.has_batch
+		rpc = FakeRPC(FakeBackend(), 1)
+		e_single = get_error(rpc, None, cmd_list)
+		assert e_batch == e_single == 'failed: 2', (e_batch, e_single)
+		return True
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.rpcpool: connection pool RPC backend unit tests for the MMGen suite
+"""
+
+import json, time, asyncio, threading
+from types import SimpleNamespace
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from mmgen.cfg import Config
+
+from ..include.common import cfg, vmsg
+
+class StubServer(ThreadingHTTPServer):
+	"""
+	JSON-RPC stub server recording the number of requests, connections and
+	maximum number of concurrently handled requests
+	"""
+	daemon_threads = True
+
+	def __init__(self, delay=0):
+		self.delay = delay
+		self.lock = threading.Lock()
+		self.requests = 0
+		self.active = 0
+		self.max_active = 0
+		self.clients = set()
+		self.drop_next = False  # close the connection without responding
+		self.close_next = False # close the connection after responding, without notice
+		super().__init__(('127.0.0.1', 0), StubHandler)
+		threading.Thread(target=self.serve_forever, daemon=True).start()
+
+class StubHandler(BaseHTTPRequestHandler):
+
+	protocol_version = 'HTTP/1.1' # keep-alive
+
+	def log_message(self, *args):
+		pass
+
+	def do_POST(self):
+		srv = self.server
+		req = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+		with srv.lock:
+			srv.requests += 1
+			srv.clients.add(self.client_address)
+			srv.active += 1
+			srv.max_active = max(srv.max_active, srv.active)
+			drop, srv.drop_next = (srv.drop_next, False)
+			close, srv.close_next = (srv.close_next, False)
+		time.sleep(srv.delay)
+		with srv.lock:
+			srv.active -= 1
+		if drop:
+			self.close_connection = True
+			return
+		data = json.dumps({'result': req['params'], 'error': None, 'id': req['id']}).encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+		self.close_connection = close
+
+def get_backend(srv, pool_size):
+	from mmgen.rpc import util
+	if not cfg.debug_rpc: # as in RPCClient.__init__(), before backend is imported
+		util.dmsg_rpc = util.dmsg_rpc_backend = util.noop
+	from mmgen.rpc.backends.pool import pool
+	host, port = srv.server_address
+	return pool(SimpleNamespace(
+		cfg       = Config({'_clone': cfg, 'rpc_pool_size': pool_size}),
+		host      = host,
+		port      = port,
+		proxy     = None,
+		host_url  = f'http://{host}:{port}',
+		timeout   = 10,
+		http_hdrs = {'Content-Type': 'application/json'},
+		auth_type = None))
+
+def call(backend, n):
+	return backend.run_noasync({'method': 'echo', 'params': [n], 'id': n}, None, '/')
+
+def check_resp(resp, n):
+	text, status = resp
+	assert status == 200 and json.loads(text)['result'] == [n], f'bad response {resp}'
+
+class unit_tests:
+
+	def concurrency(self, name, ut):
+
+		async def run_all(backend, ncalls):
+			return await asyncio.gather(*(
+				backend.run({'method': 'echo', 'params': [n], 'id': n}, None, '/') for n in range(ncalls)))
+
+		for pool_size in (1, 4):
+			srv = StubServer(delay=0.05)
+			backend = get_backend(srv, pool_size)
+			assert backend.pool_size == pool_size and backend.idle.qsize() == pool_size
+			for rnd in range(2):
+				for n, resp in enumerate(asyncio.run(run_all(backend, 12))):
+					check_resp(resp, n)
+			vmsg(f'  pool size {pool_size}: {srv.requests} requests, {len(srv.clients)} connections, '
+				f'max {srv.max_active} concurrent')
+			assert srv.requests == 24
+			assert srv.max_active <= pool_size, f'{srv.max_active} concurrent requests'
+			assert pool_size == 1 or srv.max_active > 1, 'requests not run concurrently'
+			assert len(srv.clients) <= pool_size, 'connections not reused'
+			srv.shutdown()
+		return True
+
+	def dropped(self, name, ut):
+		from mmgen.exception import RPCFailure
+		srv = StubServer()
+		backend = get_backend(srv, 1)
+
+		# kept-alive connection closed by the server while idle: reconnected before sending
+		srv.close_next = True
+		check_resp(call(backend, 1), 1)
+		time.sleep(0.1)
+		check_resp(call(backend, 2), 2)
+		assert srv.requests == 2 and len(srv.clients) == 2
+
+		# connection dropped after the request was sent: the request is not resent
+		srv.drop_next = True
+		try:
+			call(backend, 3)
+		except RPCFailure as e:
+			vmsg(f'  {type(e).__name__}: {e}')
+		else:
+			raise AssertionError('dropped connection not detected')
+		assert srv.requests == 3, f'request sent {srv.requests - 2} times'
+
+		check_resp(call(backend, 4), 4)
+		assert srv.requests == 4
+		srv.shutdown()
+		return True
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.twbalances: tracking wallet bulk balance unit tests for the MMGen suite
+"""
+
+import asyncio
+from decimal import Decimal
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.tw.ctl import TwCtl
+from mmgen.tw.shared import TwLabel
+from mmgen.proto.eth.tw.ctl import EthereumTokenTwCtl
+from mmgen.proto.eth.contract import Multicall
+
+from ..include.common import vmsg
+
+addrs = [f'{n:040x}' for n in range(1, 6)] # addrs[3:] not in tracking wallet
+token = f'{0xdead:040x}'
+
+# balances in wallet: zero, non-zero and none
+stored_bals = {addrs[0]: '0', addrs[1]: '1.5'}
+stored_token_bals = {addrs[0]: '0', addrs[1]: '7'}
+
+# balances on chain, in wei and token units: zero and non-zero for addresses in and not in wallet
+chain_bals = dict(zip(addrs, (0, 2 * 10**18, 3 * 10**17, 0, 5)))
+chain_token_bals = dict(zip(addrs, (4 * 10**18, 0, 10**18, 6, 0)))
+
+class FakeRPC:
+	"""
+	answer eth_getBalance and token balanceOf() calls, recording the RPC methods called
+	"""
+	class daemon:
+		id = 'geth'
+
+	def __init__(self):
+		self.calls = []
+
+	async def do_call(self, method, *args):
+		match method:
+			case 'eth_getBalance':
+				return hex(chain_bals[args[0][2:]])
+			case 'eth_getCode': # Multicall contract not deployed (if enabled)
+				return '0x'
+			case 'eth_call':
+				args, block = args
+				assert args['to'] == '0x' + token and args['input'][2:10] == '70a08231', 'not a balanceOf() call'
+				return '0x' + f'{chain_token_bals[args["input"][-40:]]:064x}'
+
+	async def call(self, method, *args):
+		self.calls.append(method)
+		return await self.do_call(method, *args)
+
+	async def gathered_call(self, method, args_list):
+		self.calls.append(f'gathered:{method}')
+		return [await self.do_call(method, *args) for args in args_list]
+
+def get_cfg(tmpdir, tw_store, cached_balances=False):
+	return Config({'data_dir': tmpdir, 'tw_store': tw_store, 'cached_balances': cached_balances})
+
+async def create_tw(tmpdir, tw_store):
+	cfg = get_cfg(tmpdir, tw_store)
+	tw = await TwCtl(cfg, init_proto(cfg, 'eth', need_amt=True), mode='w', no_rpc=True)
+	for n, addr in enumerate(addrs[:3], 1):
+		await tw.import_address(addr, label=TwLabel(tw.proto, f'F00BAA12:E:{n}'))
+	for addr, bal in stored_bals.items():
+		tw.cache_balance(addr, tw.proto.coin_amt(bal), session_cache={}, data_root=tw.data_root)
+	tw.data['tokens'][token] = {'params': {'symbol': 'FOO', 'decimals': 18}}
+	tw.record_change('token', ('tokens', token), tw.data['tokens'][token])
+	for n, addr in enumerate(addrs[:3], 1):
+		tw.data['tokens'][token][addr] = d = {'mmid': f'F00BAA12:E:{n}', 'comment': ''}
+		if addr in stored_token_bals:
+			d['balance'] = stored_token_bals[addr]
+		tw.record_change('import', ('tokens', token, addr), d)
+	tw.write(compact=True)
+	tw.mode = 'r'
+
+async def open_tw(tmpdir, tw_store, cached_balances, *, is_token=False):
+	cfg = get_cfg(tmpdir, tw_store, cached_balances)
+	proto = init_proto(cfg, 'eth', tokensym='FOO' if is_token else None, need_amt=True)
+	tw = await TwCtl(cfg, proto, mode='r', no_rpc=True)
+	tw.rpc = FakeRPC()
+	EthereumTokenTwCtl.cur_eth_balances.clear()
+	return tw
+
+async def check_balances(tmpdir, tw_store, cached_balances, *, is_token=False, eth=False):
+	"""
+	compare results of bulk method with those of per-address method, using fresh
+	tracking wallet instances
+	"""
+	desc = ('token ' if is_token else '') + ('ETH ' if eth else '') + 'balances'
+	get_bal, get_bals = ('get_eth_balance', 'get_eth_balances') if eth else ('get_balance', 'get_balances')
+
+	tw = await open_tw(tmpdir, tw_store, cached_balances, is_token=is_token)
+	ref = [await getattr(tw, get_bal)(addr) for addr in addrs]
+	ncalls = len(tw.rpc.calls)
+	assert ncalls == (0 if cached_balances else len(addrs)), tw.rpc.calls
+	# session cache is used on second call:
+	assert [await getattr(tw, get_bal)(addr) for addr in addrs] == ref
+	assert len(tw.rpc.calls) == ncalls
+
+	tw = await open_tw(tmpdir, tw_store, cached_balances, is_token=is_token)
+	res = await getattr(tw, get_bals)(addrs)
+	assert res == ref, f'{desc}: {res} != {ref}'
+	assert [await getattr(tw, get_bal)(addr) for addr in addrs] == ref, f'{desc}: session cache differs'
+	assert await getattr(tw, get_bals)(addrs[::-1]) == ref[::-1]
+	# balances not in cache are fetched in one gathered call:
+	assert len([c for c in tw.rpc.calls if c.startswith('gathered:')]) == (1 if ncalls else 0), tw.rpc.calls
+	assert len(tw.rpc.calls) <= 2, tw.rpc.calls
+
+	vmsg(f'  {tw_store:6} cached={cached_balances!s:5} {desc:18} {" ".join(map(str, ref))}')
+	return ref
+
+class unit_tests:
+
+	def balances(self, name, ut):
+
+		async def run(tmpdir, tw_store):
+			Multicall.deployed.clear()
+			await create_tw(tmpdir, tw_store)
+
+			proto = init_proto(get_cfg(tmpdir, tw_store), 'eth', need_amt=True)
+			def wei(n):
+				return proto.coin_amt(n, from_unit='wei')
+			def coin(s):
+				return proto.coin_amt(s)
+			def token_units(n):
+				return proto.coin_amt(Decimal(n) / 10**18, from_decimal=True)
+
+			# balances from chain:
+			chain = [wei(chain_bals[a]) for a in addrs]
+			chain_token = [token_units(chain_token_bals[a]) for a in addrs]
+			for is_token, eth, ref in (
+					(False, False, chain),
+					(True,  False, chain_token),
+					(True,  True,  chain)):
+				assert await check_balances(tmpdir, tw_store, False, is_token=is_token, eth=eth) == ref
+
+			# balances from wallet, missing balances and addresses are zero:
+			for is_token, eth, stored in (
+					(False, False, stored_bals),
+					(True,  False, stored_token_bals),
+					(True,  True,  stored_bals)):
+				ref = [coin(stored.get(a, '0')) for a in addrs]
+				assert await check_balances(tmpdir, tw_store, True, is_token=is_token, eth=eth) == ref
+
+		for tw_store in ('json', 'sqlite'):
+			with TemporaryDirectory() as tmpdir:
+				asyncio.run(run(tmpdir, tw_store))
+		return True
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.twjournal: tracking wallet journal store unit tests for the MMGen suite
+"""
+
+import os, json, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.tw.ctl import TwCtl
+from mmgen.tw.shared import TwLabel
+
+from ..include.common import vmsg
+
+addrs = [f'{n:040x}' for n in range(1, 6)]
+
+async def open_tw(tmpdir, mode='w', tw_store='journal'):
+	c = Config({'data_dir': tmpdir, 'tw_store': tw_store})
+	return await TwCtl(c, init_proto(c, 'eth', need_amt=True), mode=mode, no_rpc=True)
+
+def close_tw(tw, *, crash=False):
+	if crash:
+		tw.mode = 'r' # skip compaction
+	else:
+		tw.write(compact=True)
+		tw.mode = 'r'
+
+async def make_changes(tw):
+	for n, addr in enumerate(addrs, 1):
+		await tw.import_address(addr, label=TwLabel(tw.proto, f'F00BAA12:E:{n} label {n}'))
+	tw.write()
+	await tw.set_label(addrs[1], TwLabel(tw.proto, 'F00BAA12:E:2 new label'))
+	tw.cache_balance(addrs[2], tw.proto.coin_amt('1.23'), session_cache={}, data_root=tw.data_root)
+	tw.write()
+	await tw.remove_address(addrs[3])
+
+def get_accounts(tw):
+	return json.loads(json.dumps(tw.data['accounts']))
+
+class unit_tests:
+
+	def journal(self, name, ut):
+
+		async def run(tmpdir):
+			tw = await open_tw(tmpdir)
+			snapshot = tw.orig_data
+			await make_changes(tw)
+			ref = get_accounts(tw)
+			assert len(ref) == 4 and ref[addrs[2]]['balance'] == '1.23'
+			assert ref[addrs[1]]['comment'] == 'new label'
+			with open(tw.tw_path) as fh:
+				assert fh.read() == snapshot, 'wallet file rewritten'
+			with open(tw.journal.path) as fh:
+				vmsg('  journal:\n' + ''.join('    ' + line for line in fh))
+			close_tw(tw, crash=True)
+
+			# crash recovery: journal replayed on top of snapshot
+			tw = await open_tw(tmpdir, mode='r')
+			assert get_accounts(tw) == ref, 'journal replay failed'
+
+			# compaction on close
+			tw = await open_tw(tmpdir)
+			close_tw(tw)
+			assert not os.path.exists(tw.journal.path), 'journal not removed'
+			tw = await open_tw(tmpdir, mode='r', tw_store='json')
+			assert get_accounts(tw) == ref, 'compacted wallet data differs'
+
+			# incomplete record at end of journal is ignored
+			tw = await open_tw(tmpdir)
+			await tw.set_label(addrs[0], TwLabel(tw.proto, 'F00BAA12:E:1 label A'))
+			await tw.set_label(addrs[0], TwLabel(tw.proto, 'F00BAA12:E:1 label B'))
+			close_tw(tw, crash=True)
+			with open(tw.journal.path, 'r+') as fh:
+				fh.truncate(os.path.getsize(tw.journal.path) - 1)
+			tw = await open_tw(tmpdir)
+			assert tw.data['accounts'][addrs[0]]['comment'] == 'label A'
+			await tw.set_label(addrs[1], TwLabel(tw.proto, 'F00BAA12:E:2 label C'))
+			close_tw(tw, crash=True)
+			tw = await open_tw(tmpdir, mode='r')
+			assert tw.data['accounts'][addrs[1]]['comment'] == 'label C'
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def compact(self, name, ut):
+
+		async def run(tmpdir):
+			tw = await open_tw(tmpdir)
+			tw.journal_compact_min = 0
+			await make_changes(tw)
+			# journal exceeded snapshot size, so wallet file was rewritten:
+			assert len(tw.orig_data) > len(json.dumps({'accounts': {}}))
+			close_tw(tw)
+			tw = await open_tw(tmpdir, mode='r', tw_store='json')
+			assert len(tw.data['accounts']) == 4
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def altered(self, name, ut):
+
+		async def run(tmpdir):
+			from mmgen.exception import WalletFileError
+			tw = await open_tw(tmpdir)
+			await make_changes(tw)
+			with open(tw.tw_path, 'a') as fh:
+				fh.write(' ')
+			try:
+				await tw.set_label(addrs[0], TwLabel(tw.proto, 'F00BAA12:E:1 label X'))
+			except WalletFileError as e:
+				vmsg(f'  {e}')
+			else:
+				raise AssertionError('alteration of wallet file not detected')
+			tw.mode = 'r'
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.twsqlite: tracking wallet SQLite store unit tests for the MMGen suite
+"""
+
+import os, json, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.tw.ctl import TwCtl
+from mmgen.tw.shared import TwLabel
+
+from ..include.common import vmsg
+
+addrs = [f'{n:040x}' for n in range(1, 6)]
+token = f'{0xdead:040x}'
+
+async def open_tw(tmpdir, mode='w', tw_store='sqlite'):
+	c = Config({'data_dir': tmpdir, 'tw_store': tw_store, 'cached_balances': True})
+	return await TwCtl(c, init_proto(c, 'eth', need_amt=True), mode=mode, no_rpc=True)
+
+def close_tw(tw):
+	tw.write(compact=True)
+	tw.mode = 'r'
+
+async def make_changes(tw):
+	# import in reverse order of MMGen ID:
+	for n, addr in reversed(list(enumerate(addrs, 1))):
+		await tw.import_address(addr, label=TwLabel(tw.proto, f'F00BAA12:E:{n} label {n}'))
+	tw.write()
+	await tw.set_label(addrs[1], TwLabel(tw.proto, 'F00BAA12:E:2 new label'))
+	tw.cache_balance(addrs[2], tw.proto.coin_amt('1.23'), session_cache={}, data_root=tw.data_root)
+	tw.data['tokens'][token] = {'params': {'symbol': 'FOO', 'decimals': 18}}
+	tw.record_change('token', ('tokens', token), tw.data['tokens'][token])
+	tw.data['tokens'][token][addrs[4]] = d = {'mmid': 'F00BAA12:E:5', 'comment': '', 'balance': '7'}
+	tw.record_change('import', ('tokens', token, addrs[4]), d)
+	tw.write()
+	await tw.remove_address(addrs[3])
+
+def get_data(tw):
+	return json.loads(json.dumps(tw.data))
+
+def alter_json(tw, data):
+	with open(tw.tw_path, 'w') as fh:
+		json.dump(data, fh)
+
+class unit_tests:
+
+	def store(self, name, ut):
+
+		async def run(tmpdir):
+			tw = await open_tw(tmpdir)
+			await make_changes(tw)
+			ref = get_data(tw)
+			ref_sorted = tw.sorted_list
+			assert [d['addr'] for d in ref_sorted] == [addrs[n] for n in (0, 1, 2, 4)], 'wrong sort order'
+			ref_pairs = await tw.get_label_addr_pairs()
+			close_tw(tw)
+			with open(tw.tw_path) as fh:
+				assert json.load(fh) == ref, 'JSON wallet file not synced'
+
+			tw = await open_tw(tmpdir, mode='r')
+			assert get_data(tw) == ref, 'database data differs'
+			assert tw.sorted_list == ref_sorted
+			assert await tw.get_label_addr_pairs() == ref_pairs
+			assert await tw.get_balance(addrs[2]) == tw.proto.coin_amt('1.23')
+			assert await tw.get_balance(addrs[0]) == tw.proto.coin_amt('0')
+			assert await tw.get_balances(addrs[:3]) == [tw.proto.coin_amt(n) for n in ('0', '0', '1.23')]
+			assert tw.db.get_balances(('tokens', token), addrs) == {addrs[4]: '7'}
+			for line in tw.db.con.execute('EXPLAIN QUERY PLAN SELECT addr FROM addrs WHERE token = ? ORDER BY sort_key, addr', ('',)):
+				vmsg(f'  query plan: {line[-1]}')
+				assert 'addrs_sort' in line[-1]
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def migrate(self, name, ut):
+
+		async def run(tmpdir):
+			tw = await open_tw(tmpdir, tw_store='json')
+			await make_changes(tw)
+			ref = get_data(tw)
+			ref_sorted = tw.sorted_list
+			close_tw(tw)
+
+			tw = await open_tw(tmpdir, mode='r')
+			assert tw.db.data is tw.data
+			assert get_data(tw) == ref, 'migrated data differs'
+			assert tw.sorted_list == ref_sorted
+
+			# twimport-style replacement of all data:
+			tw = await open_tw(tmpdir)
+			tw.data = ref | {'accounts': {addrs[0]: ref['accounts'][addrs[0]]}}
+			tw.write(compact=True)
+			tw = await open_tw(tmpdir, mode='r')
+			assert list(tw.data['accounts']) == [addrs[0]]
+			assert tw.data['tokens'] == ref['tokens']
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def memoize(self, name, ut):
+
+		async def run(tmpdir, tw_store):
+			tw = await open_tw(tmpdir, tw_store=tw_store)
+			await make_changes(tw)
+			sl, md = (tw.sorted_list, tw.mmid_ordered_dict)
+			assert tw.sorted_list is sl and tw.mmid_ordered_dict is md, 'sorted view not memoized'
+			# memoized views are read-only:
+			for obj, key in ((sl[0], 'comment'), (md, 'F00BAA12:E:9'), (md['F00BAA12:E:1'], 'comment')):
+				try:
+					obj[key] = 'x'
+				except TypeError:
+					pass
+				else:
+					raise AssertionError('memoized view modified')
+			assert not hasattr(sl, 'append')
+			tw.cache_balance(addrs[0], tw.proto.coin_amt('2'), session_cache={}, data_root=tw.data_root)
+			assert tw.sorted_list is sl, 'balance change invalidated sorted view'
+			await tw.set_label(addrs[0], TwLabel(tw.proto, 'F00BAA12:E:1 changed'))
+			assert tw.sorted_list is not sl and tw.mmid_ordered_dict is not md
+			assert tw.sorted_list[0]['comment'] == 'changed'
+			await tw.import_address(addrs[3], label=TwLabel(tw.proto, 'F00BAA12:E:4 re-imported'))
+			assert [d['addr'] for d in tw.sorted_list] == addrs
+			assert list(tw.mmid_ordered_dict)[3] == 'F00BAA12:E:4'
+			if tw_store == 'json':
+				# sort keys computed once per entry and updated on import and removal:
+				keys = tw.get_sort_keys(tw.data_root)
+				assert sorted(keys) == addrs and keys[addrs[3]] == ('F00BAA12:E:0000004', addrs[3]), keys[addrs[3]]
+			await tw.remove_address(addrs[1])
+			assert addrs[1] not in [d['addr'] for d in tw.sorted_list]
+			if tw_store == 'json':
+				assert tw.get_sort_keys(tw.data_root) is keys and addrs[1] not in keys
+			vmsg(f'  {tw_store}: generation {tw.generation}')
+			close_tw(tw)
+
+		for tw_store in ('json', 'sqlite'):
+			with TemporaryDirectory() as tmpdir:
+				asyncio.run(run(tmpdir, tw_store))
+		return True
+
+	def sync(self, name, ut):
+
+		async def run(tmpdir):
+			from mmgen.exception import WalletFileError
+			tw = await open_tw(tmpdir)
+			await make_changes(tw)
+			close_tw(tw)
+			ref = get_data(tw)
+			mtime = os.stat(tw.tw_path).st_mtime_ns
+
+			# changes written to database only, wallet file synced on close:
+			tw = await open_tw(tmpdir)
+			await tw.set_label(addrs[0], TwLabel(tw.proto, 'F00BAA12:E:1 changed'))
+			assert os.stat(tw.tw_path).st_mtime_ns == mtime and not tw.db.json_synced
+			close_tw(tw)
+			ref = get_data(tw)
+			with open(tw.tw_path) as fh:
+				assert json.load(fh) == ref and tw.db.json_synced
+
+			# wallet file altered by another program: imported again
+			tw = await open_tw(tmpdir, mode='r')
+			alter_json(tw, ref | {'accounts': {}})
+			tw = await open_tw(tmpdir, mode='r')
+			assert tw.data['accounts'] == {} and not tw.sorted_list
+			assert tw.db.json_synced
+			alter_json(tw, ref)
+			tw = await open_tw(tmpdir, mode='r')
+			assert get_data(tw) == ref
+
+			# wallet file and database both altered:
+			tw = await open_tw(tmpdir)
+			await tw.remove_address(addrs[0])
+			tw.mode = 'r'
+			alter_json(tw, ref | {'accounts': {}})
+			try:
+				await open_tw(tmpdir, mode='r')
+			except WalletFileError as e:
+				vmsg(f'  {e}')
+			else:
+				raise AssertionError('alteration of wallet file and database not detected')
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def altered(self, name, ut):
+
+		async def run(tmpdir):
+			from mmgen.exception import WalletFileError
+			tw1 = await open_tw(tmpdir)
+			await make_changes(tw1)
+			tw2 = await open_tw(tmpdir)
+			await tw2.set_label(addrs[0], TwLabel(tw2.proto, 'F00BAA12:E:1 label Y'))
+			for tw in (tw1, tw2):
+				tw.mode = 'r'
+			# database altered by tw2 after being read by tw1:
+			tw1.mode = 'w'
+			try:
+				await tw1.set_label(addrs[0], TwLabel(tw1.proto, 'F00BAA12:E:1 label X'))
+			except WalletFileError as e:
+				vmsg(f'  {e}')
+			else:
+				raise AssertionError('alteration of database not detected')
+			finally:
+				tw1.mode = 'r'
+			tw = await open_tw(tmpdir, mode='r')
+			assert tw.data['accounts'][addrs[0]]['comment'] == 'label Y'
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.twview: tracking wallet view unit tests for the MMGen suite
+"""
+
+import random
+from types import SimpleNamespace
+
+from mmgen.tw.view import TwView, TwDisplayLines, TwColumnMaxima
+
+from ..include.common import vmsg
+
+class FakeView:
+	sort_funcs = {
+		'amt': lambda d: d.amt,
+		'addr': lambda d: d.addr}
+	txid_w = 0
+	reverse = False
+	pos = 0
+	sort_data = TwView.sort_data
+	get_sort_keys = TwView.get_sort_keys
+
+	def __init__(self, data):
+		self.data = data
+		self.sort_keys = {}
+
+class unit_tests:
+
+	def lines(self, name, ut):
+
+		def gen_lines(n):
+			for i in range(n):
+				nformatted[0] += 1
+				yield f'line {i}'
+
+		nformatted = [0]
+		h = 20
+		body = TwDisplayLines(gen_lines(500_000))
+		assert body[:h] == [f'line {i}' for i in range(h)]
+		pos = body.clamp_pos(1000, h)
+		assert pos == 1000 and body[pos:pos+h][-1] == 'line 1019'
+		vmsg(f'  lines formatted for two windows of 500000: {nformatted[0]}')
+		assert nformatted[0] == 1000 + h, 'lines formatted outside of displayed window'
+		assert len(body) == 500_000 and nformatted[0] == 500_000
+
+		# clamp_pos() agrees with previous computation from full length:
+		for total in (0, 1, h - 1, h, h + 1, 3 * h + 7):
+			for pos in range(0, 4 * h):
+				assert TwDisplayLines(map(str, range(total))).clamp_pos(pos, h) == min(pos, max(0, total - h))
+		return True
+
+	def maxima(self, name, ut):
+		random.seed(1)
+		items = [SimpleNamespace(w=random.randrange(1, 80)) for _ in range(1000)]
+		m = TwColumnMaxima(lambda d: d.w)
+		for _ in range(50):
+			data = random.sample(items, random.randrange(1, 300))
+			assert m.update(data) == max(d.w for d in data)
+		d = data[0]
+		d.w = 100
+		m.refresh(d)
+		assert m.update(data) == 100
+		assert m.update(data[1:]) == max(d.w for d in data[1:])
+		vmsg(f'  items tracked: {len(m.items)}, distinct widths: {len(m.counts)}')
+		return True
+
+	def sort(self, name, ut):
+		random.seed(2)
+		items = [SimpleNamespace(amt=random.randrange(10), addr=f'{n:04}') for n in range(500)]
+		random.shuffle(items)
+		ref = list(items)
+		v = FakeView(list(items))
+		for key, reverse in (('addr', False), ('amt', False), ('amt', True), ('addr', True), ('amt', False)):
+			v.reverse = reverse
+			ref.sort(key=FakeView.sort_funcs[key], reverse=reverse)
+			v.pos = 5
+			v.sort_data(key)
+			assert v.data == ref, f'{key}: sort order differs'
+			assert v.pos == 0
+		v.pos = 5
+		v.sort_data('amt') # data already sorted, so position unchanged
+		assert v.pos == 5
+		v.data = v.data[:100] # keys recomputed for new data
+		v.sort_data('addr')
+		assert v.data == sorted(ref[:100], key=FakeView.sort_funcs['addr'])
+		return True
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.txcache: transaction history cache unit tests for the MMGen suite
+"""
+
+import os, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.proto.btc.tw.txcache import BitcoinTwTxCache
+
+from ..include.common import cfg, vmsg
+
+class FakeRPC:
+
+	twname = 'mmgen-tracking-wallet'
+
+	def __init__(self, blockcount):
+		self.chain = [f'{n:064x}' for n in range(blockcount + 1)]
+		self.calls = 0
+
+	@property
+	def blockcount(self):
+		return len(self.chain) - 1
+
+	async def call(self, method, height):
+		assert method == 'getblockhash'
+		self.calls += 1
+		return self.chain[height]
+
+	async def gathered_call(self, method, args_list):
+		return [await self.call(method, *args) for args in args_list]
+
+def make_tx(rpc, n, height):
+	return {
+		'txid': f'{n:064x}',
+		'confirmations': rpc.blockcount + 1 - height,
+		'blockhash': rpc.chain[height],
+		'blockheight': height,
+		'hex': 'deadbeef',
+		'decoded': {'vin': [], 'vout': [{'n': 0, 'value': '0.1'}]}}
+
+def get_cache(tmpdir, rpc, size=100):
+	c = BitcoinTwTxCache(Config({'_clone': cfg, 'txhist_cache_size': size}), init_proto(cfg, 'btc'), rpc)
+	c.fn = os.path.join(tmpdir, 'txcache.json')
+	return c
+
+class unit_tests:
+
+	def lru(self, name, ut):
+
+		async def run(tmpdir):
+			rpc = FakeRPC(100)
+			c = get_cache(tmpdir, rpc, size=3)
+			for n in range(3):
+				c.add_tx(make_tx(rpc, n, 10 + n))
+			c.add_prevout_tx({'txid': f'{9:064x}', 'vout': [{'n': 0}], 'confirmations': 5})
+			assert c.get_tx(f'{0:064x}')['confirmations'] == 91
+			c.save()
+
+			c = get_cache(tmpdir, rpc, size=3)
+			await c.load()
+			assert rpc.calls == 1, 'reorg check performed for unchanged chain'
+			assert list(c.data) == [f'{n:064x}' for n in (2, 9, 0)], 'wrong LRU eviction'
+			tx = c.get_tx(f'{2:064x}')
+			assert 'hex' not in tx and tx['confirmations'] == 89 and tx['decoded']['vout'][0]['value'] == '0.1'
+			assert c.get_prevout_tx(f'{9:064x}') == {'txid': f'{9:064x}', 'vout': [{'n': 0}]}
+			assert c.get_tx(f'{9:064x}') is None, 'prevout returned as wallet transaction'
+			assert c.get_tx(f'{1:064x}') is None, 'evicted transaction returned'
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
+
+	def reorg(self, name, ut):
+
+		async def run(tmpdir):
+			rpc = FakeRPC(100)
+			c = get_cache(tmpdir, rpc)
+			for n, height in enumerate((50, 98, 99, 100)):
+				c.add_tx(make_tx(rpc, n, height))
+			c.add_prevout_tx({'txid': f'{3:064x}', 'vout': [{'n': 0}]})
+			c.save()
+
+			# replace blocks 99 and 100 with a longer chain:
+			rpc.chain[99:] = [f'{n:064x}'.replace('0', 'f', 1) for n in range(99, 102)]
+			vmsg('  new chain tip: {} {}'.format(rpc.blockcount, rpc.chain[-1]))
+
+			c = get_cache(tmpdir, rpc)
+			await c.load()
+			assert c.get_tx(f'{0:064x}')['confirmations'] == 52
+			assert c.get_tx(f'{1:064x}')['confirmations'] == 4
+			assert c.get_tx(f'{2:064x}') is None, 'reorganized transaction not removed'
+			assert c.get_tx(f'{3:064x}') is None, 'reorganized transaction not removed'
+			assert c.get_prevout_tx(f'{3:064x}'), 'prevout data removed on reorg'
+			assert f'{2:064x}' not in c.data, 'empty record not removed'
+			c.save()
+
+			rpc.calls = 0
+			c = get_cache(tmpdir, rpc)
+			await c.load()
+			assert rpc.calls == 1 and len(c.data) == 3
+			return True
+
+		with TemporaryDirectory() as tmpdir:
+			return asyncio.run(run(tmpdir))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.txkeys: transaction signing key unit tests for the MMGen suite
+"""
+
+import time
+from types import SimpleNamespace
+
+from mmgen.util import remove_dups
+from mmgen.exception import MMGenError
+from mmgen.protocol import init_proto
+from mmgen.wallet import Wallet
+from mmgen.addr import MMGenID
+from mmgen.addrlist import AddrList, KeyAddrList, AddrListData
+from mmgen.addrlistdata import CompactAddrListData
+from mmgen.keycache import KeyAddrCache
+from mmgen.tx.keys import TxKeys
+
+from ..include.common import cfg, vmsg, silence, end_silence
+
+wallet_fn = 'test/ref/98831F3A.mmwords'
+
+class FakeTX:
+	"""
+	unsigned transaction with only the attributes and methods used by TxKeys
+	"""
+	def __init__(self, proto, inputs, outputs):
+		self.proto = proto
+		self.inputs = inputs
+		self.outputs = outputs
+
+	def get_non_mmaddrs(self, desc):
+		return []
+
+	def check_swap_memo(self):
+		return None
+
+	def delete_attrs(self, desc, attr):
+		for e in getattr(self, desc):
+			if hasattr(e, attr):
+				delattr(e, attr)
+
+	def get_sids(self, desc):
+		return remove_dups((e.mmid.sid for e in getattr(self, desc)), quiet=True)
+
+def make_tx(proto, kals, ninputs):
+	"""
+	create a transaction spending the first ‘ninputs’ entries of the lists in ‘kals’,
+	in interleaved order, with one output to each list
+	"""
+	def make_io(kal, e):
+		return SimpleNamespace(
+			proto = proto,
+			mmid = MMGenID(proto, f'{kal.al_id}:{e.idx}'),
+			addr = e.addr,
+			have_wif = False)
+	n = ninputs // len(kals)
+	return FakeTX(
+		proto,
+		[make_io(kal, kal.data[i]) for i in range(n) for kal in kals],
+		[make_io(kal, kal.data[-1]) for kal in kals])
+
+class LookupCounter:
+	"""
+	count address list entry lookups, and entries read when building list indexes
+	"""
+	def __enter__(self):
+		self.lookups = 0
+		self.indexed = 0
+		self.saved = (AddrList.entry, AddrListData.values, CompactAddrListData.values)
+		entry, values, cvalues = self.saved
+		def count_entry(al, idx):
+			self.lookups += 1
+			return entry(al, idx)
+		def count_values(func):
+			def wrapper(data, name):
+				for val in func(data, name):
+					self.indexed += 1
+					yield val
+			return wrapper
+		AddrList.entry = count_entry
+		AddrListData.values = count_values(values)
+		CompactAddrListData.values = count_values(cvalues)
+		return self
+
+	def __exit__(self, *args):
+		AddrList.entry, AddrListData.values, CompactAddrListData.values = self.saved
+
+def get_keys(tx, kal=None):
+	return TxKeys(cfg, tx, seedfiles=[wallet_fn], keyaddrlist=kal).keys
+
+class unit_tests:
+
+	def keys(self, name, ut):
+		proto = init_proto(cfg, 'btc', network='regtest')
+		seed = Wallet(cfg, fn=wallet_fn).seed
+		silence()
+		kals = [KeyAddrList(cfg, proto, seed=seed, addr_idxs='1-1000', mmtype=t, skip_chksum=True)
+			for t in ('C', 'B')]
+		end_silence()
+
+		def do_test(ninputs, kal=None):
+			tx = make_tx(proto, kals, ninputs)
+			nio = len(tx.inputs) + len(tx.outputs)
+			t_start = time.time()
+			with LookupCounter() as c:
+				keys = get_keys(tx, kal)
+			t = time.time() - t_start
+			# keys from key-address file precede those generated from seed:
+			assert sorted(e.sec.wif for e in keys) == sorted(
+				al.entry(e.mmid.idx).sec.wif for e in tx.inputs
+					for al in kals if al.al_id == e.mmid.al_id), 'wrong keys returned'
+			# one lookup per input and output, and each list indexed at most once:
+			assert c.lookups == nio, f'{c.lookups} lookups for {nio} inputs and outputs'
+			assert c.indexed <= nio + (len(kal.data) if kal else 0), f'{c.indexed} entries indexed'
+			return f'{ninputs} inputs {t:.3f}s ({c.lookups} lookups, {c.indexed} entries indexed)'
+
+		# keys from key-address file:
+		kal = kals[0]
+		vmsg('  key-address file: {}'.format(', '.join(do_test(n, kal) for n in (500, 2000))))
+
+		# keys from seed (cached):
+		KeyAddrCache.wipe()
+		silence()
+		do_test(2000)
+		end_silence()
+		vmsg('  seed: {}'.format(', '.join(do_test(n) for n in (500, 2000))))
+		KeyAddrCache.wipe()
+		return True
+
+	def mismatch(self, name, ut):
+		proto = init_proto(cfg, 'btc', network='regtest')
+		seed = Wallet(cfg, fn=wallet_fn).seed
+		silence()
+		kal = KeyAddrList(cfg, proto, seed=seed, addr_idxs='1-10', mmtype='C', skip_chksum=True)
+		end_silence()
+		tx = make_tx(proto, [kal], 5)
+		tx.inputs[3].addr = kal.data[7].addr
+		silence()
+		try:
+			get_keys(tx, kal)
+		except MMGenError as e:
+			vmsg(f'  {e}')
+			assert 'mappings differ' in str(e) and f'{kal.al_id}:4 -> {kal.data[3].addr}' in str(e), str(e)
+		else:
+			raise AssertionError('address mismatch not detected')
+		finally:
+			end_silence()
+		KeyAddrCache.wipe()
+		return True
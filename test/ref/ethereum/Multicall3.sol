@@ -0,0 +1,36 @@
+// MMGen Wallet, a terminal-based cryptocurrency wallet
+// Copyright (C)2013-2026 The MMGen Project <mmgen@tuta.io>
+// Licensed under the GNU General Public License, Version 3:
+//   https://www.gnu.org/licenses
+// Public project repositories:
+//   https://github.com/mmgen/mmgen-wallet
+//   https://gitlab.com/mmgen/mmgen-wallet
+//
+// Minimal Multicall3 aggregator for testing: aggregate3() only, with the ABI
+// of Multicall3 (https://github.com/mds1/multicall)
+//
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity >=0.8.25;
+
+contract Multicall3 {
+	struct Call3 {
+		address target;
+		bool allowFailure;
+		bytes callData;
+	}
+
+	struct Result {
+		bool success;
+		bytes returnData;
+	}
+
+	function aggregate3(Call3[] calldata calls) public payable returns (Result[] memory returnData) {
+		returnData = new Result[](calls.length);
+		for (uint i = 0; i < calls.length; i++) {
+			(bool success, bytes memory ret) = calls[i].target.call(calls[i].callData);
+			require(success || calls[i].allowFailure, "Multicall3: call failed");
+			returnData[i] = Result(success, ret);
+		}
+	}
+}